@@ -0,0 +1,6 @@
+"""
+Benchmarks for the safeAi backend.
+
+Nothing in here is imported by the Django project; run the modules directly
+from the repository root, e.g. ``python -m benchmarks.load``.
+"""
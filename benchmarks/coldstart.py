@@ -0,0 +1,184 @@
+"""
+Cold-start benchmark: process start to first response, plus an import profile.
+
+Each run boots a fresh gunicorn with one worker against the stub upstreams and
+a scratch database. It records how long the server takes to answer
+``/health/`` ("ready") and how long the first and second ``POST /chat/`` take
+after that. The first request pays for whatever start-up did not do; the
+second is the warm reference::
+
+    python -m benchmarks.coldstart --runs 5
+    python -m benchmarks.coldstart --preload --warmup   # GUNICORN_PRELOAD + WARMUP_ON_START
+    python -m benchmarks.coldstart --importtime         # slowest imports of safeAi.wsgi and .asgi
+    python -m benchmarks.coldstart --update-baselines
+
+Medians are compared with the ``coldstart`` entry of ``benchmarks/baselines.json``.
+The stubs are plain HTTP on localhost, so real DNS and TLS costs do not show up
+here; they only make warm-up matter more in production.
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import requests
+
+from .load import PROJECT_DIR, _free_port
+from .stubs import StubServers
+
+
+BASELINES_PATH = Path(__file__).resolve().parent / "baselines.json"
+POLL_INTERVAL = 0.01
+# Profiled by --importtime: the gunicorn and uvicorn entry points
+ENTRY_POINTS = ("safeAi.wsgi", "safeAi.asgi")
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def _wait_until_ready(base_url, process, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            if requests.get(f"{base_url}/health/", timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(POLL_INTERVAL)
+    raise RuntimeError(f"Server at {base_url} did not become ready")
+
+
+def _timed_chat(base_url):
+    start = time.perf_counter()
+    response = requests.post(f"{base_url}/chat/", json={"message": "hello"}, timeout=30)
+    elapsed = time.perf_counter() - start
+    if response.status_code != 200:
+        raise RuntimeError(f"/chat/ returned {response.status_code}")
+    return elapsed
+
+
+def run_once(env, verbose=False):
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        ["gunicorn", "safeAi.wsgi", "--bind", f"127.0.0.1:{port}", "--workers", "1"],
+        cwd=PROJECT_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=None if verbose else subprocess.DEVNULL,
+    )
+    try:
+        _wait_until_ready(base_url, process)
+        ready = time.perf_counter() - start
+        return {
+            "ready": ready,
+            "first_request": _timed_chat(base_url),
+            "second_request": _timed_chat(base_url),
+        }
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def import_profile(env, top=25, module="safeAi.wsgi"):
+    """The slowest imports of ``module``, from ``python -X importtime``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((int(cumulative_us), int(self_us), (len(indent) - 1) // 2, module))
+
+    total = max((row[0] for row in rows), default=0)
+    lines = [f"{module} imports in {total / 1e3:.0f}ms", ""]
+    lines.append(f"{'cumulative':>12}{'self':>10}  module")
+    for cumulative, self_us, depth, module in sorted(rows, reverse=True)[:top]:
+        lines.append(f"{cumulative / 1e3:>10.1f}ms{self_us / 1e3:>8.1f}ms  {'  ' * depth}{module}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh server starts to measure.")
+    parser.add_argument("--preload", action="store_true", help="Set GUNICORN_PRELOAD=True.")
+    parser.add_argument("--warmup", action="store_true", help="Set WARMUP_ON_START=True.")
+    parser.add_argument("--importtime", action="store_true", help="Print the import profile only.")
+    parser.add_argument("--top", type=int, default=25, help="Imports listed per module by --importtime.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown against the baseline before failing (0.25 = 25%%).",
+    )
+    parser.add_argument("--update-baselines", action="store_true")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    parser.add_argument("--verbose", action="store_true", help="Show server logs.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch, StubServers() as stubs:
+        env = {
+            **os.environ,
+            **stubs.env(),
+            "DEBUG": "False",
+            "DATABASE_URL": f"sqlite:///{scratch}/coldstart.sqlite3",
+            "GUNICORN_PRELOAD": str(args.preload),
+            "WARMUP_ON_START": str(args.warmup),
+        }
+        if args.importtime:
+            print("\n\n".join(import_profile(env, args.top, module) for module in ENTRY_POINTS))
+            return
+
+        subprocess.run(
+            [sys.executable, "manage.py", "migrate", "--noinput", "-v", "0"],
+            cwd=PROJECT_DIR,
+            env=env,
+            check=True,
+        )
+        runs = [run_once(env, args.verbose) for _ in range(args.runs)]
+
+    results = {name: statistics.median(run[name] for run in runs) for name in runs[0]}
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+    baselines = json.loads(BASELINES_PATH.read_text()) if BASELINES_PATH.exists() else {}
+    if args.update_baselines:
+        baselines["coldstart"] = results
+        BASELINES_PATH.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"Baselines written to {BASELINES_PATH}")
+        return
+
+    failures = []
+    lines = [f"{'cold start':<36}{'current':>12}{'baseline':>12}{'change':>9}"]
+    for name, seconds in results.items():
+        baseline = baselines.get("coldstart", {}).get(name)
+        change = f"{(seconds / baseline - 1) * 100:+.0f}%" if baseline else "new"
+        lines.append(
+            f"{name:<36}{seconds * 1e3:>10.1f}ms{(baseline or 0) * 1e3:>10.1f}ms{change:>9}"
+        )
+        if baseline and seconds > baseline * (1 + args.threshold):
+            failures.append(f"{name}: {seconds * 1e3:.1f}ms vs baseline {baseline * 1e3:.1f}ms")
+    if not args.json:
+        print("\n".join(lines))
+    if failures:
+        print("\nREGRESSIONS:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Synthetic upload fixtures (PDF, DOCX, text) of a given size.
+
+Generated on the fly so the repository does not carry binary test files. The
+PDFs mimic real reports: a running header and footer with page numbers on
+every page and words hyphenated across line breaks.
+"""
+
+import io
+import random
+
+
+WORDS = (
+    "claim evidence source report government health election media vaccine "
+    "economy budget county river school market policy statement official "
+    "research survey percent million growth minister public network rumour"
+).split()
+
+HEADER = "ACME Media Monitoring - Quarterly Fact-Check Report - Confidential"
+
+
+def _lines(count, seed, width=12):
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(count):
+        words = [rng.choice(WORDS) for _ in range(width)]
+        if rng.random() < 0.15:
+            # Hyphenated break, as produced by justified PDF layouts.
+            word = words[-1]
+            words[-1] = word[: len(word) // 2] + "-"
+        lines.append(" ".join(words))
+    return lines
+
+
+def _pdf_escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages=1, lines_per_page=40, seed=0) -> bytes:
+    """Build a minimal text PDF (Helvetica, one content stream per page)."""
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(None)
+    pages_obj = add(None)
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    page_ids = []
+    for number in range(1, pages + 1):
+        lines = [HEADER, ""]
+        lines += _lines(lines_per_page, seed=seed * 100003 + number)
+        lines += ["", f"Page {number} of {pages}"]
+        text = " Tj T* ".join(f"({_pdf_escape(line)})" for line in lines)
+        stream = f"BT /F1 9 Tf 11 TL 40 760 Td {text} Tj ET".encode("latin-1")
+        content = add(
+            b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream"
+        )
+        page_ids.append(
+            add(
+                (
+                    f"<< /Type /Page /Parent {pages_obj} 0 R /MediaBox [0 0 612 792] "
+                    f"/Resources << /Font << /F1 {font} 0 R >> >> /Contents {content} 0 R >>"
+                ).encode()
+            )
+        )
+
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[catalog - 1] = f"<< /Type /Catalog /Pages {pages_obj} 0 R >>".encode()
+    objects[pages_obj - 1] = f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>".encode()
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode())
+    out.write(
+        f"trailer\n<< /Size {len(objects) + 1} /Root {catalog} 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    )
+    return out.getvalue()
+
+
+def make_docx(paragraphs=50, seed=0) -> bytes:
+    from docx import Document
+
+    document = Document()
+    for line in _lines(paragraphs, seed=seed, width=30):
+        document.add_paragraph(line)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def make_text(lines=1000, seed=0) -> bytes:
+    return "\n".join(_lines(lines, seed=seed)).encode("utf-8")
+
+
+SIZES = {
+    "small": {"pdf": {"pages": 1}, "docx": {"paragraphs": 20}, "txt": {"lines": 100}},
+    "medium": {"pdf": {"pages": 20}, "docx": {"paragraphs": 400}, "txt": {"lines": 5000}},
+    "large": {"pdf": {"pages": 100}, "docx": {"paragraphs": 2000}, "txt": {"lines": 50000}},
+}
+
+MAKERS = {"pdf": make_pdf, "docx": make_docx, "txt": make_text}
+
+
+def make_fixture(kind, size):
+    return MAKERS[kind](**SIZES[size][kind])
@@ -0,0 +1,138 @@
+"""
+End-to-end load test of the WSGI (gunicorn) and ASGI (uvicorn) deployments.
+
+Starts the stub upstreams, migrates a scratch database, boots each server
+against the stubs, drives every scenario at the target rate and prints
+throughput, p50/p95/p99 latency and error rate::
+
+    python -m benchmarks.load --rps 20 --duration 15 --latency lognormal:0.3:0.5
+
+SQLite serialises writes, so for meaningful numbers with several workers pass
+a PostgreSQL ``--database-url``.
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import requests
+
+from .loadgen import SCENARIOS, create_api_key, format_results, run_load
+from .stubs import StubServers, add_stub_arguments
+
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / "safeAi"
+
+SERVER_COMMANDS = {
+    "wsgi": lambda port, workers: [
+        "gunicorn", "safeAi.wsgi", "--bind", f"127.0.0.1:{port}", "--workers", str(workers),
+    ],
+    "asgi": lambda port, workers: [
+        "uvicorn", "safeAi.asgi:application", "--host", "127.0.0.1",
+        "--port", str(port), "--workers", str(workers), "--no-access-log",
+    ],
+}
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_healthy(base_url, process, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            if requests.get(f"{base_url}/health/", timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become healthy")
+
+
+def run_server_benchmark(kind, env, args):
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    process = subprocess.Popen(
+        SERVER_COMMANDS[kind](port, args.workers),
+        cwd=PROJECT_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL if not args.verbose else None,
+    )
+    try:
+        _wait_until_healthy(base_url, process)
+        context = {"api_key": create_api_key(base_url)}
+        return [
+            run_load(base_url, scenario, args.rps, args.duration, args.concurrency, context)
+            for scenario in args.scenarios
+        ]
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    add_stub_arguments(parser)
+    parser.add_argument("--servers", default="wsgi,asgi", help="Comma-separated: wsgi, asgi.")
+    parser.add_argument(
+        "--scenarios",
+        default=",".join(SCENARIOS),
+        help=f"Comma-separated subset of: {', '.join(SCENARIOS)}.",
+    )
+    parser.add_argument("--rps", type=float, default=10.0, help="Target requests per second.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per scenario.")
+    parser.add_argument("--concurrency", type=int, default=64, help="Max in-flight requests.")
+    parser.add_argument("--workers", type=int, default=2, help="Server worker processes.")
+    parser.add_argument("--database-url", help="Defaults to a scratch SQLite database.")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    parser.add_argument("--verbose", action="store_true", help="Show server logs.")
+    args = parser.parse_args()
+    args.scenarios = [name for name in args.scenarios.split(",") if name]
+
+    with tempfile.TemporaryDirectory() as scratch, StubServers(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        gemini_latency=args.gemini_latency,
+        ukweli_latency=args.ukweli_latency,
+        telegram_latency=args.telegram_latency,
+    ) as stubs:
+        env = {
+            **os.environ,
+            **stubs.env(),
+            "DEBUG": "False",
+            "DATABASE_URL": args.database_url or f"sqlite:///{scratch}/load.sqlite3",
+            "PROMETHEUS_MULTIPROC_DIR": os.path.join(scratch, "metrics"),
+        }
+        os.makedirs(env["PROMETHEUS_MULTIPROC_DIR"])
+        subprocess.run(
+            [sys.executable, "manage.py", "migrate", "--noinput", "-v", "0"],
+            cwd=PROJECT_DIR,
+            env=env,
+            check=True,
+        )
+
+        report = {}
+        for kind in args.servers.split(","):
+            results = run_server_benchmark(kind, env, args)
+            report[kind] = [result.as_dict() for result in results]
+            if not args.json:
+                print(format_results(f"{kind} ({args.workers} workers)", results))
+                print()
+        if args.json:
+            print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Open-loop HTTP load generator for the safeAi endpoints.
+
+Requests are scheduled at a fixed rate regardless of how fast responses come
+back, and latency is measured from the *scheduled* send time, so a slow server
+shows up as higher latency instead of silently lowering the offered load.
+"""
+
+import io
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+CLAIMS = [
+    "The moon landing was staged in a film studio.",
+    "Drinking hot water cures malaria.",
+    "Kenya's population passed 50 million in 2019.",
+    "5G towers spread viruses.",
+    "The Nile is the longest river in Africa.",
+]
+
+UPLOAD_BODY = ("Quarterly report. Revenue grew in every region.\n" * 400).encode("utf-8")
+
+
+def _chat(context):
+    return {"json": {"message": "Give me one tip for spotting fake news."}}
+
+
+def _upload(context):
+    return {
+        "data": {"message": "Summarize this document."},
+        "files": {"file": ("report.txt", io.BytesIO(UPLOAD_BODY), "text/plain")},
+    }
+
+
+def _api_message(context):
+    return {"json": {"api_key": context["api_key"], "message": "Summarize today's news."}}
+
+
+def _ukweli_verify(context):
+    return {"json": {"api_key": context["api_key"], "claim": random.choice(CLAIMS)}}
+
+
+def _telegram_webhook(context):
+    chat_id = random.randint(1, 1000)
+    update_id = random.randint(1, 10**9)
+    return {
+        "json": {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "chat": {"id": chat_id, "username": f"user{chat_id}", "type": "private"},
+                "text": random.choice(CLAIMS),
+            },
+        }
+    }
+
+
+SCENARIOS = {
+    "chat": ("/chat/", _chat),
+    "upload": ("/chat/upload/", _upload),
+    "api-message": ("/api/message/", _api_message),
+    "ukweli-verify": ("/api/ukweli/verify/", _ukweli_verify),
+    "telegram-webhook": ("/telegram/webhook/", _telegram_webhook),
+}
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class LoadResult:
+    def __init__(self, scenario, rps, latencies, errors, elapsed):
+        self.scenario = scenario
+        self.target_rps = rps
+        self.latencies = sorted(latencies)
+        self.errors = errors
+        self.elapsed = elapsed
+
+    @property
+    def requests(self):
+        return len(self.latencies)
+
+    def as_dict(self):
+        return {
+            "scenario": self.scenario,
+            "target_rps": self.target_rps,
+            "requests": self.requests,
+            "throughput_rps": self.requests / self.elapsed if self.elapsed else 0.0,
+            "error_rate": self.errors / self.requests if self.requests else 0.0,
+            "p50_ms": percentile(self.latencies, 0.50) * 1000,
+            "p95_ms": percentile(self.latencies, 0.95) * 1000,
+            "p99_ms": percentile(self.latencies, 0.99) * 1000,
+        }
+
+
+def create_api_key(base_url):
+    response = requests.post(
+        f"{base_url}/api/generate-key/", json={"company_name": "load-test"}, timeout=10
+    )
+    response.raise_for_status()
+    return response.json()["api_key"]
+
+
+def run_load(base_url, scenario, rps, duration, concurrency=64, context=None):
+    """Offer ``rps`` requests per second of ``scenario`` for ``duration`` seconds."""
+    path, build_request = SCENARIOS[scenario]
+    url = f"{base_url}{path}"
+    context = context or {}
+    local = threading.local()
+    lock = threading.Lock()
+    latencies = []
+    errors = [0]
+
+    def send(scheduled_at):
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        failed = False
+        try:
+            response = session.post(url, timeout=120, **build_request(context))
+            failed = response.status_code >= 400
+        except requests.RequestException:
+            failed = True
+        latency = time.perf_counter() - scheduled_at
+        with lock:
+            latencies.append(latency)
+            if failed:
+                errors[0] += 1
+
+    total = max(1, int(rps * duration))
+    interval = 1.0 / rps
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for index in range(total):
+            scheduled_at = start + index * interval
+            delay = scheduled_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(send, scheduled_at)
+    elapsed = time.perf_counter() - start
+    return LoadResult(scenario, rps, latencies, errors[0], elapsed)
+
+
+def format_results(label, results):
+    header = (
+        f"{'scenario':<18}{'rps':>7}{'reqs':>7}{'thru/s':>9}{'err%':>7}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    )
+    lines = [f"== {label} ==", header]
+    for result in results:
+        row = result.as_dict()
+        lines.append(
+            f"{row['scenario']:<18}{row['target_rps']:>7g}{row['requests']:>7}"
+            f"{row['throughput_rps']:>9.1f}{row['error_rate'] * 100:>7.1f}"
+            f"{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}"
+        )
+    return "\n".join(lines)
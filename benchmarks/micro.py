@@ -0,0 +1,266 @@
+"""
+Micro-benchmarks and per-view DB query budgets for the request hot paths.
+
+Timings and query counts are compared with ``benchmarks/baselines.json``; the
+run exits non-zero when a timing regresses past ``--threshold`` or a view runs
+more queries than its budget::
+
+    python -m benchmarks.micro                     # compare with the baselines
+    python -m benchmarks.micro --update-baselines  # record new baselines
+    python -m benchmarks.micro --only extract      # name substring filter
+
+Timing baselines are machine specific: record them on the machine (or CI
+runner class) that runs the comparison.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+from .fixtures import make_fixture
+from .stubs import StubServers
+
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / "safeAi"
+BASELINES_PATH = Path(__file__).resolve().parent / "baselines.json"
+SEED_MESSAGE_LOGS = 500
+
+UKWELI_RESULT = {
+    "final_verdict": "FALSE",
+    "explainable_confidence_score": 0.87,
+    "top_evidence_snippet": {
+        "verdict": "REFUTES",
+        "evidence": "Official statistics contradict the claim. " * 5,
+        "source": "https://example.org/fact-check",
+    },
+}
+
+
+def setup_django(scratch, stubs):
+    os.environ.update(stubs.env())
+    os.environ["DATABASE_URL"] = f"sqlite:///{scratch}/micro.sqlite3"
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "safeAi.settings")
+    sys.path.insert(0, str(PROJECT_DIR))
+
+    import django
+    from django.core.management import call_command
+
+    django.setup()
+    call_command("migrate", verbosity=0)
+
+
+def seed_database():
+    from chat.models import APIUser, ChatUser, MessageLog, TelegramUser
+
+    api_user = APIUser.objects.create(company_name="bench", api_key="bench-key")
+    chat_user = ChatUser.objects.create(session_id="bench-session")
+    telegram_user = TelegramUser.objects.create(telegram_id=1, username="bench")
+    owners = [
+        {"source": "chat", "chat_user": chat_user},
+        {"source": "ukweli", "telegram_user": telegram_user, "result": UKWELI_RESULT},
+        {"source": "api", "api_user": api_user},
+    ]
+    MessageLog.objects.bulk_create(
+        MessageLog(request_text="claim " * 20, response_text="reply " * 50, **owners[i % 3])
+        for i in range(SEED_MESSAGE_LOGS)
+    )
+    return api_user
+
+
+def time_call(func, repeat=5):
+    """Median seconds per call, auto-scaling the loop count like ``timeit``."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    runs = timer.repeat(repeat=repeat, number=number)
+    return statistics.median(runs) / number
+
+
+def timing_benchmarks():
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    from django.core.serializers.json import DjangoJSONEncoder
+    from django.test import Client
+
+    from chat import json_backend
+    from chat.extraction import extract_pages, extract_text
+    from chat.models import MessageLog
+    from chat.preprocessing import preprocess_pages
+    from chat.serializers import MessageLogSerializer
+    from chat.telegram_service import format_ukweli_reply
+
+    benchmarks = {}
+    for kind in ("pdf", "docx", "txt"):
+        for size in ("small", "medium", "large"):
+            content = make_fixture(kind, size)
+
+            def extract(content=content, kind=kind):
+                upload = SimpleUploadedFile(f"fixture.{kind}", content)
+                return extract_text(upload, upload.name)
+
+            benchmarks[f"extract_{kind}_{size}"] = extract
+
+    pages = extract_pages(SimpleUploadedFile("fixture.pdf", make_fixture("pdf", "large")), "fixture.pdf")
+    benchmarks["preprocess_pdf_large"] = lambda: preprocess_pages(pages)
+
+    benchmarks["format_telegram_reply"] = lambda: format_ukweli_reply(UKWELI_RESULT)
+
+    logs = list(MessageLog.objects.all())
+    benchmarks["serialize_message_logs"] = lambda: MessageLogSerializer(logs, many=True).data
+
+    # Stdlib encoder (what JsonResponse uses) next to the chat.json_backend one.
+    payload = {"message_logs": MessageLogSerializer(logs, many=True).data}
+    benchmarks["json_encode_all_data"] = lambda: json.dumps(payload, cls=DjangoJSONEncoder)
+    benchmarks[f"json_encode_all_data_{json_backend.BACKEND}"] = lambda: json_backend.dumps(payload)
+    benchmarks["json_encode_ukweli_result"] = lambda: json.dumps(UKWELI_RESULT, cls=DjangoJSONEncoder)
+    benchmarks[f"json_encode_ukweli_result_{json_backend.BACKEND}"] = (
+        lambda: json_backend.dumps(UKWELI_RESULT)
+    )
+
+    client = Client(HTTP_HOST="localhost")
+    benchmarks["view_all_data"] = lambda: client.get("/api/all-data/")
+    return benchmarks
+
+
+def query_counts(api_user):
+    """Run every view once through the test client and count its DB queries."""
+    from django.db import connections
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+
+    from chat.models import MessageLog
+
+    client = Client(HTTP_HOST="localhost")
+    deletable = MessageLog.objects.order_by("id").first()
+    calls = {
+        "chat": lambda: client.post(
+            "/chat/", {"message": "hello"}, content_type="application/json"
+        ),
+        "chat-upload": lambda: client.post(
+            "/chat/upload/",
+            {"message": "summarize", "file": _named_file("fixture.txt", make_fixture("txt", "small"))},
+        ),
+        "api-generate-key": lambda: client.post(
+            "/api/generate-key/", {"company_name": "bench"}, content_type="application/json"
+        ),
+        "api-message": lambda: client.post(
+            "/api/message/",
+            {"api_key": api_user.api_key, "message": "hello"},
+            content_type="application/json",
+        ),
+        "ukweli-verify": lambda: client.post(
+            "/api/ukweli/verify/",
+            {"api_key": api_user.api_key, "claim": "The moon is made of cheese."},
+            content_type="application/json",
+        ),
+        "telegram-webhook": lambda: client.post(
+            "/telegram/webhook/",
+            {"update_id": 1, "message": {"chat": {"id": 42, "username": "bench"}, "text": "claim"}},
+            content_type="application/json",
+        ),
+        "api-all-data": lambda: client.get("/api/all-data/"),
+        "api-usage": lambda: client.get("/api/usage/", {"api_key": api_user.api_key}),
+        "api-verdict-stats": lambda: client.get("/api/verdicts/", {"api_key": api_user.api_key}),
+        "delete-message-log": lambda: client.delete(f"/api/messages/{deletable.id}/"),
+        "health-check": lambda: client.get("/health/"),
+    }
+
+    counts = {}
+    for name, call in calls.items():
+        with _capture_all(connections, CaptureQueriesContext) as contexts:
+            response = call()
+        if response.status_code >= 500:
+            raise RuntimeError(f"{name} returned {response.status_code}")
+        counts[name] = sum(len(context) for context in contexts)
+    return counts
+
+
+class _capture_all:  # noqa: N801
+    def __init__(self, connections, context_class):
+        self.contexts = [context_class(connections[alias]) for alias in connections]
+
+    def __enter__(self):
+        for context in self.contexts:
+            context.__enter__()
+        return self.contexts
+
+    def __exit__(self, *exc_info):
+        for context in self.contexts:
+            context.__exit__(*exc_info)
+
+
+def _named_file(name, content):
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    return SimpleUploadedFile(name, content)
+
+
+def compare(results, baselines, threshold):
+    failures = []
+    lines = [f"{'benchmark':<36}{'current':>12}{'baseline':>12}{'change':>9}"]
+    for name, seconds in results["timings"].items():
+        baseline = baselines.get("timings", {}).get(name)
+        change = f"{(seconds / baseline - 1) * 100:+.0f}%" if baseline else "new"
+        lines.append(
+            f"{name:<36}{seconds * 1e3:>10.3f}ms"
+            f"{(baseline or 0) * 1e3:>10.3f}ms{change:>9}"
+        )
+        if baseline and seconds > baseline * (1 + threshold):
+            failures.append(f"{name}: {seconds * 1e3:.3f}ms vs baseline {baseline * 1e3:.3f}ms")
+
+    lines.append("")
+    lines.append(f"{'view':<36}{'queries':>12}{'budget':>12}")
+    for name, count in results["queries"].items():
+        budget = baselines.get("query_budgets", {}).get(name)
+        lines.append(f"{name:<36}{count:>12}{budget if budget is not None else '-':>12}")
+        if budget is not None and count > budget:
+            failures.append(f"{name}: {count} queries, budget is {budget}")
+    return "\n".join(lines), failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown against the baseline before failing (0.25 = 25%%).",
+    )
+    parser.add_argument("--only", help="Only run timing benchmarks whose name contains this.")
+    parser.add_argument("--update-baselines", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch, StubServers() as stubs:
+        setup_django(scratch, stubs)
+        api_user = seed_database()
+
+        benchmarks = timing_benchmarks()
+        results = {
+            "timings": {
+                name: time_call(func)
+                for name, func in benchmarks.items()
+                if not args.only or args.only in name
+            },
+            "queries": query_counts(api_user),
+        }
+
+    baselines = json.loads(BASELINES_PATH.read_text()) if BASELINES_PATH.exists() else {}
+    if args.update_baselines:
+        baselines.setdefault("timings", {}).update(results["timings"])
+        baselines["query_budgets"] = results["queries"]
+        BASELINES_PATH.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"Baselines written to {BASELINES_PATH}")
+        return
+
+    report, failures = compare(results, baselines, args.threshold)
+    print(report)
+    if failures:
+        print("\nREGRESSIONS:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Local stand-ins for the Gemini, Ukweli and Telegram HTTP APIs.
+
+Each stub implements just the contract the backend relies on:
+
+- Gemini:   POST /models/<model>:generateContent
+- Ukweli:   POST /api/verify/
+- Telegram: POST /bot<token>/sendMessage, /getUpdates and /deleteWebhook
+
+Latency is drawn from a configurable distribution and a configurable share of
+requests fails, so upstream behaviour can be reproduced without hitting the
+real services. The Telegram stub's getUpdates never runs dry: every poll is
+topped up with synthetic claims, and updates are redelivered until a later
+poll confirms them with ``offset``. Run standalone with::
+
+    python -m benchmarks.stubs --latency lognormal:0.4:0.5 --error-rate 0.02
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class LatencyProfile:
+    """Parses ``fixed:S``, ``uniform:LOW:HIGH`` or ``lognormal:MEDIAN:SIGMA`` (seconds)."""
+
+    def __init__(self, spec="fixed:0"):
+        kind, *args = spec.split(":")
+        values = [float(arg) for arg in args]
+        if kind == "fixed" and len(values) == 1:
+            self._sample = lambda: values[0]
+        elif kind == "uniform" and len(values) == 2:
+            self._sample = lambda: random.uniform(values[0], values[1])
+        elif kind == "lognormal" and len(values) == 2:
+            mu = math.log(values[0]) if values[0] > 0 else 0.0
+            self._sample = lambda: random.lognormvariate(mu, values[1]) if values[0] > 0 else 0.0
+        else:
+            raise ValueError(f"Invalid latency spec: {spec!r}")
+        self.spec = spec
+
+    def sample(self):
+        return max(0.0, self._sample())
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Set per server class by make_stub_server().
+    latency = LatencyProfile()
+    error_rate = 0.0
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):  # noqa: N802
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            payload = {}
+
+        time.sleep(self.latency.sample())
+        if random.random() < self.error_rate:
+            self.fail()
+            return
+        self.respond(payload)
+
+    def fail(self):
+        self._send_json(503, {"detail": "stub failure"})
+
+    def respond(self, payload):
+        raise NotImplementedError
+
+
+class GeminiStubHandler(StubHandler):
+    def respond(self, payload):
+        if not self.path.split("?", 1)[0].endswith(":generateContent"):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+        try:
+            prompt = payload["contents"][0]["parts"][0]["text"]
+        except (KeyError, IndexError, TypeError):
+            self._send_json(400, {"error": {"message": "bad request"}})
+            return
+        text = f"Stub answer to a {len(prompt)}-character prompt."
+        self._send_json(200, {"candidates": [{"content": {"parts": [{"text": text}]}}]})
+
+
+class UkweliStubHandler(StubHandler):
+    VERDICTS = ["TRUE", "FALSE", "MISLEADING", "UNVERIFIED"]
+
+    def respond(self, payload):
+        if self.path.split("?", 1)[0] != "/api/verify/" or not payload.get("claim"):
+            self._send_json(400, {"detail": "bad request"})
+            return
+        self._send_json(
+            200,
+            {
+                "claim": payload["claim"],
+                "final_verdict": random.choice(self.VERDICTS),
+                "explainable_confidence_score": round(random.random(), 3),
+                "top_evidence_snippet": {
+                    "verdict": "REFUTES",
+                    "evidence": "Stub evidence snippet.",
+                    "source": "https://example.org/stub",
+                },
+            },
+        )
+
+
+class TelegramStubHandler(StubHandler):
+    def fail(self):
+        # Telegram's flood control response.
+        self._send_json(
+            429,
+            {
+                "ok": False,
+                "error_code": 429,
+                "description": "Too Many Requests: retry after 1",
+                "parameters": {"retry_after": 1},
+            },
+        )
+
+    CHATS = 1000
+
+    _updates_lock = threading.Lock()
+    _unconfirmed = []
+    _last_update_id = 0
+
+    def respond(self, payload):
+        if self.path.endswith("/getUpdates"):
+            self._send_json(200, {"ok": True, "result": self._get_updates(payload)})
+            return
+        if self.path.endswith("/deleteWebhook"):
+            self._send_json(200, {"ok": True, "result": True})
+            return
+        if not self.path.endswith("/sendMessage"):
+            self._send_json(404, {"ok": False, "error_code": 404, "description": "Not Found"})
+            return
+        self._send_json(
+            200,
+            {
+                "ok": True,
+                "result": {
+                    "message_id": random.randint(1, 10**9),
+                    "chat": {"id": payload.get("chat_id")},
+                    "text": payload.get("text", ""),
+                },
+            },
+        )
+
+
+    def _get_updates(self, payload):
+        offset = payload.get("offset") or 0
+        limit = min(int(payload.get("limit") or 100), 100)
+        cls = type(self)
+        with cls._updates_lock:
+            cls._unconfirmed = [u for u in cls._unconfirmed if u["update_id"] >= offset]
+            while len(cls._unconfirmed) < limit:
+                cls._last_update_id += 1
+                chat_id = random.randint(1, self.CHATS)
+                cls._unconfirmed.append(
+                    {
+                        "update_id": cls._last_update_id,
+                        "message": {
+                            "message_id": cls._last_update_id,
+                            "chat": {"id": chat_id, "username": f"stub_user_{chat_id}"},
+                            "text": f"Stub claim number {cls._last_update_id}",
+                        },
+                    }
+                )
+            return cls._unconfirmed[:limit]
+
+
+def make_stub_server(handler_class, port=0, latency="fixed:0", error_rate=0.0):
+    handler = type(
+        handler_class.__name__,
+        (handler_class,),
+        {"latency": LatencyProfile(latency), "error_rate": error_rate},
+    )
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    return server
+
+
+class StubServers:
+    """Runs all three stubs in background threads (usable as a context manager)."""
+
+    def __init__(self, latency="fixed:0", error_rate=0.0, ports=(0, 0, 0), **overrides):
+        self.servers = {
+            "gemini": make_stub_server(
+                GeminiStubHandler,
+                ports[0],
+                overrides.get("gemini_latency") or latency,
+                error_rate,
+            ),
+            "ukweli": make_stub_server(
+                UkweliStubHandler,
+                ports[1],
+                overrides.get("ukweli_latency") or latency,
+                error_rate,
+            ),
+            "telegram": make_stub_server(
+                TelegramStubHandler,
+                ports[2],
+                overrides.get("telegram_latency") or latency,
+                error_rate,
+            ),
+        }
+
+    def url(self, name):
+        host, port = self.servers[name].server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self):
+        """Environment variables that point the backend at these stubs."""
+        return {
+            "GEMINI_API_KEY": "stub-key",
+            "GEMINI_API_BASE": self.url("gemini"),
+            "UKWELI_BASE_URL": self.url("ukweli"),
+            "TELEGRAM_BOT_TOKEN": "stub-token",
+            "TELEGRAM_API_BASE": self.url("telegram"),
+        }
+
+    def start(self):
+        for server in self.servers.values():
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        for server in self.servers.values():
+            server.shutdown()
+            server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def add_stub_arguments(parser):
+    parser.add_argument("--latency", default="fixed:0", help="Latency for every stub.")
+    parser.add_argument("--gemini-latency")
+    parser.add_argument("--ukweli-latency")
+    parser.add_argument("--telegram-latency")
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Share of stub calls that fail (0-1)."
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    add_stub_arguments(parser)
+    parser.add_argument("--gemini-port", type=int, default=9101)
+    parser.add_argument("--ukweli-port", type=int, default=9102)
+    parser.add_argument("--telegram-port", type=int, default=9103)
+    args = parser.parse_args()
+
+    stubs = StubServers(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        ports=(args.gemini_port, args.ukweli_port, args.telegram_port),
+        gemini_latency=args.gemini_latency,
+        ukweli_latency=args.ukweli_latency,
+        telegram_latency=args.telegram_latency,
+    ).start()
+    for name, value in stubs.env().items():
+        print(f"export {name}={value}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        stubs.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,9 @@ cd safeAi
 # Collect static files
 python manage.py collectstatic --noinput
 
+# Pre-generate the OpenAPI schema served by /api/schema/
+python manage.py spectacular --format openapi-json --file openapi-schema.json
+
 # Run migrations
 python manage.py migrate
 
@@ -0,0 +1,76 @@
+from django.contrib import admin
+
+from safeAi.db_router import read_from_replica
+
+from .conditional import note_changed
+from .models import APIUser, ChatUser, MessageLog, TelegramUser
+from .search import search_filter
+
+
+class ReplicaChangelistMixin:
+    """Serve admin list pages from a read replica when one is configured."""
+
+    def changelist_view(self, request, extra_context=None):
+        # Bulk actions are POSTed to the changelist; keep those on the primary.
+        if request.method not in ("GET", "HEAD"):
+            return super().changelist_view(request, extra_context)
+        with read_from_replica():
+            return super().changelist_view(request, extra_context)
+
+
+class NoteChangesMixin:
+    """Stamp edits and deletes, so the listing endpoints' ETags change (chat/conditional.py)."""
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if change:
+            note_changed(self.model)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        note_changed(self.model)
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        note_changed(self.model)
+
+
+@admin.register(ChatUser)
+class ChatUserAdmin(NoteChangesMixin, ReplicaChangelistMixin, admin.ModelAdmin):
+    list_display = ["id", "session_id", "created_at"]
+    search_fields = ["session_id"]
+
+
+@admin.register(TelegramUser)
+class TelegramUserAdmin(NoteChangesMixin, ReplicaChangelistMixin, admin.ModelAdmin):
+    list_display = ["id", "telegram_id", "username", "created_at"]
+    search_fields = ["username"]
+
+
+@admin.register(APIUser)
+class APIUserAdmin(NoteChangesMixin, ReplicaChangelistMixin, admin.ModelAdmin):
+    list_display = ["id", "company_name", "created_at"]
+    search_fields = ["company_name"]
+
+
+@admin.register(MessageLog)
+class MessageLogAdmin(NoteChangesMixin, ReplicaChangelistMixin, admin.ModelAdmin):
+    list_display = [
+        "id",
+        "source",
+        "chat_user",
+        "telegram_user",
+        "api_user",
+        "verdict",
+        "confidence",
+        "created_at",
+    ]
+    list_filter = ["source", "verdict"]
+    list_select_related = ["chat_user", "telegram_user", "api_user"]
+    search_fields = ["request_text", "response_text"]
+
+    def get_search_results(self, request, queryset, search_term):
+        # Use the full-text index instead of icontains scans over both texts.
+        if not search_term.strip():
+            return queryset, False
+        return queryset.filter(search_filter(search_term)), False
@@ -0,0 +1,34 @@
+"""
+Minimal in-process background execution for DB-backed jobs.
+
+Jobs are persisted before they are submitted here, so a job lost to a worker
+restart is picked up again by the matching management command.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import close_old_connections, connections
+
+
+logger = logging.getLogger(__name__)
+
+# One pool per job kind, so a long purge never holds up upload jobs.
+_executors = {
+    "uploads": ThreadPoolExecutor(max_workers=2, thread_name_prefix="safeai-uploads"),
+    "purges": ThreadPoolExecutor(max_workers=1, thread_name_prefix="safeai-purges"),
+}
+
+
+def _run(func, args, kwargs):
+    close_old_connections()
+    try:
+        func(*args, **kwargs)
+    except Exception:  # noqa: BLE001
+        logger.exception("Background task %s failed", getattr(func, "__name__", func))
+    finally:
+        connections.close_all()
+
+
+def run_in_background(pool, func, *args, **kwargs):
+    return _executors[pool].submit(_run, func, args, kwargs)
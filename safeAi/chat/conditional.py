@@ -0,0 +1,126 @@
+"""
+Conditional GET for polled read endpoints.
+
+Validators are computed from a few index lookups per table (oldest and newest
+row) or from the rollup checkpoint, never from the serialized data. Edits and
+deletes that leave both ends of a table alone are recorded with
+:func:`note_changed` in a :class:`~chat.models.TableStamp` row, which every
+worker (and replica) sees.
+
+A client that sends back the ``ETag`` or ``Last-Modified`` it was given gets a
+``304 Not Modified`` without the view running at all.
+"""
+
+import hashlib
+from calendar import timegm
+from functools import wraps
+
+from django.db.models import Subquery
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .models import RollupCheckpoint, TableStamp
+from .rollups import CHECKPOINT_NAME
+
+
+class Validators:
+    __slots__ = ("etag", "last_modified")
+
+    def __init__(self, parts, last_modified=None):
+        digest = hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()[:32]
+        # Weak: the body is equivalent, not byte-identical, across encodings.
+        self.etag = f'W/"{digest}"'
+        self.last_modified = last_modified
+
+
+def note_changed(model):
+    """Invalidate ``table_validators`` for ``model`` after editing or deleting rows.
+
+    Call it after every ``update()``, ``bulk_update()``, in-place ``save()`` or
+    delete on a table the validators cover; inserts need no stamp.
+    """
+    table, now = model._meta.label_lower, timezone.now()
+    # One UPDATE once the row exists; only the first stamp needs more.
+    if not TableStamp.objects.filter(table=table).update(changed_at=now):
+        TableStamp.objects.update_or_create(table=table, defaults={"changed_at": now})
+
+
+def table_validators(*models):
+    """Validators that change whenever rows of ``models`` are added, edited or removed.
+
+    Only index lookups: the oldest and newest id, the newest row's
+    ``created_at`` and the table's ``note_changed`` stamp.
+    """
+    parts = []
+    last_modified = None
+    for model in models:
+        # One query: the newest row plus the oldest id and the stamp as subqueries.
+        newest = (
+            model.objects.order_by("-id")
+            .annotate(
+                oldest_id=Subquery(model.objects.order_by("id").values("id")[:1]),
+                changed_at=Subquery(
+                    TableStamp.objects.filter(table=model._meta.label_lower).values("changed_at")[:1]
+                ),
+            )
+            .values("id", "created_at", "oldest_id", "changed_at")
+            .first()
+        )
+        # An empty table has nothing that could be stale, so no stamp is needed.
+        parts.append((model._meta.label, newest))
+        for changed_at in (newest and newest["created_at"], newest and newest["changed_at"]):
+            if changed_at and (last_modified is None or changed_at > last_modified):
+                last_modified = changed_at
+    return Validators(parts, last_modified)
+
+
+def rollup_validators():
+    """Validators for rollup reports: they only change when the checkpoint moves."""
+    checkpoint = (
+        RollupCheckpoint.objects.filter(name=CHECKPOINT_NAME)
+        .values("last_message_id", "updated_at")
+        .first()
+    )
+    if checkpoint is None:
+        return Validators(("rollups", 0))
+    return Validators(
+        ("rollups", checkpoint["last_message_id"], checkpoint["updated_at"]),
+        checkpoint["updated_at"],
+    )
+
+
+def conditional_get(validators_func):
+    """View decorator: ETag/Last-Modified headers and 304s from ``validators_func()``.
+
+    Place it under ``@use_read_replica`` so the validator queries are served
+    by the same database as the view, and under any access check: a 304 is
+    answered without the view running.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            validators = validators_func()
+            last_modified = None
+            if validators.last_modified is not None:
+                last_modified = timegm(validators.last_modified.utctimetuple())
+
+            response = get_conditional_response(
+                request, etag=validators.etag, last_modified=last_modified
+            )
+            if response is None:
+                response = view_func(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+
+            response.headers.setdefault("ETag", validators.etag)
+            if last_modified is not None and not response.has_header("Last-Modified"):
+                response.headers["Last-Modified"] = http_date(last_modified)
+            # Pollers should revalidate every time; the 304 makes that cheap.
+            response.headers.setdefault("Cache-Control", "no-cache")
+            return response
+
+        return wrapper
+
+    return decorator
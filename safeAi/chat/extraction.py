@@ -0,0 +1,79 @@
+import codecs
+from typing import Callable, List, Optional
+
+from django.core.files.uploadedfile import InMemoryUploadedFile
+
+
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def _iter_chunks(file):
+    if hasattr(file, "chunks"):
+        yield from file.chunks(READ_CHUNK_SIZE)
+        return
+    while True:
+        chunk = file.read(READ_CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _decode_text(file):
+    if isinstance(file, InMemoryUploadedFile):
+        # Already held in memory; decoding it in one go is cheaper.
+        file.seek(0)
+        return file.read().decode("utf-8", errors="ignore")
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    parts = []
+    for chunk in _iter_chunks(file):
+        parts.append(chunk if isinstance(chunk, str) else decoder.decode(chunk))
+    parts.append(decoder.decode(b"", final=True))
+    return "".join(parts)
+
+
+def extract_text(file, file_name: str, on_progress: Optional[ProgressCallback] = None) -> str:
+    """Extract plain text from a PDF, Word or text file.
+
+    ``on_progress(done, total)`` is called as pages are extracted; ``total`` is
+    None for formats without pages.
+    """
+    return "\n".join(extract_pages(file, file_name, on_progress))
+
+
+def extract_pages(file, file_name: str, on_progress: Optional[ProgressCallback] = None) -> List[str]:
+    """Like :func:`extract_text`, but one string per PDF page (a single one otherwise)."""
+    name = (file_name or "").lower()
+    if name.endswith(".pdf"):
+        from PyPDF2 import PdfReader
+
+        # Parse uploads spooled to disk through a file handle so pages are
+        # read on demand (given a path, PdfReader loads the whole file).
+        if hasattr(file, "temporary_file_path"):
+            with open(file.temporary_file_path(), "rb") as spooled:
+                return _extract_pdf(PdfReader(spooled), on_progress)
+        return _extract_pdf(PdfReader(file), on_progress)
+    if name.endswith(".docx") or name.endswith(".doc"):
+        from docx import Document
+
+        document = Document(file)
+        parts = [p.text for p in document.paragraphs if p.text]
+        if on_progress is not None:
+            on_progress(1, None)
+        return ["\n".join(parts)]
+    # Fallback: treat as text file
+    text = _decode_text(file)
+    if on_progress is not None:
+        on_progress(1, None)
+    return [text]
+
+
+def _extract_pdf(reader, on_progress):
+    total = len(reader.pages)
+    parts = []
+    for number, page in enumerate(reader.pages, start=1):
+        parts.append(page.extract_text() or "")
+        if on_progress is not None:
+            on_progress(number, total)
+    return parts
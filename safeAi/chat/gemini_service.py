@@ -3,6 +3,8 @@ from typing import Any, Dict
 
 import requests
 
+from .metrics import observe_upstream
+
 
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
 GEMINI_MODEL_NAME = os.environ.get("GEMINI_MODEL_NAME", "gemini-2.5-flash")
@@ -11,6 +13,12 @@ GEMINI_API_BASE = os.environ.get(
     "https://generativelanguage.googleapis.com/v1beta",
 )
 
+# Keep-alive pool for every Gemini call made by this process, so only the
+# first call pays for DNS and the TLS handshake.
+_session = requests.Session()
+_session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=16))
+_session.mount("http://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=16))
+
 
 class GeminiClientError(Exception):
     pass
@@ -33,25 +41,27 @@ def generate_gemini_response(message: str) -> str:
         ]
     }
 
-    try:
-        response = requests.post(
-            url,
-            headers=headers,
-            params=params,
-            json=payload,
-            timeout=30,
-        )
-    except requests.Timeout as exc:
-        raise GeminiClientError("Gemini API request timed out") from exc
-    except requests.RequestException as exc:
-        raise GeminiClientError(f"Gemini API request failed: {exc}") from exc
-    if response.status_code != 200:
-        raise GeminiClientError(
-            f"Gemini API error {response.status_code}: {response.text[:500]}"
-        )
-
-    data = response.json()
-    try:
-        return data["candidates"][0]["content"]["parts"][0]["text"]
-    except (KeyError, IndexError, TypeError) as exc:
-        raise GeminiClientError(f"Unexpected Gemini response format: {data}") from exc
+    with observe_upstream("gemini") as call:
+        try:
+            response = _session.post(
+                url,
+                headers=headers,
+                params=params,
+                json=payload,
+                timeout=30,
+            )
+        except requests.Timeout as exc:
+            raise GeminiClientError("Gemini API request timed out") from exc
+        except requests.RequestException as exc:
+            raise GeminiClientError(f"Gemini API request failed: {exc}") from exc
+        call.status_code = response.status_code
+        if response.status_code != 200:
+            raise GeminiClientError(
+                f"Gemini API error {response.status_code}: {response.text[:500]}"
+            )
+
+        data = response.json()
+        try:
+            return data["candidates"][0]["content"]["parts"][0]["text"]
+        except (KeyError, IndexError, TypeError) as exc:
+            raise GeminiClientError(f"Unexpected Gemini response format: {data}") from exc
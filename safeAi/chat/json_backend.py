@@ -0,0 +1,77 @@
+"""
+One JSON encoder/decoder for every response, DRF renderer/parser and log write.
+
+Uses orjson when it is installed and falls back to the stdlib ``json`` module
+with Django's ``DjangoJSONEncoder`` otherwise. Both produce the same output:
+datetimes, dates and times go through ``DjangoJSONEncoder`` (milliseconds,
+``Z`` for UTC), UUIDs and Decimals become strings.
+"""
+
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+_django_encoder = DjangoJSONEncoder()
+
+
+def _default(obj):
+    # orjson calls this for types it does not know natively (Decimal, lazy
+    # translation strings, timedelta, ...) and for the datetimes it is told to
+    # pass through; reuse Django's conversions.
+    return _django_encoder.default(obj)
+
+
+if orjson is not None:
+    # orjson would keep microseconds; DjangoJSONEncoder truncates to
+    # milliseconds, and clients parse that format.
+    _ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def dumps(data) -> bytes:
+        return orjson.dumps(data, default=_default, option=_ORJSON_OPTIONS)
+
+    def loads(data):
+        return orjson.loads(data)
+
+else:
+
+    def dumps(data) -> bytes:
+        return json.dumps(data, cls=DjangoJSONEncoder, separators=(",", ":")).encode("utf-8")
+
+    def loads(data):
+        return json.loads(data)
+
+
+def json_response(data, status=200, **kwargs):
+    """Drop-in for ``JsonResponse`` that encodes with the fast backend."""
+    kwargs.setdefault("content_type", "application/json")
+    return HttpResponse(dumps(data), status=status, **kwargs)
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        # Pretty-printing (``; indent=``) is only for humans; leave it to DRF.
+        if self.get_indent(accepted_media_type or "", renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class FastJSONParser(JSONParser):
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return loads(stream.read())
+        except ValueError as exc:
+            raise ParseError(f"JSON parse error - {exc}") from exc
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+
+from chat.retention import (
+    apply_retention_policies,
+    purge_telegram_outbox,
+    requeue_stale_purge_jobs,
+    retention_blocked_by_rollups,
+    run_pending_purge_jobs,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Archive and delete MessageLog rows past their source's retention period, "
+        "delete old sent or failed Telegram messages, then run pending bulk-delete jobs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--archive-dir", help="Overrides MESSAGE_LOG_ARCHIVE_DIR.")
+        parser.add_argument("--batch-size", type=int, help="Rows deleted per transaction.")
+        parser.add_argument("--pause", type=float, help="Seconds to sleep between batches.")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many rows retention would remove.",
+        )
+
+    def handle(self, *args, **options):
+        if retention_blocked_by_rollups():
+            self.stderr.write(
+                "rollup_usage has never run, so no expired logs will be purged. "
+                "Run it first, or set MESSAGE_LOG_PURGE_AFTER_ROLLUP=False."
+            )
+        purged = apply_retention_policies(
+            archive_dir=options["archive_dir"],
+            batch_size=options["batch_size"],
+            pause=options["pause"],
+            dry_run=options["dry_run"],
+        )
+        verb = "Would purge" if options["dry_run"] else "Purged"
+        for source, count in purged.items():
+            self.stdout.write(f"{verb} {count} {source} message logs")
+        outbox = purge_telegram_outbox(
+            batch_size=options["batch_size"], pause=options["pause"], dry_run=options["dry_run"]
+        )
+        self.stdout.write(f"{verb} {outbox} sent or failed Telegram messages")
+        if options["dry_run"]:
+            return
+
+        requeue_stale_purge_jobs()
+        jobs = run_pending_purge_jobs(batch_size=options["batch_size"], pause=options["pause"])
+        self.stdout.write(f"Ran {jobs} bulk-delete jobs")
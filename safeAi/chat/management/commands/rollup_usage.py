@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from chat.rollups import DEFAULT_BATCH_SIZE, DEFAULT_SETTLE_SECONDS, run_rollups
+
+
+class Command(BaseCommand):
+    help = "Fold new MessageLog rows into the usage and verdict rollup tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--settle-seconds", type=int, default=DEFAULT_SETTLE_SECONDS)
+        parser.add_argument(
+            "--loop",
+            type=int,
+            default=0,
+            metavar="SECONDS",
+            help="Keep running, catching up every SECONDS seconds.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            processed = run_rollups(
+                batch_size=options["batch_size"],
+                settle_seconds=options["settle_seconds"],
+            )
+            self.stdout.write(f"Rolled up {processed} message logs")
+            if not options["loop"]:
+                return
+            time.sleep(options["loop"])
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from chat.upload_jobs import requeue_stale_upload_jobs, run_pending_upload_jobs
+
+
+class Command(BaseCommand):
+    help = "Process pending background upload jobs, retrying ones orphaned by a restart."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            type=float,
+            default=0,
+            metavar="SECONDS",
+            help="Keep polling for new jobs every SECONDS seconds.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            requeued = requeue_stale_upload_jobs()
+            if requeued:
+                self.stdout.write(f"Requeued {requeued} stale upload jobs")
+            processed = run_pending_upload_jobs()
+            if processed or not options["loop"]:
+                self.stdout.write(f"Processed {processed} upload jobs")
+            if not options["loop"]:
+                return
+            time.sleep(options["loop"])
@@ -0,0 +1,62 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from chat.telegram_service import TelegramClientError, delete_telegram_webhook, get_telegram_updates
+from chat.telegram_updates import process_updates
+
+
+class Command(BaseCommand):
+    help = (
+        "Consume Telegram updates with getUpdates long polling instead of the webhook. "
+        "Each batch is verified concurrently and logged in bulk."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--timeout", type=int, default=30, help="Long-poll timeout in seconds.")
+        parser.add_argument("--limit", type=int, default=100, help="Updates fetched per batch (1-100).")
+        parser.add_argument("--workers", type=int, default=8, help="Concurrent Ukweli/Telegram calls.")
+        parser.add_argument(
+            "--delete-webhook",
+            action="store_true",
+            help="Remove the bot's webhook first; Telegram refuses getUpdates while one is set.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process a single batch and exit; exit non-zero if getUpdates fails.",
+        )
+
+    def handle(self, *args, **options):
+        if options["delete_webhook"]:
+            delete_telegram_webhook()
+
+        # Telegram keeps unconfirmed updates; asking for offset=last+1 confirms
+        # the batch we just handled. A crash mid-batch means it is redelivered.
+        offset = None
+        backoff = 1
+        while True:
+            try:
+                updates = get_telegram_updates(offset, timeout=options["timeout"], limit=options["limit"])
+            except TelegramClientError as exc:
+                if options["once"]:
+                    raise CommandError(f"getUpdates failed: {exc}") from exc
+                self.stderr.write(f"getUpdates failed: {exc}; retrying in {backoff}s")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 60)
+                continue
+            backoff = 1
+
+            if updates:
+                handled = process_updates(updates, max_workers=options["workers"])
+                offset = max(update["update_id"] for update in updates) + 1
+                self.stdout.write(f"Processed {handled} messages from {len(updates)} updates")
+
+            if options["once"]:
+                if offset is not None:
+                    # Confirm the batch without waiting for new updates.
+                    try:
+                        get_telegram_updates(offset, timeout=0, limit=1)
+                    except TelegramClientError as exc:
+                        self.stderr.write(f"Could not confirm the batch, it will be redelivered: {exc}")
+                return
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from chat.telegram_outbox import OutboxSender, update_outbox_depth
+
+
+class Command(BaseCommand):
+    help = (
+        "Deliver queued Telegram messages within the Bot API rate limits, "
+        "retrying failed sends with backoff."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4, help="Concurrent sendMessage calls.")
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=0.5,
+            help="Seconds to wait when nothing can be sent.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once nothing is due, instead of running forever.",
+        )
+
+    def handle(self, *args, **options):
+        sender = OutboxSender(workers=options["workers"])
+        try:
+            sender.run(poll_interval=options["poll_interval"], once=options["once"])
+        finally:
+            sender.shutdown()
+            self.stdout.write(f"{update_outbox_depth()} Telegram messages still queued")
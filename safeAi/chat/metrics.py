@@ -0,0 +1,145 @@
+"""
+Prometheus instrumentation.
+
+With several gunicorn/uvicorn worker processes, set ``PROMETHEUS_MULTIPROC_DIR``
+to an empty, writable directory before the server starts; every worker then
+writes its samples there and ``/metrics`` aggregates them (see
+``gunicorn.conf.py``). Without it, ``/metrics`` reports the serving process only.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+import requests
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+from .timing import span
+
+
+UPSTREAM_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, float("inf"))
+
+REQUEST_LATENCY = Histogram(
+    "safeai_http_request_duration_seconds",
+    "Time spent serving HTTP requests, by URL name.",
+    ["view", "method", "status"],
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "safeai_http_requests_in_flight",
+    "HTTP requests currently being served.",
+    multiprocess_mode="livesum",
+)
+DB_QUERIES = Histogram(
+    "safeai_db_queries_per_request",
+    "Number of DB queries run while serving one request.",
+    ["view"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, float("inf")),
+)
+DB_TIME = Histogram(
+    "safeai_db_query_seconds_per_request",
+    "Total DB query time while serving one request.",
+    ["view"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, float("inf")),
+)
+UPSTREAM_LATENCY = Histogram(
+    "safeai_upstream_request_duration_seconds",
+    "Latency of calls to upstream services (gemini, ukweli, telegram).",
+    ["upstream", "outcome"],
+    buckets=UPSTREAM_BUCKETS,
+)
+UPSTREAM_ERRORS = Counter(
+    "safeai_upstream_errors_total",
+    "Failed upstream calls, by kind (timeout, connection, http_<status>, ...).",
+    ["upstream", "kind"],
+)
+UPSTREAM_IN_FLIGHT = Gauge(
+    "safeai_upstream_requests_in_flight",
+    "Upstream calls currently waiting for a response.",
+    ["upstream"],
+    multiprocess_mode="livesum",
+)
+
+TELEGRAM_DELIVERIES = Counter(
+    "safeai_telegram_deliveries_total",
+    "Telegram outbox delivery attempts, by outcome (sent, retry, failed).",
+    ["outcome"],
+)
+TELEGRAM_DELIVERY_DELAY = Histogram(
+    "safeai_telegram_delivery_delay_seconds",
+    "Time from queueing a Telegram message to its delivery.",
+    buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60, 300, 900, float("inf")),
+)
+TELEGRAM_OUTBOX_DEPTH = Gauge(
+    "safeai_telegram_outbox_depth",
+    "Telegram messages waiting for delivery, as last counted by the sender.",
+    multiprocess_mode="mostrecent",
+)
+UKWELI_CACHE = Counter(
+    "safeai_ukweli_verdict_cache_total",
+    "Ukweli verdict lookups by outcome (hit, miss), plus proactive refreshes (refresh).",
+    ["outcome"],
+)
+UPLOAD_TOKENS = Counter(
+    "safeai_upload_tokens_total",
+    "Estimated Gemini input tokens of uploaded documents, as extracted and as sent after preprocessing.",
+    ["stage"],
+)
+
+
+class UpstreamCall:
+    """Handle yielded by :func:`observe_upstream`; set ``status_code`` once known."""
+
+    __slots__ = ("status_code",)
+
+    def __init__(self):
+        self.status_code = None
+
+    def error_kind(self, exc):
+        cause = exc.__cause__ or exc
+        if isinstance(cause, requests.Timeout):
+            return "timeout"
+        if isinstance(cause, requests.ConnectionError):
+            return "connection"
+        if self.status_code is not None and self.status_code >= 400:
+            return f"http_{self.status_code}"
+        return type(cause).__name__
+
+
+@contextmanager
+def observe_upstream(upstream):
+    """Time an upstream call; an exception leaving the block counts as an error."""
+    call = UpstreamCall()
+    in_flight = UPSTREAM_IN_FLIGHT.labels(upstream)
+    in_flight.inc()
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        with span("upstream"):
+            yield call
+        outcome = "success"
+    except Exception as exc:
+        UPSTREAM_ERRORS.labels(upstream, call.error_kind(exc)).inc()
+        raise
+    finally:
+        in_flight.dec()
+        UPSTREAM_LATENCY.labels(upstream, outcome).observe(time.perf_counter() - start)
+
+
+def render_metrics():
+    """Return ``(body, content_type)`` in the Prometheus text format."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0003_alter_messagelog_source'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='messagelog',
+            name='confidence',
+            field=models.FloatField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='messagelog',
+            name='result',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='messagelog',
+            name='verdict',
+            field=models.CharField(blank=True, db_index=True, max_length=32, null=True),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:12
+
+import json
+
+from django.db import migrations, transaction
+
+
+BATCH_SIZE = 1000
+
+
+def _extract_verdict(result):
+    # Frozen copy of chat.ukweli_service.extract_verdict.
+    verdict = result.get("final_verdict")
+    if verdict is not None:
+        verdict = str(verdict)[:32]
+    score = result.get("explainable_confidence_score")
+    confidence = float(score) if isinstance(score, (int, float)) and not isinstance(score, bool) else None
+    return verdict, confidence
+
+
+def backfill_ukweli_results(apps, schema_editor):
+    MessageLog = apps.get_model("chat", "MessageLog")
+    db_alias = schema_editor.connection.alias
+    queryset = MessageLog.objects.using(db_alias).filter(
+        source="ukweli", result__isnull=True
+    ).order_by("id")
+
+    last_id = 0
+    while True:
+        batch = list(
+            queryset.filter(id__gt=last_id).only("id", "response_text")[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        last_id = batch[-1].id
+
+        updated = []
+        for log in batch:
+            try:
+                result = json.loads(log.response_text)
+            except ValueError:
+                # Error messages were stored as plain text; nothing to extract.
+                continue
+            if not isinstance(result, dict):
+                continue
+            log.result = result
+            log.verdict, log.confidence = _extract_verdict(result)
+            updated.append(log)
+
+        if updated:
+            with transaction.atomic(using=db_alias):
+                MessageLog.objects.using(db_alias).bulk_update(
+                    updated, ["result", "verdict", "confidence"]
+                )
+
+
+class Migration(migrations.Migration):
+
+    # Each batch commits on its own so the backfill never holds long locks.
+    atomic = False
+
+    dependencies = [
+        ('chat', '0004_messagelog_ukweli_result'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_ukweli_results, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0005_backfill_messagelog_ukweli_result'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('last_message_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='messagelog',
+            name='is_error',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.CreateModel(
+            name='UsageRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=8)),
+                ('bucket_start', models.DateTimeField()),
+                ('source', models.CharField(choices=[('chat', 'Chat'), ('telegram', 'Telegram'), ('api', 'API'), ('ukweli', 'Ukweli')], max_length=20)),
+                ('verdict', models.CharField(blank=True, default='', max_length=32)),
+                ('request_count', models.BigIntegerField(default=0)),
+                ('error_count', models.BigIntegerField(default=0)),
+                ('api_user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='usage_rollups', to='chat.apiuser')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['period', 'bucket_start'], name='chat_usager_period_db3c19_idx'), models.Index(fields=['api_user', 'period', 'bucket_start'], name='chat_usager_api_use_53e5a3_idx')],
+            },
+        ),
+    ]
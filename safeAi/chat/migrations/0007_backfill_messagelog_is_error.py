@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:14
+
+from django.db import migrations, transaction
+from django.db.models import Q
+
+
+BATCH_SIZE = 5000
+
+
+def backfill_is_error(apps, schema_editor):
+    # Only the failures that can be recognised after the fact: Ukweli calls
+    # without a stored result and rejected API keys.
+    MessageLog = apps.get_model("chat", "MessageLog")
+    db_alias = schema_editor.connection.alias
+    logs = MessageLog.objects.using(db_alias)
+    failed = Q(source="ukweli", result__isnull=True) | Q(response_text="Invalid API key")
+
+    last_id = 0
+    max_id = logs.order_by("-id").values_list("id", flat=True).first() or 0
+    while last_id < max_id:
+        upper = last_id + BATCH_SIZE
+        with transaction.atomic(using=db_alias):
+            logs.filter(failed, id__gt=last_id, id__lte=upper).update(is_error=True)
+        last_id = upper
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('chat', '0006_usage_rollups'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_is_error, migrations.RunPython.noop),
+    ]
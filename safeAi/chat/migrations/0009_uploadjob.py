@@ -0,0 +1,38 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:21
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0008_purgejob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('message', models.TextField(blank=True, default='')),
+                ('file_name', models.CharField(max_length=255)),
+                ('file_path', models.CharField(max_length=500)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('extracting', 'Extracting'), ('generating', 'Generating'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('pages_done', models.IntegerField(default=0)),
+                ('pages_total', models.IntegerField(blank=True, null=True)),
+                ('chunks_done', models.IntegerField(default=0)),
+                ('chunks_total', models.IntegerField(blank=True, null=True)),
+                ('response_text', models.TextField(blank=True, default='')),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('chat_user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='upload_jobs', to='chat.chatuser')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'updated_at'], name='chat_upload_status_4dd16b_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,130 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:40
+
+from django.db import migrations
+
+
+BATCH_SIZE = 5000
+
+# Texts are cut before indexing so one huge upload cannot exceed the 1 MB
+# tsvector limit and fail the INSERT.
+PG_SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', left(coalesce({row}.request_text, ''), 100000)), 'A') || "
+    "setweight(to_tsvector('simple', left(coalesce({row}.response_text, ''), 100000)), 'B')"
+)
+
+
+def _postgres_forwards(schema_editor):
+    execute = schema_editor.execute
+    # Nullable column: instant, no table rewrite. The trigger keeps new and
+    # edited rows indexed while the backfill below catches up.
+    execute("ALTER TABLE chat_messagelog ADD COLUMN IF NOT EXISTS search_vector tsvector")
+    execute(
+        f"""
+        CREATE OR REPLACE FUNCTION chat_messagelog_search_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {PG_SEARCH_VECTOR.format(row="NEW")};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    execute("DROP TRIGGER IF EXISTS chat_messagelog_search_update ON chat_messagelog")
+    execute(
+        "CREATE TRIGGER chat_messagelog_search_update "
+        "BEFORE INSERT OR UPDATE OF request_text, response_text ON chat_messagelog "
+        "FOR EACH ROW EXECUTE PROCEDURE chat_messagelog_search_update()"
+    )
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT coalesce(max(id), 0) FROM chat_messagelog")
+        max_id = cursor.fetchone()[0]
+        last_id = 0
+        # Migration is non-atomic, so every batch commits on its own.
+        while last_id < max_id:
+            cursor.execute(
+                f"UPDATE chat_messagelog SET search_vector = {PG_SEARCH_VECTOR.format(row='chat_messagelog')} "
+                "WHERE id > %s AND id <= %s AND search_vector IS NULL",
+                [last_id, last_id + BATCH_SIZE],
+            )
+            last_id += BATCH_SIZE
+
+    execute(
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS chat_messagelog_search_idx "
+        "ON chat_messagelog USING GIN (search_vector)"
+    )
+
+
+def _postgres_backwards(schema_editor):
+    execute = schema_editor.execute
+    execute("DROP INDEX CONCURRENTLY IF EXISTS chat_messagelog_search_idx")
+    execute("DROP TRIGGER IF EXISTS chat_messagelog_search_update ON chat_messagelog")
+    execute("DROP FUNCTION IF EXISTS chat_messagelog_search_update()")
+    execute("ALTER TABLE chat_messagelog DROP COLUMN IF EXISTS search_vector")
+
+
+def _sqlite_forwards(schema_editor):
+    execute = schema_editor.execute
+    # External-content FTS5 table: stores only the index, kept in sync by
+    # triggers. Local/dev databases only, so one 'rebuild' is enough.
+    execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS chat_messagelog_fts USING fts5("
+        "request_text, response_text, content='chat_messagelog', content_rowid='id')"
+    )
+    execute(
+        "CREATE TRIGGER IF NOT EXISTS chat_messagelog_fts_insert AFTER INSERT ON chat_messagelog BEGIN "
+        "INSERT INTO chat_messagelog_fts(rowid, request_text, response_text) "
+        "VALUES (new.id, new.request_text, new.response_text); END"
+    )
+    execute(
+        "CREATE TRIGGER IF NOT EXISTS chat_messagelog_fts_delete AFTER DELETE ON chat_messagelog BEGIN "
+        "INSERT INTO chat_messagelog_fts(chat_messagelog_fts, rowid, request_text, response_text) "
+        "VALUES ('delete', old.id, old.request_text, old.response_text); END"
+    )
+    execute(
+        "CREATE TRIGGER IF NOT EXISTS chat_messagelog_fts_update "
+        "AFTER UPDATE OF request_text, response_text ON chat_messagelog BEGIN "
+        "INSERT INTO chat_messagelog_fts(chat_messagelog_fts, rowid, request_text, response_text) "
+        "VALUES ('delete', old.id, old.request_text, old.response_text); "
+        "INSERT INTO chat_messagelog_fts(rowid, request_text, response_text) "
+        "VALUES (new.id, new.request_text, new.response_text); END"
+    )
+    execute("INSERT INTO chat_messagelog_fts(chat_messagelog_fts) VALUES ('rebuild')")
+
+
+def _sqlite_backwards(schema_editor):
+    execute = schema_editor.execute
+    for trigger in ("insert", "delete", "update"):
+        execute(f"DROP TRIGGER IF EXISTS chat_messagelog_fts_{trigger}")
+    execute("DROP TABLE IF EXISTS chat_messagelog_fts")
+
+
+def add_search_index(apps, schema_editor):
+    # Other backends fall back to icontains matching in chat/search.py.
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        _postgres_forwards(schema_editor)
+    elif vendor == "sqlite":
+        _sqlite_forwards(schema_editor)
+
+
+def remove_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        _postgres_backwards(schema_editor)
+    elif vendor == "sqlite":
+        _sqlite_backwards(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    # The backfill commits per batch and CREATE INDEX CONCURRENTLY cannot run
+    # inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('chat', '0010_telegramoutbox'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_index, remove_search_index),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:05
+
+from django.db import migrations, transaction
+
+
+BATCH_SIZE = 1000
+
+
+def _format_ukweli_reply(result):
+    # Frozen copy of chat.telegram_service.format_ukweli_reply.
+    verdict = result.get("final_verdict", "UNKNOWN")
+    score = result.get("explainable_confidence_score")
+    snippet = result.get("top_evidence_snippet") or {}
+
+    evidence_verdict = snippet.get("verdict")
+    evidence_text = snippet.get("evidence")
+    evidence_source = snippet.get("source")
+
+    parts = [f"Verdict: {verdict}"]
+    if isinstance(score, (int, float)):
+        parts.append(f"Confidence: {score:.2f}")
+
+    if evidence_verdict or evidence_text or evidence_source:
+        parts.append("")
+        parts.append("Top evidence:")
+        if evidence_verdict:
+            parts.append(f"- Stance: {evidence_verdict}")
+        if evidence_text:
+            parts.append(f"- Evidence: {evidence_text}")
+        if evidence_source:
+            parts.append(f"- Source: {evidence_source}")
+
+    return "\n".join(parts)
+
+
+def format_ukweli_response_text(apps, schema_editor):
+    """Rewrite successful Ukweli logs to hold the formatted reply.
+
+    Older rows stored the raw JSON result (now in ``result``) or only the
+    verdict in ``response_text``.
+    """
+    MessageLog = apps.get_model("chat", "MessageLog")
+    db_alias = schema_editor.connection.alias
+    queryset = MessageLog.objects.using(db_alias).filter(
+        source="ukweli", result__isnull=False, is_error=False
+    ).order_by("id")
+
+    last_id = 0
+    while True:
+        batch = list(queryset.filter(id__gt=last_id).only("id", "result", "response_text")[:BATCH_SIZE])
+        if not batch:
+            break
+        last_id = batch[-1].id
+
+        updated = []
+        for log in batch:
+            if not isinstance(log.result, dict):
+                continue
+            reply = _format_ukweli_reply(log.result)
+            if log.response_text != reply:
+                log.response_text = reply
+                updated.append(log)
+
+        if updated:
+            with transaction.atomic(using=db_alias):
+                MessageLog.objects.using(db_alias).bulk_update(updated, ["response_text"])
+
+
+class Migration(migrations.Migration):
+
+    # Each batch commits on its own so the backfill never holds long locks.
+    atomic = False
+
+    dependencies = [
+        ('chat', '0011_messagelog_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(format_ukweli_response_text, migrations.RunPython.noop),
+    ]
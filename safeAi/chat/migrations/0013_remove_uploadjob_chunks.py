@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:16
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0012_ukweli_response_text'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='uploadjob',
+            name='chunks_done',
+        ),
+        migrations.RemoveField(
+            model_name='uploadjob',
+            name='chunks_total',
+        ),
+    ]
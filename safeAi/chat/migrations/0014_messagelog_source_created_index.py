@@ -0,0 +1,39 @@
+from django.db import migrations, models
+
+
+INDEX = models.Index(fields=["source", "created_at"], name="chat_msglog_source_created")
+
+
+def add_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        # Built without locking writes to the log table.
+        schema_editor.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS chat_msglog_source_created "
+            "ON chat_messagelog (source, created_at)"
+        )
+    else:
+        schema_editor.add_index(apps.get_model("chat", "MessageLog"), INDEX)
+
+
+def remove_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX CONCURRENTLY IF EXISTS chat_msglog_source_created")
+    else:
+        schema_editor.remove_index(apps.get_model("chat", "MessageLog"), INDEX)
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('chat', '0013_remove_uploadjob_chunks'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[migrations.RunPython(add_index, remove_index)],
+            state_operations=[migrations.AddIndex(model_name="messagelog", index=INDEX)],
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:39
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def seed_stamps(apps, schema_editor):
+    # Tables behind the conditional GET endpoints; later stamps are one UPDATE.
+    TableStamp = apps.get_model("chat", "TableStamp")
+    db_alias = schema_editor.connection.alias
+    now = timezone.now()
+    TableStamp.objects.using(db_alias).bulk_create(
+        [
+            TableStamp(table=table, changed_at=now)
+            for table in ("chat.chatuser", "chat.telegramuser", "chat.apiuser", "chat.messagelog")
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0014_messagelog_source_created_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TableStamp',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('table', models.CharField(max_length=100, unique=True)),
+                ('changed_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.RunPython(seed_stamps, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,7 @@
+import uuid
+
 from django.db import models
+from django.utils import timezone
 
 
 class ChatUser(models.Model):
@@ -42,4 +45,148 @@ class MessageLog(models.Model):
     )
     request_text = models.TextField()
     response_text = models.TextField()
+    # Structured Ukweli verification result; verdict/confidence are pulled out
+    # of it so dashboards can filter and aggregate on indexed columns.
+    result = models.JSONField(null=True, blank=True)
+    verdict = models.CharField(max_length=32, null=True, blank=True, db_index=True)
+    confidence = models.FloatField(null=True, blank=True, db_index=True)
+    is_error = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Retention purges and exports select by source and age.
+            models.Index(fields=["source", "created_at"], name="chat_msglog_source_created"),
+        ]
+
+
+class UsageRollup(models.Model):
+    """Request/error counts per period bucket x source x API user x verdict.
+
+    Filled incrementally from MessageLog by ``manage.py rollup_usage`` so that
+    usage and verdict reports never scan the log table.
+    """
+
+    PERIOD_CHOICES = [
+        ("hour", "Hour"),
+        ("day", "Day"),
+    ]
+
+    period = models.CharField(max_length=8, choices=PERIOD_CHOICES)
+    bucket_start = models.DateTimeField()
+    source = models.CharField(max_length=20, choices=MessageLog.SOURCE_CHOICES)
+    api_user = models.ForeignKey(
+        APIUser, null=True, blank=True, on_delete=models.SET_NULL, related_name="usage_rollups"
+    )
+    verdict = models.CharField(max_length=32, blank=True, default="")
+    request_count = models.BigIntegerField(default=0)
+    error_count = models.BigIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["period", "bucket_start"]),
+            models.Index(fields=["api_user", "period", "bucket_start"]),
+        ]
+
+
+class RollupCheckpoint(models.Model):
+    """High-water mark: the last MessageLog id folded into the rollups."""
+
+    name = models.CharField(max_length=50, unique=True)
+    last_message_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+
+class TableStamp(models.Model):
+    """When rows of a table were last edited in place or deleted.
+
+    Read by the conditional GET validators in chat/conditional.py, which
+    otherwise only see rows being added.
+    """
+
+    table = models.CharField(max_length=100, unique=True)
+    changed_at = models.DateTimeField()
+
+
+class PurgeJob(models.Model):
+    """A filter-based bulk delete of MessageLog rows, run in the background."""
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("succeeded", "Succeeded"),
+        ("failed", "Failed"),
+    ]
+
+    filters = models.JSONField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    deleted_count = models.BigIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+
+class UploadJob(models.Model):
+    """A document upload answered in the background (``mode=async``).
+
+    The uploaded file is spooled to UPLOAD_JOB_DIR and the job row tracks
+    progress, so a job survives a worker restart and is resumed by
+    ``manage.py run_upload_jobs``.
+    """
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("extracting", "Extracting"),
+        ("generating", "Generating"),
+        ("succeeded", "Succeeded"),
+        ("failed", "Failed"),
+    ]
+    TERMINAL_STATUSES = ("succeeded", "failed")
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    chat_user = models.ForeignKey(
+        ChatUser, null=True, blank=True, on_delete=models.SET_NULL, related_name="upload_jobs"
+    )
+    message = models.TextField(blank=True, default="")
+    file_name = models.CharField(max_length=255)
+    file_path = models.CharField(max_length=500)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    pages_done = models.IntegerField(default=0)
+    pages_total = models.IntegerField(null=True, blank=True)
+    response_text = models.TextField(blank=True, default="")
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "updated_at"])]
+
+
+class TelegramOutbox(models.Model):
+    """One outgoing Telegram message, delivered by chat/telegram_outbox.py.
+
+    Replies are queued here before the first delivery attempt, so a reply
+    that hits flood control or a network error is retried rather than lost.
+    """
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("sending", "Sending"),
+        ("sent", "Sent"),
+        ("failed", "Failed"),
+    ]
+
+    chat_id = models.BigIntegerField()
+    text = models.TextField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.utils.crypto import constant_time_compare
+
+
+INTERNAL_TOKEN_HEADER = "X-Internal-Token"
+
+
+def has_internal_access(request) -> bool:
+    """Allow ops-only endpoints for staff users or holders of INTERNAL_API_TOKEN."""
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated and user.is_staff:
+        return True
+    return has_internal_token(request)
+
+
+def has_internal_token(request) -> bool:
+    """Like ``has_internal_access`` but without the staff check, so no DB query."""
+    token = settings.INTERNAL_API_TOKEN
+    if not token:
+        return settings.DEBUG
+    supplied = request.headers.get(INTERNAL_TOKEN_HEADER, "")
+    if not supplied:
+        # Prometheus and most scrapers can only send a bearer token.
+        authorization = request.headers.get("Authorization", "")
+        if authorization.startswith("Bearer "):
+            supplied = authorization[len("Bearer "):]
+    return constant_time_compare(supplied, token)
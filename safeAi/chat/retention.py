@@ -0,0 +1,222 @@
+"""
+MessageLog retention: archive expired rows, then delete them in small batches.
+Delivered and failed TelegramOutbox rows are deleted the same way, unarchived.
+
+Rows are walked in id order. Each batch is written to gzip-compressed JSONL
+files partitioned by source and day, flushed, and only then deleted in its own
+short transaction. A crash between the two steps re-exports the batch on the
+next run instead of losing it.
+
+Archive layout::
+
+    <archive_dir>/source=<source>/date=<YYYY-MM-DD>/messagelog-<run>.jsonl.gz
+"""
+
+import gzip
+import logging
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .conditional import note_changed
+from .json_backend import dumps
+from .models import MessageLog, PurgeJob, TelegramOutbox
+from .rollups import get_high_water_mark
+
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FIELDS = [
+    "id",
+    "source",
+    "chat_user_id",
+    "telegram_user_id",
+    "api_user_id",
+    "request_text",
+    "response_text",
+    "result",
+    "verdict",
+    "confidence",
+    "is_error",
+    "created_at",
+]
+
+
+class MessageLogArchive:
+    """Append-only, date-partitioned JSONL.gz writer for one purge run."""
+
+    def __init__(self, archive_dir):
+        self.archive_dir = Path(archive_dir)
+        self.run_id = timezone.now().strftime("%Y%m%dT%H%M%S")
+        self._files = {}
+
+    def _file_for(self, source, day):
+        key = (source, day)
+        if key not in self._files:
+            directory = self.archive_dir / f"source={source}" / f"date={day}"
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / f"messagelog-{self.run_id}.jsonl.gz"
+            self._files[key] = gzip.open(path, "ab")
+        return self._files[key]
+
+    def write(self, rows):
+        for row in rows:
+            archive_file = self._file_for(row["source"], row["created_at"].date().isoformat())
+            archive_file.write(dumps(row) + b"\n")
+        for archive_file in self._files.values():
+            archive_file.flush()
+
+    def close(self):
+        for archive_file in self._files.values():
+            archive_file.close()
+        self._files.clear()
+
+
+def purge_in_batches(queryset, batch_size=None, archive=None, pause=None) -> int:
+    """Delete every row in ``queryset`` in id-ordered batches; return the count."""
+    model = queryset.model
+    batch_size = batch_size or settings.MESSAGE_LOG_PURGE_BATCH_SIZE
+    pause = settings.MESSAGE_LOG_PURGE_PAUSE if pause is None else pause
+
+    deleted = 0
+    last_id = 0
+    while True:
+        ids = list(
+            queryset.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        last_id = ids[-1]
+
+        if archive is not None:
+            archive.write(
+                MessageLog.objects.filter(id__in=ids).order_by("id").values(*ARCHIVE_FIELDS)
+            )
+        with transaction.atomic():
+            batch_deleted, _ = model.objects.filter(id__in=ids).delete()
+        deleted += batch_deleted
+        note_changed(model)
+
+        if pause:
+            time.sleep(pause)
+
+
+def expired_message_logs(source, days, now=None):
+    cutoff = (now or timezone.now()) - timedelta(days=days)
+    expired = MessageLog.objects.filter(source=source, created_at__lt=cutoff)
+    if settings.MESSAGE_LOG_PURGE_AFTER_ROLLUP:
+        # Keep rows the rollup job has not counted yet, so reports stay complete.
+        expired = expired.filter(id__lte=get_high_water_mark())
+    return expired
+
+
+def retention_blocked_by_rollups() -> bool:
+    """True when the rollup guard keeps every row because rollup_usage never ran."""
+    return (
+        bool(settings.MESSAGE_LOG_RETENTION_DAYS)
+        and settings.MESSAGE_LOG_PURGE_AFTER_ROLLUP
+        and get_high_water_mark() == 0
+    )
+
+
+def apply_retention_policies(archive_dir=None, batch_size=None, pause=None, dry_run=False):
+    """Archive and delete expired rows for every source with a retention policy."""
+    if retention_blocked_by_rollups():
+        logger.warning(
+            "rollup_usage has never run, so retention keeps every message log. "
+            "Run it first, or set MESSAGE_LOG_PURGE_AFTER_ROLLUP=False."
+        )
+    archive = None if dry_run else MessageLogArchive(
+        archive_dir or settings.MESSAGE_LOG_ARCHIVE_DIR
+    )
+    purged = {}
+    try:
+        for source, days in settings.MESSAGE_LOG_RETENTION_DAYS.items():
+            expired = expired_message_logs(source, days)
+            if dry_run:
+                purged[source] = expired.count()
+                continue
+            purged[source] = purge_in_batches(
+                expired, batch_size=batch_size, archive=archive, pause=pause
+            )
+            logger.info("Purged %s expired %s message logs", purged[source], source)
+    finally:
+        if archive is not None:
+            archive.close()
+    return purged
+
+
+def finished_outbox_messages(days, now=None):
+    cutoff = (now or timezone.now()) - timedelta(days=days)
+    return TelegramOutbox.objects.filter(status__in=["sent", "failed"], updated_at__lt=cutoff)
+
+
+def purge_telegram_outbox(batch_size=None, pause=None, dry_run=False):
+    """Delete outbox rows that were sent or gave up more than TELEGRAM_OUTBOX_RETENTION_DAYS ago."""
+    if not settings.TELEGRAM_OUTBOX_RETENTION_DAYS:
+        return 0
+    finished = finished_outbox_messages(settings.TELEGRAM_OUTBOX_RETENTION_DAYS)
+    if dry_run:
+        return finished.count()
+    return purge_in_batches(finished, batch_size=batch_size, pause=pause)
+
+
+def purge_job_queryset(filters):
+    queryset = MessageLog.objects.all()
+    for field in ("source", "chat_user", "telegram_user", "api_user"):
+        if filters.get(field) is not None:
+            queryset = queryset.filter(**{field: filters[field]})
+    if filters.get("created_after"):
+        queryset = queryset.filter(created_at__gte=parse_datetime(filters["created_after"]))
+    if filters.get("created_before"):
+        queryset = queryset.filter(created_at__lt=parse_datetime(filters["created_before"]))
+    return queryset
+
+
+def run_purge_job(job_id, batch_size=None, pause=None):
+    # Claim the job atomically so a web worker and the command never both run it.
+    claimed = PurgeJob.objects.filter(id=job_id, status="pending").update(
+        status="running", started_at=timezone.now()
+    )
+    if not claimed:
+        return
+
+    job = PurgeJob.objects.get(id=job_id)
+    try:
+        job.deleted_count = purge_in_batches(
+            purge_job_queryset(job.filters), batch_size=batch_size, pause=pause
+        )
+        job.status = "succeeded"
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Purge job %s failed", job_id)
+        job.status = "failed"
+        job.error = str(exc)
+    job.finished_at = timezone.now()
+    job.save(update_fields=["deleted_count", "status", "error", "finished_at"])
+
+
+def requeue_stale_purge_jobs(minutes=30):
+    """Put jobs orphaned by a worker restart back in the queue.
+
+    Purging is idempotent, so re-running a half-finished job is safe.
+    """
+    stale_before = timezone.now() - timedelta(minutes=minutes)
+    return PurgeJob.objects.filter(status="running", started_at__lt=stale_before).update(
+        status="pending"
+    )
+
+
+def run_pending_purge_jobs(batch_size=None, pause=None):
+    job_ids = list(
+        PurgeJob.objects.filter(status="pending").order_by("id").values_list("id", flat=True)
+    )
+    for job_id in job_ids:
+        run_purge_job(job_id, batch_size=batch_size, pause=pause)
+    return len(job_ids)
@@ -0,0 +1,113 @@
+"""
+Full-text search over MessageLog request and response texts.
+
+The index is built by migration 0011: a trigger-maintained ``search_vector``
+tsvector column with a GIN index on PostgreSQL, an FTS5 table on SQLite.
+Other databases fall back to ``icontains`` scans.
+
+Results are ranked (request text weighs more than the response) and paged
+with an opaque cursor over ``(rank, id)``, so deep pages cost the same as
+the first one.
+"""
+
+import base64
+import binascii
+import json
+import re
+
+from django.db import connections, router
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .models import MessageLog
+
+
+PG_QUERY = "websearch_to_tsquery('simple', %s)"
+_FTS5_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _vendor():
+    return connections[router.db_for_read(MessageLog)].vendor
+
+
+def _fts5_query(query):
+    # Quote every word so user input can't use (or break on) FTS5 syntax;
+    # FTS5 ANDs the terms together.
+    return " ".join(f'"{token}"' for token in _FTS5_TOKEN_RE.findall(query))
+
+
+def search_filter(query):
+    """A filter() argument matching MessageLog rows that contain ``query``."""
+    vendor = _vendor()
+    if vendor == "postgresql":
+        return RawSQL(f"chat_messagelog.search_vector @@ {PG_QUERY}", [query], output_field=BooleanField())
+    if vendor == "sqlite":
+        return Q(
+            id__in=RawSQL(
+                "SELECT rowid FROM chat_messagelog_fts WHERE chat_messagelog_fts MATCH %s",
+                [_fts5_query(query)],
+            )
+        )
+    return Q(request_text__icontains=query) | Q(response_text__icontains=query)
+
+
+def _rank_expression(query):
+    vendor = _vendor()
+    if vendor == "postgresql":
+        # ts_rank is float4; as float8 the value in the cursor compares equal
+        # to the row's rank again, so pages neither skip nor repeat rows.
+        return RawSQL(
+            f"ts_rank(chat_messagelog.search_vector, {PG_QUERY})::float8",
+            [query],
+            output_field=FloatField(),
+        )
+    if vendor == "sqlite":
+        # bm25() is lower-is-better; negate it so both backends sort descending.
+        return RawSQL(
+            "SELECT -bm25(chat_messagelog_fts, 2.0, 1.0) FROM chat_messagelog_fts "
+            "WHERE chat_messagelog_fts MATCH %s AND chat_messagelog_fts.rowid = chat_messagelog.id",
+            [_fts5_query(query)],
+            output_field=FloatField(),
+        )
+    return Value(0.0, output_field=FloatField())
+
+
+def encode_cursor(rank, log_id):
+    raw = json.dumps([rank, log_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor):
+    try:
+        rank, log_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return float(rank), int(log_id)
+    except (ValueError, TypeError, binascii.Error) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+
+
+def search_message_logs(query, queryset=None, cursor=None, limit=20):
+    """One page of matching logs, best match first.
+
+    Returns ``(logs, next_cursor)``; each log carries its score as ``rank``
+    and ``next_cursor`` is None on the last page.
+    """
+    if not _FTS5_TOKEN_RE.search(query):
+        # Nothing searchable, e.g. only punctuation.
+        return [], None
+
+    queryset = MessageLog.objects.all() if queryset is None else queryset
+    results = queryset.filter(search_filter(query)).annotate(rank=_rank_expression(query))
+    if cursor:
+        rank, log_id = decode_cursor(cursor)
+        results = results.filter(Q(rank__lt=rank) | Q(rank=rank, id__lt=log_id))
+
+    logs = list(results.order_by("-rank", "-id")[: limit + 1])
+    next_cursor = None
+    if len(logs) > limit:
+        logs = logs[:limit]
+        next_cursor = encode_cursor(logs[-1].rank, logs[-1].id)
+    return logs, next_cursor
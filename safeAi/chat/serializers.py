@@ -1,6 +1,6 @@
 from rest_framework import serializers
 
-from .models import APIUser, ChatUser, MessageLog, TelegramUser
+from .models import APIUser, ChatUser, MessageLog, PurgeJob, TelegramUser, UploadJob, UsageRollup
 
 
 class ChatUserSerializer(serializers.ModelSerializer):
@@ -45,6 +45,9 @@ class MessageLogSerializer(serializers.ModelSerializer):
             "api_user",
             "request_text",
             "response_text",
+            "result",
+            "verdict",
+            "confidence",
             "created_at",
         ]
 
@@ -52,8 +55,80 @@ class MessageLogSerializer(serializers.ModelSerializer):
 class ChatUploadRequestSerializer(serializers.Serializer):
     message = serializers.CharField(required=False, allow_blank=True)
     file = serializers.FileField()
+    mode = serializers.ChoiceField(choices=["sync", "async"], default="sync")
 
 
 class UkweliVerifyRequestSerializer(serializers.Serializer):
     api_key = serializers.CharField()
     claim = serializers.CharField()
+
+
+class UsageQuerySerializer(serializers.Serializer):
+    api_key = serializers.CharField(required=False)
+    period = serializers.ChoiceField(choices=UsageRollup.PERIOD_CHOICES, default="day")
+    source = serializers.ChoiceField(choices=MessageLog.SOURCE_CHOICES, required=False)
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+
+
+class TrendingClaimsQuerySerializer(serializers.Serializer):
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+
+
+class MessageLogSearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=500)
+    source = serializers.ChoiceField(choices=MessageLog.SOURCE_CHOICES, required=False)
+    cursor = serializers.CharField(required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+
+class MessageLogExportQuerySerializer(serializers.Serializer):
+    source = serializers.ChoiceField(choices=MessageLog.SOURCE_CHOICES, required=False)
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+
+
+class MessageLogBulkDeleteSerializer(serializers.Serializer):
+    source = serializers.ChoiceField(choices=MessageLog.SOURCE_CHOICES, required=False)
+    chat_user = serializers.IntegerField(required=False)
+    telegram_user = serializers.IntegerField(required=False)
+    api_user = serializers.IntegerField(required=False)
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError("At least one filter is required.")
+        return attrs
+
+
+class PurgeJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PurgeJob
+        fields = [
+            "id",
+            "filters",
+            "status",
+            "deleted_count",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+
+
+class UploadJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UploadJob
+        fields = [
+            "id",
+            "status",
+            "file_name",
+            "pages_done",
+            "pages_total",
+            "response_text",
+            "error",
+            "created_at",
+            "updated_at",
+            "finished_at",
+        ]
@@ -0,0 +1,408 @@
+"""
+Durable, rate-limited delivery of outgoing Telegram messages.
+
+Replies are written to :class:`~chat.models.TelegramOutbox` first and then
+sent through a process-wide :class:`SendLimiter`: one token bucket for the
+bot as a whole and one per chat, matching the Bot API limits. A sender retries
+transient failures with exponential backoff and waits out ``retry_after`` on
+flood control (HTTP 429).
+
+With TELEGRAM_SEND_INLINE on (the default), the request that produced a reply
+tries to deliver it straight away, and whatever it could not send is left to a
+sender thread in the same process (:func:`start_background_sender`). The
+buckets are per process, so that is only within the limits when a single
+process serves requests. Otherwise turn it off and run one
+``manage.py telegram_send``.
+"""
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+from django.db.models import F, Min
+from django.utils import timezone
+
+from .metrics import TELEGRAM_DELIVERIES, TELEGRAM_DELIVERY_DELAY, TELEGRAM_OUTBOX_DEPTH
+from .models import TelegramOutbox
+from .telegram_service import TELEGRAM_MESSAGE_LIMIT, TelegramClientError, send_telegram_message
+
+
+logger = logging.getLogger(__name__)
+
+# A message stuck in "sending" this long was claimed by a worker that died.
+STALE_SENDING_MINUTES = 5
+
+UNSENT = ("pending", "sending")
+
+
+def split_message(text, limit=TELEGRAM_MESSAGE_LIMIT):
+    """Split ``text`` into parts Telegram accepts, preferring line breaks."""
+    parts = []
+    while len(text) > limit:
+        cut = text.rfind("\n", 0, limit + 1)
+        if cut <= 0:
+            cut = text.rfind(" ", 0, limit + 1)
+        if cut <= 0:
+            parts.append(text[:limit])
+            text = text[limit:]
+            continue
+        parts.append(text[:cut])
+        text = text[cut + 1:]
+    if text:
+        parts.append(text)
+    return parts
+
+
+class TokenBucket:
+    """``rate`` tokens per second, holding at most ``capacity``. Not thread-safe."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        elapsed = max(0.0, now - self.updated)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = max(self.updated, now)
+
+    def wait_time(self, now):
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def is_idle(self, now):
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+    def take(self):
+        self.tokens -= 1
+
+    def pause(self, seconds, now):
+        """Withhold tokens for ``seconds``, e.g. after a 429 with retry_after."""
+        self._refill(now)
+        self.tokens = min(self.tokens, 1 - seconds * self.rate)
+
+
+class SendLimiter:
+    # Forget the buckets of quiet chats once this many are tracked.
+    MAX_TRACKED_CHATS = 10000
+
+    def __init__(self, global_rate, chat_rate):
+        self._lock = threading.Lock()
+        self._global = TokenBucket(global_rate)
+        self._chat_rate = chat_rate
+        self._chats = {}
+
+    def reserve(self, chat_id):
+        """Take a send slot for ``chat_id`` if one is free.
+
+        Returns 0 on success, otherwise the seconds until a slot may free up.
+        """
+        with self._lock:
+            now = time.monotonic()
+            chat = self._chats.get(chat_id)
+            if chat is None:
+                if len(self._chats) >= self.MAX_TRACKED_CHATS:
+                    self._chats = {key: bucket for key, bucket in self._chats.items() if not bucket.is_idle(now)}
+                chat = self._chats[chat_id] = TokenBucket(self._chat_rate)
+            wait = max(self._global.wait_time(now), chat.wait_time(now))
+            if wait == 0:
+                self._global.take()
+                chat.take()
+            return wait
+
+    def pause(self, chat_id, seconds):
+        with self._lock:
+            now = time.monotonic()
+            chat = self._chats.setdefault(chat_id, TokenBucket(self._chat_rate))
+            chat.pause(seconds, now)
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_limiter():
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = SendLimiter(settings.TELEGRAM_GLOBAL_RATE, settings.TELEGRAM_CHAT_RATE)
+    return _limiter
+
+
+def outbox_messages(chat_id, text):
+    """Unsaved outbox rows for ``text``, one per 4096-character part.
+
+    With TELEGRAM_SEND_INLINE on, parts that get a send slot right away are
+    created already claimed (``sending``); hand the saved rows to
+    :func:`send_claimed`. The rest stay pending for a sender.
+    """
+    if not settings.TELEGRAM_SEND_INLINE:
+        return [TelegramOutbox(chat_id=chat_id, text=part) for part in split_message(text)]
+
+    limiter = get_limiter()
+    rows = []
+    # A reply must not overtake an earlier one still waiting for the chat, nor
+    # a later part an earlier, throttled one.
+    may_send = not TelegramOutbox.objects.filter(chat_id=chat_id, status__in=UNSENT).exists()
+    for part in split_message(text):
+        may_send = may_send and limiter.reserve(chat_id) == 0
+        if may_send:
+            rows.append(TelegramOutbox(chat_id=chat_id, text=part, status="sending", attempts=1))
+        else:
+            rows.append(TelegramOutbox(chat_id=chat_id, text=part))
+    return rows
+
+
+def send_claimed(rows):
+    """Deliver the rows of :func:`outbox_messages` that were created claimed."""
+    delivered = 0
+    stalled = set()
+    for row in rows:
+        if row.status != "sending":
+            continue
+        if row.chat_id in stalled:
+            # An earlier part failed; this one waits for it in the queue.
+            _release(row)
+        elif _deliver(row):
+            delivered += 1
+        else:
+            stalled.add(row.chat_id)
+    return delivered
+
+
+def enqueue_telegram_message(chat_id, text):
+    """Queue a reply; with TELEGRAM_SEND_INLINE, send what the limits allow now."""
+    rows = outbox_messages(chat_id, text)
+    if len(rows) == 1:
+        rows[0].save(force_insert=True)
+    else:
+        TelegramOutbox.objects.bulk_create(rows)
+    send_claimed(rows)
+    if any(row.status == "pending" for row in rows):
+        start_background_sender()
+    return rows
+
+
+def _claim(message):
+    claimed = TelegramOutbox.objects.filter(id=message.id, status="pending").update(
+        status="sending", attempts=F("attempts") + 1, updated_at=timezone.now()
+    )
+    if not claimed:
+        return False
+    message.status = "sending"
+    message.attempts += 1
+    return True
+
+
+def _release(message):
+    message.status = "pending"
+    message.attempts -= 1
+    message.save(update_fields=["status", "attempts", "updated_at"])
+
+
+def _deliver(message):
+    """Send a claimed message and record the outcome."""
+    try:
+        configured = send_telegram_message(message.chat_id, message.text)
+    except TelegramClientError as exc:
+        _record_failure(message, exc)
+        return False
+    if not configured:
+        message.status = "failed"
+        message.last_error = "TELEGRAM_BOT_TOKEN is not set"
+        message.save(update_fields=["status", "last_error", "updated_at"])
+        TELEGRAM_DELIVERIES.labels("failed").inc()
+        return False
+
+    message.status = "sent"
+    message.sent_at = timezone.now()
+    message.last_error = ""
+    message.save(update_fields=["status", "sent_at", "last_error", "updated_at"])
+    TELEGRAM_DELIVERIES.labels("sent").inc()
+    TELEGRAM_DELIVERY_DELAY.observe((message.sent_at - message.created_at).total_seconds())
+    return True
+
+
+def _record_failure(message, exc):
+    if exc.retry_after:
+        get_limiter().pause(message.chat_id, exc.retry_after)
+
+    message.last_error = str(exc)[:2000]
+    if not exc.is_transient or message.attempts >= settings.TELEGRAM_SEND_MAX_ATTEMPTS:
+        message.status = "failed"
+        outcome = "failed"
+        logger.warning("Giving up on Telegram message %s to chat %s: %s", message.id, message.chat_id, exc)
+    else:
+        if exc.retry_after:
+            delay = exc.retry_after
+        else:
+            backoff = settings.TELEGRAM_SEND_BACKOFF_BASE * 2 ** (message.attempts - 1)
+            delay = min(backoff, settings.TELEGRAM_SEND_BACKOFF_MAX) * random.uniform(0.5, 1.0)
+        message.status = "pending"
+        message.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+        outcome = "retry"
+    message.save(update_fields=["status", "last_error", "next_attempt_at", "updated_at"])
+    TELEGRAM_DELIVERIES.labels(outcome).inc()
+
+
+def requeue_stale_outbox():
+    stale_before = timezone.now() - timedelta(minutes=STALE_SENDING_MINUTES)
+    return TelegramOutbox.objects.filter(status="sending", updated_at__lt=stale_before).update(
+        status="pending", updated_at=timezone.now()
+    )
+
+
+def update_outbox_depth():
+    depth = TelegramOutbox.objects.filter(status__in=UNSENT).count()
+    TELEGRAM_OUTBOX_DEPTH.set(depth)
+    return depth
+
+
+class OutboxSender:
+    """Drains the outbox with ``workers`` concurrent sends (``telegram_send``)."""
+
+    BATCH_SIZE = 200
+
+    def __init__(self, workers=4):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="telegram-send")
+        self._in_flight = set()
+        self._lock = threading.Lock()
+
+    def _run(self, message):
+        close_old_connections()
+        try:
+            _deliver(message)
+        except Exception:  # noqa: BLE001
+            logger.exception("Telegram message %s crashed the sender", message.id)
+        finally:
+            with self._lock:
+                self._in_flight.discard(message.chat_id)
+
+    def dispatch_due(self):
+        """Start every due message the rate limits allow; returns how many."""
+        limiter = get_limiter()
+        due = list(
+            TelegramOutbox.objects.filter(status="pending", next_attempt_at__lte=timezone.now())
+            .order_by("id")[: self.BATCH_SIZE]
+        )
+        if not due:
+            return 0
+        # Only a chat's oldest unsent message may go out, so a part backing off
+        # after a failure holds back the parts and replies queued after it.
+        oldest = dict(
+            TelegramOutbox.objects.filter(chat_id__in={message.chat_id for message in due}, status__in=UNSENT)
+            .values_list("chat_id")
+            .annotate(Min("id"))
+        )
+        held_back = set()
+        started = 0
+        for message in due:
+            with self._lock:
+                busy = message.chat_id in self._in_flight
+            # One send per chat at a time keeps split replies in order.
+            if (
+                busy
+                or message.chat_id in held_back
+                or oldest.get(message.chat_id) != message.id
+                or limiter.reserve(message.chat_id) > 0
+            ):
+                held_back.add(message.chat_id)
+                continue
+            if not _claim(message):
+                continue
+            with self._lock:
+                self._in_flight.add(message.chat_id)
+            self.executor.submit(self._run, message)
+            started += 1
+        return started
+
+    def idle(self):
+        with self._lock:
+            return not self._in_flight
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+        connections.close_all()
+
+    def run(self, poll_interval=0.5, once=False, until_empty=False):
+        """The ``telegram_send`` loop.
+
+        ``once`` returns when nothing is due, ``until_empty`` when nothing is
+        pending or sending at all (waiting out backoffs in between).
+        """
+        next_housekeeping = 0.0
+        while True:
+            now = time.monotonic()
+            if now >= next_housekeeping:
+                requeue_stale_outbox()
+                depth = update_outbox_depth()
+                next_housekeeping = now + 5
+                if until_empty and depth == 0 and self.idle() and _stop_background_sender(self):
+                    return
+
+            started = self.dispatch_due()
+            if started:
+                continue
+            if once and self.idle():
+                # In-flight sends may have been retried and become due again.
+                if not self.dispatch_due():
+                    return
+            time.sleep(poll_interval)
+
+
+_background_sender = None
+_background_sender_lock = threading.Lock()
+
+
+def start_background_sender():
+    """Deliver the replies a TELEGRAM_SEND_INLINE request could not send.
+
+    Runs the sender loop in a daemon thread of this process until the outbox
+    is empty, so throttled parts and retries go out without ``telegram_send``.
+    Does nothing when inline sending is off or the thread is already running.
+    """
+    global _background_sender
+    if not settings.TELEGRAM_SEND_INLINE:
+        return
+    with _background_sender_lock:
+        if _background_sender is not None:
+            return
+        _background_sender = OutboxSender(workers=1)
+        threading.Thread(
+            target=_run_background_sender, args=(_background_sender,), name="telegram-send-inline", daemon=True
+        ).start()
+
+
+def _stop_background_sender(sender):
+    """Retire ``sender`` unless a reply was queued since it found the outbox empty."""
+    global _background_sender
+    with _background_sender_lock:
+        # Callers queue rows before start_background_sender() takes the lock,
+        # so a row this check misses starts a new thread.
+        if TelegramOutbox.objects.filter(status__in=UNSENT).exists():
+            return False
+        if _background_sender is sender:
+            _background_sender = None
+        return True
+
+
+def _run_background_sender(sender):
+    global _background_sender
+    close_old_connections()
+    try:
+        sender.run(until_empty=True)
+    except Exception:  # noqa: BLE001
+        logger.exception("Inline Telegram sender crashed")
+        with _background_sender_lock:
+            if _background_sender is sender:
+                _background_sender = None
+    finally:
+        sender.shutdown()
@@ -0,0 +1,121 @@
+import os
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from .metrics import observe_upstream
+
+
+TELEGRAM_API_BASE = os.environ.get("TELEGRAM_API_BASE", "https://api.telegram.org")
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+# One keep-alive pool for every Bot API call made by this process; the outbox
+# sender runs several threads against it.
+_session = requests.Session()
+_session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=16))
+_session.mount("http://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=16))
+
+
+class TelegramClientError(Exception):
+    def __init__(self, message, status_code=None, retry_after=None):
+        super().__init__(message)
+        self.status_code = status_code
+        # Seconds Telegram asked us to wait (flood control), when given.
+        self.retry_after = retry_after
+
+    @property
+    def is_transient(self):
+        return self.status_code is None or self.status_code == 429 or self.status_code >= 500
+
+
+def format_ukweli_reply(result: Dict[str, Any]) -> str:
+    """Render a Ukweli verification result as a Telegram reply."""
+    verdict = result.get("final_verdict", "UNKNOWN")
+    score = result.get("explainable_confidence_score")
+    snippet = result.get("top_evidence_snippet") or {}
+
+    evidence_verdict = snippet.get("verdict")
+    evidence_text = snippet.get("evidence")
+    evidence_source = snippet.get("source")
+
+    parts = [f"Verdict: {verdict}"]
+    if isinstance(score, (int, float)):
+        parts.append(f"Confidence: {score:.2f}")
+
+    if evidence_verdict or evidence_text or evidence_source:
+        parts.append("")
+        parts.append("Top evidence:")
+        if evidence_verdict:
+            parts.append(f"- Stance: {evidence_verdict}")
+        if evidence_text:
+            parts.append(f"- Evidence: {evidence_text}")
+        if evidence_source:
+            parts.append(f"- Source: {evidence_source}")
+
+    return "\n".join(parts)
+
+
+def _call_bot_api(method: str, payload: Dict[str, Any], timeout: float, upstream: str = "telegram"):
+    bot_token = os.environ.get("TELEGRAM_BOT_TOKEN")
+    url = f"{TELEGRAM_API_BASE}/bot{bot_token}/{method}"
+
+    with observe_upstream(upstream) as call:
+        try:
+            response = _session.post(url, json=payload, timeout=timeout)
+        except requests.RequestException as exc:
+            raise TelegramClientError(f"Telegram API request failed: {exc}") from exc
+        call.status_code = response.status_code
+        if response.status_code != 200:
+            raise TelegramClientError(
+                f"Telegram API error {response.status_code}: {response.text[:500]}",
+                status_code=response.status_code,
+                retry_after=_retry_after(response),
+            )
+    return response
+
+
+def _retry_after(response):
+    try:
+        retry_after = (response.json().get("parameters") or {}).get("retry_after")
+    except (ValueError, AttributeError):
+        retry_after = None
+    if retry_after is None:
+        retry_after = response.headers.get("Retry-After")
+    try:
+        return float(retry_after) if retry_after is not None else None
+    except ValueError:
+        return None
+
+
+def send_telegram_message(chat_id: int, text: str) -> bool:
+    """Send ``text`` to a Telegram chat; returns False when no bot token is set."""
+    if not os.environ.get("TELEGRAM_BOT_TOKEN"):
+        return False
+
+    _call_bot_api("sendMessage", {"chat_id": chat_id, "text": text}, timeout=10)
+    return True
+
+
+def get_telegram_updates(offset: Optional[int], timeout: int = 30, limit: int = 100) -> List[Dict[str, Any]]:
+    """Long-poll ``getUpdates``; returns once updates arrive or ``timeout`` passes.
+
+    Passing ``offset`` confirms every update below it, so Telegram will not
+    deliver those again.
+    """
+    if not os.environ.get("TELEGRAM_BOT_TOKEN"):
+        raise TelegramClientError("TELEGRAM_BOT_TOKEN is not set")
+
+    payload = {"timeout": timeout, "limit": limit, "allowed_updates": ["message"]}
+    if offset is not None:
+        payload["offset"] = offset
+    # Long polls are tracked separately so they don't swamp sendMessage latency.
+    response = _call_bot_api("getUpdates", payload, timeout=timeout + 10, upstream="telegram_poll")
+    try:
+        return response.json().get("result") or []
+    except ValueError as exc:
+        raise TelegramClientError(f"Invalid JSON from Telegram API: {exc}") from exc
+
+
+def delete_telegram_webhook() -> None:
+    """Remove the bot's webhook; Telegram refuses getUpdates while one is set."""
+    _call_bot_api("deleteWebhook", {}, timeout=10)
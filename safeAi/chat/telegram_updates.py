@@ -0,0 +1,167 @@
+"""
+Handling of incoming Telegram updates, shared by the webhook and the
+``telegram_poll`` command.
+
+The webhook handles one update per request with :func:`handle_update`. The
+poller hands a whole ``getUpdates`` batch to :func:`process_updates`. That
+verifies the claims concurrently, then writes users, message logs and
+queued replies in a handful of queries for the whole batch. Replies go
+through the outbox (see chat/telegram_outbox.py) either way.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from django.db import connections, transaction
+
+from .conditional import note_changed
+from .models import MessageLog, TelegramOutbox, TelegramUser
+from .telegram_outbox import enqueue_telegram_message, outbox_messages, send_claimed, start_background_sender
+from .telegram_service import format_ukweli_reply
+from .ukweli_service import UkweliClientError, extract_verdict
+from .verdict_cache import cached_verify_claim
+
+
+VERIFY_FAILED_REPLY = "Sorry, I had an issue verifying that claim. Please try again later."
+
+
+class IncomingMessage(NamedTuple):
+    telegram_id: int
+    username: Optional[str]
+    text: str
+
+
+def parse_update(update: Dict[str, Any]) -> Optional[IncomingMessage]:
+    """Return the text message in ``update``, or None for anything else."""
+    message = update.get("message") or {}
+    chat = message.get("chat") or {}
+    text = message.get("text")
+    telegram_id = chat.get("id")
+    if telegram_id is None or text is None:
+        return None
+    return IncomingMessage(telegram_id, chat.get("username") or chat.get("first_name"), text)
+
+
+def verify_claim(text: str):
+    """Verify ``text`` with Ukweli.
+
+    Returns the reply for the user and the MessageLog fields to record.
+    """
+    try:
+        result = cached_verify_claim(text)
+    except UkweliClientError as exc:
+        return VERIFY_FAILED_REPLY, {"response_text": str(exc), "is_error": True}
+
+    reply = format_ukweli_reply(result)
+    verdict, confidence = extract_verdict(result)
+    return reply, {
+        "response_text": reply,
+        "result": result,
+        "verdict": verdict,
+        "confidence": confidence,
+    }
+
+
+def _send_claimed(rows) -> None:
+    try:
+        send_claimed(rows)
+    finally:
+        connections.close_all()
+
+
+def _get_or_update_user(incoming: IncomingMessage) -> TelegramUser:
+    telegram_user, _ = TelegramUser.objects.get_or_create(
+        telegram_id=incoming.telegram_id,
+        defaults={"username": incoming.username},
+    )
+    if incoming.username and telegram_user.username != incoming.username:
+        telegram_user.username = incoming.username
+        telegram_user.save(update_fields=["username"])
+        note_changed(TelegramUser)
+    return telegram_user
+
+
+def handle_update(update: Dict[str, Any]) -> None:
+    incoming = parse_update(update)
+    if incoming is None:
+        return
+
+    telegram_user = _get_or_update_user(incoming)
+    reply, log_fields = verify_claim(incoming.text)
+    MessageLog.objects.create(
+        source="ukweli",
+        telegram_user=telegram_user,
+        request_text=incoming.text,
+        **log_fields,
+    )
+    enqueue_telegram_message(incoming.telegram_id, reply)
+
+
+def _bulk_upsert_users(messages: List[IncomingMessage]) -> Dict[int, TelegramUser]:
+    # The latest username seen in the batch wins.
+    usernames = {}
+    for incoming in messages:
+        if incoming.username or incoming.telegram_id not in usernames:
+            usernames[incoming.telegram_id] = incoming.username
+
+    users = TelegramUser.objects.in_bulk(list(usernames), field_name="telegram_id")
+    missing = [
+        TelegramUser(telegram_id=telegram_id, username=username)
+        for telegram_id, username in usernames.items()
+        if telegram_id not in users
+    ]
+    if missing:
+        # Another process may have created some of them in the meantime.
+        TelegramUser.objects.bulk_create(missing, ignore_conflicts=True)
+        users = TelegramUser.objects.in_bulk(list(usernames), field_name="telegram_id")
+
+    renamed = []
+    for telegram_id, username in usernames.items():
+        user = users[telegram_id]
+        if username and user.username != username:
+            user.username = username
+            renamed.append(user)
+    if renamed:
+        TelegramUser.objects.bulk_update(renamed, ["username"])
+        note_changed(TelegramUser)
+    return users
+
+
+def process_updates(updates: List[Dict[str, Any]], max_workers: int = 8) -> int:
+    """Verify, log and answer a batch of updates; returns the messages handled."""
+    messages = [incoming for incoming in map(parse_update, updates) if incoming is not None]
+    if not messages:
+        return 0
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        outcomes = list(executor.map(verify_claim, [incoming.text for incoming in messages]))
+
+        with transaction.atomic():
+            users = _bulk_upsert_users(messages)
+            MessageLog.objects.bulk_create(
+                [
+                    MessageLog(
+                        source="ukweli",
+                        telegram_user=users[incoming.telegram_id],
+                        request_text=incoming.text,
+                        **log_fields,
+                    )
+                    for incoming, (_, log_fields) in zip(messages, outcomes)
+                ]
+            )
+            queued = TelegramOutbox.objects.bulk_create(
+                [
+                    row
+                    for incoming, (reply, _) in zip(messages, outcomes)
+                    for row in outbox_messages(incoming.telegram_id, reply)
+                ]
+            )
+
+        by_chat = {}
+        for row in queued:
+            if row.status == "sending":
+                by_chat.setdefault(row.chat_id, []).append(row)
+        list(executor.map(_send_claimed, by_chat.values()))
+        if any(row.status == "pending" for row in queued):
+            start_background_sender()
+    return len(messages)
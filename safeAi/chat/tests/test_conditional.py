@@ -0,0 +1,85 @@
+from django.test import TestCase, override_settings
+
+from chat.conditional import table_validators
+from chat.models import APIUser, MessageLog, TelegramUser
+from chat.telegram_updates import IncomingMessage, _bulk_upsert_users, _get_or_update_user
+
+
+@override_settings(INTERNAL_API_TOKEN="secret", DEBUG=False)
+class ConditionalAccessTests(TestCase):
+    def setUp(self):
+        APIUser.objects.create(company_name="acme", api_key="key")
+        MessageLog.objects.create(source="chat", request_text="q", response_text="a")
+
+    def test_validators_need_access(self):
+        probe = {"If-Modified-Since": "Wed, 01 Jan 2100 00:00:00 GMT", "If-None-Match": "*"}
+        for url, status in (("/api/messages/export/", 403), ("/api/usage/", 403), ("/api/verdicts/", 403)):
+            with self.subTest(url=url):
+                response = self.client.get(url, headers=probe)
+                self.assertEqual(response.status_code, status)
+                self.assertNotIn("ETag", response.headers)
+                self.assertNotIn("Last-Modified", response.headers)
+
+        response = self.client.get("/api/usage/", {"api_key": "wrong"}, headers=probe)
+        self.assertEqual(response.status_code, 401)
+
+    def test_revalidation_with_access(self):
+        first = self.client.get("/api/usage/", {"api_key": "key"})
+        self.assertEqual(first.status_code, 200)
+        again = self.client.get("/api/usage/", {"api_key": "key"}, headers={"If-None-Match": first["ETag"]})
+        self.assertEqual(again.status_code, 304)
+
+
+@override_settings(INTERNAL_API_TOKEN="secret", DEBUG=False)
+class ExportMessageLogsViewTests(TestCase):
+    def test_ndjson_accept_header(self):
+        MessageLog.objects.create(source="chat", request_text="q", response_text="a")
+
+        response = self.client.get(
+            "/api/messages/export/",
+            headers={"Accept": "application/x-ndjson", "X-Internal-Token": "secret"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertIn(b'"request_text":"q"', lines[0])
+
+
+@override_settings(INTERNAL_API_TOKEN="secret", DEBUG=False)
+class TableValidatorsTests(TestCase):
+    def setUp(self):
+        TelegramUser.objects.create(telegram_id=1, username="old")
+        TelegramUser.objects.create(telegram_id=2, username="other")
+        self.logs = [
+            MessageLog.objects.create(source="chat", request_text=str(n), response_text="a") for n in range(3)
+        ]
+
+    def etag(self, *models):
+        return table_validators(*models).etag
+
+    def test_username_updates_change_the_etag(self):
+        before = self.etag(TelegramUser)
+        _get_or_update_user(IncomingMessage(telegram_id=1, username="new", text="claim"))
+        after_single = self.etag(TelegramUser)
+        _bulk_upsert_users([IncomingMessage(telegram_id=1, username="newer", text="claim")])
+
+        self.assertEqual(len({before, after_single, self.etag(TelegramUser)}), 3)
+
+    def test_unchanged_username_keeps_the_etag(self):
+        before = self.etag(TelegramUser)
+        _get_or_update_user(IncomingMessage(telegram_id=1, username="old", text="claim"))
+        self.assertEqual(self.etag(TelegramUser), before)
+
+    def test_deleting_a_middle_row_changes_the_etag(self):
+        first = self.client.get("/api/messages/export/", headers={"X-Internal-Token": "secret"})
+        self.assertEqual(first.status_code, 200)
+
+        response = self.client.delete(f"/api/messages/{self.logs[1].id}/")
+        self.assertEqual(response.status_code, 204)
+
+        again = self.client.get(
+            "/api/messages/export/", headers={"X-Internal-Token": "secret", "If-None-Match": first["ETag"]}
+        )
+        self.assertEqual(again.status_code, 200)
@@ -0,0 +1,77 @@
+import subprocess
+import sys
+from pathlib import Path
+from unittest import mock
+
+from django.db import DatabaseError
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from safeAi import db_metrics
+
+
+class PoolStatsTests(SimpleTestCase):
+    def test_no_pool(self):
+        self.assertIsNone(db_metrics._pool_stats(mock.Mock(spec=[])))
+
+    def test_counts_from_psycopg_pool(self):
+        pool = mock.Mock(min_size=2, max_size=10)
+        pool.get_stats.return_value = {"pool_size": 4, "pool_available": 1, "requests_waiting": 3}
+        self.assertEqual(
+            db_metrics._pool_stats(mock.Mock(pool=pool)),
+            {"open": 4, "idle": 1, "in_use": 3, "min_size": 2, "max_size": 10, "requests_waiting": 3},
+        )
+
+
+class ServerStatsTests(SimpleTestCase):
+    def _connection(self, rows=None, error=None):
+        connection = mock.MagicMock(vendor="postgresql", settings_dict={"OPTIONS": {}})
+        cursor = connection.cursor.return_value.__enter__.return_value
+        cursor.fetchall.return_value = rows
+        cursor.execute.side_effect = error
+        return connection
+
+    def test_not_postgres(self):
+        self.assertIsNone(db_metrics._server_stats(mock.Mock(vendor="sqlite")))
+
+    def test_counts_by_state(self):
+        stats = db_metrics._server_stats(self._connection([("idle", 3), ("active", 2), (None, 1)]))
+        self.assertEqual(stats["open"], 6)
+        self.assertEqual(stats["idle"], 3)
+        self.assertEqual(stats["in_use"], 3)
+        self.assertEqual(stats["by_state"]["unknown"], 1)
+
+    def test_query_errors_are_reported(self):
+        stats = db_metrics._server_stats(self._connection(error=DatabaseError("denied")))
+        self.assertEqual(stats, {"error": "denied"})
+
+
+@override_settings(INTERNAL_API_TOKEN="secret", DEBUG=False)
+class DBConnectionsViewTests(TestCase):
+    def test_internal_only(self):
+        self.assertEqual(self.client.get("/internal/db-connections/").status_code, 403)
+
+        response = self.client.get("/internal/db-connections/", headers={"X-Internal-Token": "secret"})
+        default = response.json()["databases"]["default"]
+        self.assertEqual(default["vendor"], "sqlite")
+        self.assertIsNone(default["pool"])
+        self.assertTrue(default["process"]["connected"])
+
+
+class DBPoolSettingTests(SimpleTestCase):
+    def test_db_pool_without_psycopg3_fails_at_settings_load(self):
+        project_dir = Path(__file__).resolve().parents[2]
+        script = (
+            # Hide psycopg_pool even where it is installed.
+            "import importlib.util as u; real = u.find_spec\n"
+            "u.find_spec = lambda name, *a: None if name == 'psycopg_pool' else real(name, *a)\n"
+            "import safeAi.settings"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=project_dir,
+            env={"DATABASE_URL": "postgres://localhost/db", "DB_POOL": "true", "PATH": ""},
+            capture_output=True,
+            text=True,
+        )
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn("DB_POOL=true needs psycopg 3", result.stderr)
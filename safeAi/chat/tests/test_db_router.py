@@ -0,0 +1,77 @@
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from chat.models import APIUser
+from safeAi.db_router import (
+    PRIMARY_DB_ALIAS,
+    REPLICA_PIN_COOKIE,
+    PrimaryReplicaRouter,
+    ReadYourWritesMiddleware,
+    read_from_replica,
+)
+
+
+REPLICA = "replica_test"
+
+# A second sqlite database standing in for a replica. It is registered at
+# import time so the test runner creates and migrates it like ``default``;
+# without a MIRROR it stays separate, so replica reads do not see primary rows.
+connections.settings.setdefault(
+    REPLICA,
+    {
+        **connections.settings[PRIMARY_DB_ALIAS],
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": "replica_test.sqlite3",
+        "OPTIONS": {},
+        "TEST": {"NAME": None, "MIRROR": None, "MIGRATE": True, "CHARSET": None, "COLLATION": None},
+    },
+)
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA], REPLICA_PIN_SECONDS=5)
+class ReplicaRoutingTests(TestCase):
+    databases = {PRIMARY_DB_ALIAS, REPLICA}
+
+    def setUp(self):
+        APIUser.objects.create(company_name="acme", api_key="key")
+
+    def test_reads_go_to_the_replica_only_when_opted_in(self):
+        self.assertTrue(APIUser.objects.exists())
+        with read_from_replica():
+            self.assertEqual(PrimaryReplicaRouter().db_for_read(APIUser), REPLICA)
+            self.assertFalse(APIUser.objects.exists())
+
+    def test_writes_go_to_the_primary(self):
+        with read_from_replica():
+            self.assertEqual(PrimaryReplicaRouter().db_for_write(APIUser), PRIMARY_DB_ALIAS)
+            APIUser.objects.create(company_name="other", api_key="other")
+        self.assertEqual(APIUser.objects.using(REPLICA).count(), 0)
+        self.assertEqual(APIUser.objects.count(), 2)
+
+    def test_request_reads_its_own_writes(self):
+        def view(request):
+            with read_from_replica():
+                APIUser.objects.create(company_name="new", api_key="new")
+                self.assertEqual(APIUser.objects.count(), 2)
+            return HttpResponse()
+
+        response = ReadYourWritesMiddleware(view)(RequestFactory().post("/"))
+        self.assertIn(REPLICA_PIN_COOKIE, response.cookies)
+
+    def test_pin_cookie_routes_later_reads_to_the_primary(self):
+        response = self.client.post(
+            "/api/generate-key/", {"company_name": "pinned"}, content_type="application/json"
+        )
+        self.assertIn(REPLICA_PIN_COOKIE, response.cookies)
+
+        pinned = self.client.get("/api/all-data/").json()
+        self.assertEqual(len(pinned["api_users"]), 2)
+
+        self.client.cookies.pop(REPLICA_PIN_COOKIE)
+        self.assertEqual(self.client.get("/api/all-data/").json()["api_users"], [])
+
+    def test_reads_do_not_set_the_pin(self):
+        response = self.client.get("/api/all-data/")
+        self.assertNotIn(REPLICA_PIN_COOKIE, response.cookies)
+
@@ -0,0 +1,69 @@
+import datetime
+import json
+import uuid
+from decimal import Decimal
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.test import SimpleTestCase, override_settings
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+from chat.json_backend import FastJSONRenderer, dumps, json_response
+
+
+VALUES = {
+    "aware": datetime.datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=datetime.timezone.utc),
+    "offset": datetime.datetime(2024, 1, 2, 3, 4, 5, 9000, tzinfo=datetime.timezone(datetime.timedelta(hours=3))),
+    "naive": datetime.datetime(2024, 1, 2, 3, 4, 5, 123456),
+    "date": datetime.date(2024, 1, 2),
+    "time": datetime.time(1, 2, 3, 4567),
+    "decimal": Decimal("1.10"),
+    "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "duration": datetime.timedelta(minutes=1, seconds=5),
+    "text": "Habari – ✓",
+    "nested": [{"n": 1, "f": 0.5, "none": None, "flag": True}],
+}
+
+
+class DumpsTests(SimpleTestCase):
+    def test_output_matches_django_encoder(self):
+        expected = json.loads(json.dumps(VALUES, cls=DjangoJSONEncoder))
+        self.assertEqual(json.loads(dumps(VALUES)), expected)
+        self.assertEqual(expected["aware"], "2024-01-02T03:04:05.123Z")
+
+    def test_renderer_matches_django_encoder(self):
+        expected = json.loads(json.dumps(VALUES, cls=DjangoJSONEncoder))
+        self.assertEqual(json.loads(FastJSONRenderer().render(VALUES)), expected)
+
+    def test_json_response(self):
+        response = json_response(VALUES, status=201)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(json.loads(response.content)["uuid"], str(VALUES["uuid"]))
+
+
+@api_view(["POST"])
+def echo(request):
+    return Response(request.data)
+
+
+@override_settings(DEBUG=False)
+class ParserTests(SimpleTestCase):
+    factory = APIRequestFactory()
+
+    def post(self, body):
+        request = self.factory.post("/echo/", body, content_type="application/json")
+        return echo(request)
+
+    def test_valid_body_is_parsed(self):
+        response = self.post('{"a": [1, 2.5, "x"]}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"a": [1, 2.5, "x"]})
+
+    def test_malformed_body_is_a_400(self):
+        for body in ('{"a": ', "not json", b"\xff\xfe"):
+            with self.subTest(body=body):
+                response = self.post(body)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("JSON parse error", response.data["detail"])
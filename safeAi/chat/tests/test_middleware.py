@@ -0,0 +1,65 @@
+import tempfile
+
+from django.test import TestCase, override_settings
+from prometheus_client import REGISTRY
+
+
+@override_settings(INTERNAL_API_TOKEN="secret", DEBUG=False)
+class MetricsMiddlewareTests(TestCase):
+    LABELS = {"view": "health-check", "method": "GET", "status": "200"}
+
+    def latency_count(self):
+        return REGISTRY.get_sample_value("safeai_http_request_duration_seconds_count", self.LABELS) or 0
+
+    def test_request_is_counted_and_rendered(self):
+        before = self.latency_count()
+        queries_before = REGISTRY.get_sample_value(
+            "safeai_db_queries_per_request_count", {"view": "health-check"}
+        ) or 0
+
+        self.client.get("/health/")
+
+        self.assertEqual(self.latency_count(), before + 1)
+        self.assertEqual(
+            REGISTRY.get_sample_value("safeai_db_queries_per_request_count", {"view": "health-check"}),
+            queries_before + 1,
+        )
+        self.assertEqual(REGISTRY.get_sample_value("safeai_http_requests_in_flight"), 0)
+
+        response = self.client.get("/metrics", headers={"X-Internal-Token": "secret"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        body = response.content.decode()
+        self.assertIn(
+            'safeai_http_request_duration_seconds_count{method="GET",status="200",view="health-check"} '
+            f"{before + 1:.1f}",
+            body,
+        )
+
+    def test_metrics_need_internal_access(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+
+
+@override_settings(INTERNAL_API_TOKEN="secret", DEBUG=False)
+class ServerTimingTests(TestCase):
+    def test_only_internal_callers_get_server_timing_by_default(self):
+        self.assertNotIn("Server-Timing", self.client.get("/health/").headers)
+
+        response = self.client.get("/health/", headers={"X-Internal-Token": "secret"})
+        self.assertIn("total;dur=", response.headers["Server-Timing"])
+
+    @override_settings(SERVER_TIMING_ENABLED=True)
+    def test_setting_sends_server_timing_to_everyone(self):
+        self.assertIn("Server-Timing", self.client.get("/health/").headers)
+
+
+@override_settings(INTERNAL_API_TOKEN="secret", DEBUG=False)
+class ProfilingMiddlewareTests(TestCase):
+    def test_profile_files_are_unique_within_a_second(self):
+        headers = {"X-Internal-Token": "secret", "X-Profile": "1"}
+        with tempfile.TemporaryDirectory() as profile_dir, override_settings(PROFILE_DIR=profile_dir):
+            names = {
+                self.client.get("/health/", headers=headers).headers["X-Profile-File"]
+                for _ in range(3)
+            }
+        self.assertEqual(len(names), 3)
@@ -0,0 +1,48 @@
+from django.test import SimpleTestCase
+
+from chat.preprocessing import preprocess_pages
+
+
+def _page(number, body):
+    return f"ACME Corp Annual Report\n{body}\nPage {number} of 4"
+
+
+class PreprocessPagesTests(SimpleTestCase):
+    def test_drops_repeated_headers_and_numbered_footers(self):
+        pages = [_page(n, f"Body text of page {n}.") for n in range(1, 5)]
+
+        text = preprocess_pages(pages).text
+
+        self.assertNotIn("ACME Corp", text)
+        self.assertNotIn("Page", text)
+        self.assertIn("Body text of page 1.\nBody text of page 2.", text)
+
+    def test_boilerplate_needs_enough_pages(self):
+        text = preprocess_pages([_page(1, "one"), _page(2, "two")]).text
+        self.assertEqual(text.count("ACME Corp Annual Report"), 2)
+
+    def test_page_numbers_only_on_the_outermost_line_of_real_pages(self):
+        table = "Totals\n120\n340\n560\nnotes\n1\n2\n3"
+        self.assertEqual(preprocess_pages([table]).text, table)
+
+        pages = ["7\nIntro\n120\nmore", "Body\n340\n8"]
+        self.assertEqual(preprocess_pages(pages).text, "Intro\n120\nmore\nBody\n340")
+
+    def test_years_are_not_page_numbers(self):
+        pages = ["2024\nResults", "Outlook\n2025", "Notes\n- 12 -"]
+        self.assertEqual(preprocess_pages(pages).text, "2024\nResults\nOutlook\n2025\nNotes")
+
+    def test_joins_words_hyphenated_across_one_line_break(self):
+        self.assertEqual(preprocess_pages(["a well-\nknown claim"]).text, "a well-known claim")
+        # A blank line between them is a paragraph break, not a hyphenation.
+        self.assertEqual(preprocess_pages(["ends in x-\n\nnew paragraph"]).text, "ends in x-\n\nnew paragraph")
+
+    def test_collapses_whitespace_and_repeated_paragraphs(self):
+        paragraph = "This paragraph is long enough to count as a duplicate."
+        text = preprocess_pages([f"{paragraph}\n\n\n\n  short   one \n\n{paragraph}\n\nshort one"]).text
+        self.assertEqual(text, f"{paragraph}\n\nshort one\n\nshort one")
+
+    def test_reports_token_savings(self):
+        result = preprocess_pages([_page(n, "x") for n in range(1, 5)])
+        self.assertGreater(result.tokens_saved, 0)
+        self.assertEqual(result.tokens_before - result.tokens_after, result.tokens_saved)
@@ -0,0 +1,19 @@
+from django.test import TestCase, override_settings
+
+from chat.models import APIUser
+
+
+@override_settings(INTERNAL_API_TOKEN="secret", DEBUG=False)
+class ReportAccessTests(TestCase):
+    def setUp(self):
+        APIUser.objects.create(company_name="acme", api_key="key")
+
+    def test_reports_need_api_key_or_internal_access(self):
+        for url in ("/api/usage/", "/api/verdicts/"):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 403)
+                self.assertEqual(self.client.get(url, {"api_key": "wrong"}).status_code, 401)
+                self.assertEqual(self.client.get(url, {"api_key": "key"}).status_code, 200)
+                self.assertEqual(
+                    self.client.get(url, headers={"X-Internal-Token": "secret"}).status_code, 200
+                )
@@ -0,0 +1,61 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from chat.models import MessageLog, RollupCheckpoint, TelegramOutbox
+from chat.retention import expired_message_logs, purge_telegram_outbox
+from chat.rollups import CHECKPOINT_NAME
+
+
+@override_settings(MESSAGE_LOG_RETENTION_DAYS={"chat": 30})
+class RetentionRollupGuardTests(TestCase):
+    def setUp(self):
+        self.old = MessageLog.objects.create(source="chat", request_text="q", response_text="a")
+        MessageLog.objects.filter(id=self.old.id).update(
+            created_at=timezone.now() - timedelta(days=60)
+        )
+
+    def test_keeps_rows_until_rollups_have_run(self):
+        self.assertFalse(expired_message_logs("chat", 30).exists())
+
+        RollupCheckpoint.objects.create(name=CHECKPOINT_NAME, last_message_id=self.old.id)
+        self.assertTrue(expired_message_logs("chat", 30).exists())
+
+    @override_settings(MESSAGE_LOG_PURGE_AFTER_ROLLUP=False)
+    def test_guard_can_be_turned_off(self):
+        self.assertTrue(expired_message_logs("chat", 30).exists())
+
+    def test_purge_command_warns_when_rollups_never_ran(self):
+        stderr = StringIO()
+        call_command("purge_message_logs", "--dry-run", stdout=StringIO(), stderr=stderr)
+        self.assertIn("rollup_usage has never run", stderr.getvalue())
+
+
+@override_settings(TELEGRAM_OUTBOX_RETENTION_DAYS=7, MESSAGE_LOG_PURGE_PAUSE=0)
+class TelegramOutboxRetentionTests(TestCase):
+    def setUp(self):
+        for status in ("sent", "failed", "pending", "sending"):
+            TelegramOutbox.objects.create(chat_id=1, text=f"old {status}", status=status)
+        TelegramOutbox.objects.update(updated_at=timezone.now() - timedelta(days=8))
+        TelegramOutbox.objects.create(chat_id=1, text="new sent", status="sent")
+
+    def remaining(self):
+        return set(TelegramOutbox.objects.values_list("text", flat=True))
+
+    def test_purges_only_old_finished_messages(self):
+        self.assertEqual(purge_telegram_outbox(dry_run=True), 2)
+        self.assertEqual(purge_telegram_outbox(batch_size=1), 2)
+        self.assertEqual(self.remaining(), {"old pending", "old sending", "new sent"})
+
+    @override_settings(TELEGRAM_OUTBOX_RETENTION_DAYS=0)
+    def test_zero_keeps_everything(self):
+        self.assertEqual(purge_telegram_outbox(), 0)
+        self.assertEqual(len(self.remaining()), 5)
+
+    def test_purge_command_reports_outbox(self):
+        stdout = StringIO()
+        call_command("purge_message_logs", stdout=stdout, stderr=StringIO())
+        self.assertIn("Purged 2 sent or failed Telegram messages", stdout.getvalue())
@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from chat.models import APIUser, MessageLog, UsageRollup
+from chat.rollups import get_high_water_mark, run_rollups
+
+
+DAY = datetime(2025, 3, 1, tzinfo=dt_timezone.utc)
+
+
+class RollupTests(TestCase):
+    def setUp(self):
+        self.api_user = APIUser.objects.create(company_name="acme", api_key="key")
+
+    def log(self, at, source="api", is_error=False, verdict=None):
+        log = MessageLog.objects.create(
+            source=source,
+            api_user=self.api_user if source == "api" else None,
+            request_text="q",
+            response_text="a",
+            is_error=is_error,
+            verdict=verdict,
+        )
+        MessageLog.objects.filter(id=log.id).update(created_at=at)
+        return log
+
+    def counts(self, period):
+        return {
+            (row.bucket_start, row.source, row.api_user_id, row.verdict): (row.request_count, row.error_count)
+            for row in UsageRollup.objects.filter(period=period)
+        }
+
+    def seed(self):
+        self.log(DAY + timedelta(hours=9, minutes=5))
+        self.log(DAY + timedelta(hours=9, minutes=40), is_error=True)
+        self.log(DAY + timedelta(hours=10))
+        self.log(DAY + timedelta(hours=10, minutes=1), source="ukweli", verdict="FALSE")
+        self.log(DAY + timedelta(hours=11), source="ukweli", verdict="FALSE")
+
+    def test_counts_requests_and_errors_per_bucket(self):
+        self.seed()
+
+        self.assertEqual(run_rollups(), 5)
+
+        nine, ten, eleven = (DAY + timedelta(hours=hour) for hour in (9, 10, 11))
+        self.assertEqual(
+            self.counts("hour"),
+            {
+                (nine, "api", self.api_user.id, ""): (2, 1),
+                (ten, "api", self.api_user.id, ""): (1, 0),
+                (ten, "ukweli", None, "FALSE"): (1, 0),
+                (eleven, "ukweli", None, "FALSE"): (1, 0),
+            },
+        )
+        self.assertEqual(
+            self.counts("day"),
+            {(DAY, "api", self.api_user.id, ""): (3, 1), (DAY, "ukweli", None, "FALSE"): (2, 0)},
+        )
+
+    def test_batches_add_up_across_the_checkpoint(self):
+        self.seed()
+
+        self.assertEqual(run_rollups(batch_size=2), 5)
+
+        self.assertEqual(get_high_water_mark(), MessageLog.objects.latest("id").id)
+        self.assertEqual(self.counts("day")[(DAY, "api", self.api_user.id, "")], (3, 1))
+        self.assertEqual(self.counts("hour")[(DAY + timedelta(hours=9), "api", self.api_user.id, "")], (2, 1))
+
+    def test_rerunning_is_idempotent(self):
+        self.seed()
+        run_rollups()
+        before = self.counts("day")
+
+        self.assertEqual(run_rollups(), 0)
+        self.assertEqual(self.counts("day"), before)
+
+        self.log(DAY + timedelta(hours=12))
+        self.assertEqual(run_rollups(), 1)
+        self.assertEqual(self.counts("day")[(DAY, "api", self.api_user.id, "")], (4, 1))
+
+    def test_rows_younger_than_the_settle_time_wait(self):
+        self.log(DAY)
+        recent = self.log(timezone.now())
+
+        self.assertEqual(run_rollups(settle_seconds=60), 1)
+        self.assertLess(get_high_water_mark(), recent.id)
+
+        self.assertEqual(run_rollups(settle_seconds=0), 1)
+        self.assertEqual(get_high_water_mark(), recent.id)
+
+    def test_command(self):
+        self.seed()
+        stdout = StringIO()
+        call_command("rollup_usage", "--batch-size", "2", stdout=stdout)
+        self.assertIn("Rolled up 5 message logs", stdout.getvalue())
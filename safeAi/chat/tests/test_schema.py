@@ -0,0 +1,17 @@
+from django.test import SimpleTestCase, override_settings
+
+from chat.views import usage_view
+from safeAi import schema
+
+
+class LazyAutoSchemaTests(SimpleTestCase):
+    def test_views_get_drf_spectacular_auto_schema(self):
+        from drf_spectacular.openapi import AutoSchema
+
+        view = usage_view.cls()
+        self.assertIsInstance(view.schema, AutoSchema)
+        self.assertIs(view.schema.view, view)
+
+    @override_settings(DEBUG=True)
+    def test_generated_schema_covers_views(self):
+        self.assertIn("/api/usage/", schema._load_schema()["paths"])
@@ -0,0 +1,53 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from chat import search
+from chat.models import MessageLog
+
+
+@override_settings(INTERNAL_API_TOKEN="secret", DEBUG=False)
+class SearchPaginationTests(TestCase):
+    def setUp(self):
+        texts = ["moon cheese"] * 4 + ["moon cheese moon cheese", "the moon", "cheese moon landing"]
+        self.matching = {
+            MessageLog.objects.create(source="chat", request_text=text, response_text="").id
+            for text in texts
+            if "cheese" in text
+        }
+
+    def test_cursor_pages_cover_every_match_once(self):
+        seen = []
+        cursor = None
+        while True:
+            params = {"q": "moon cheese", "limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = self.client.get(
+                "/api/messages/search/", params, headers={"X-Internal-Token": "secret"}
+            )
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            seen.extend(row["id"] for row in body["results"])
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(set(seen), self.matching)
+
+    def test_bad_cursor_is_rejected(self):
+        response = self.client.get(
+            "/api/messages/search/", {"q": "moon", "cursor": "nope"}, headers={"X-Internal-Token": "secret"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class RankExpressionTests(SimpleTestCase):
+    def test_cursor_round_trips(self):
+        self.assertEqual(search.decode_cursor(search.encode_cursor(0.0607927, 42)), (0.0607927, 42))
+
+    def test_postgres_rank_is_double_precision(self):
+        with mock.patch("chat.search._vendor", return_value="postgresql"):
+            rank = search._rank_expression("moon")
+        self.assertTrue(rank.sql.endswith("::float8"))
@@ -0,0 +1,122 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from chat.models import TelegramOutbox
+from chat.telegram_outbox import (
+    OutboxSender,
+    SendLimiter,
+    TokenBucket,
+    enqueue_telegram_message,
+    split_message,
+)
+from chat.telegram_service import TELEGRAM_MESSAGE_LIMIT, TelegramClientError
+
+
+class SplitMessageTests(SimpleTestCase):
+    def test_short_text_is_one_part(self):
+        self.assertEqual(split_message("hello", limit=10), ["hello"])
+
+    def test_prefers_line_breaks_then_spaces(self):
+        self.assertEqual(split_message("aaaa\nbbbb cccc", limit=9), ["aaaa", "bbbb cccc"])
+        self.assertEqual(split_message("aaaa bbbb cccc", limit=9), ["aaaa bbbb", "cccc"])
+
+    def test_hard_cut_without_break(self):
+        self.assertEqual(split_message("a" * 25, limit=10), ["a" * 10, "a" * 10, "a" * 5])
+
+
+class TokenBucketTests(SimpleTestCase):
+    def test_starts_full_and_refills_at_rate(self):
+        bucket = TokenBucket(rate=2, capacity=2)
+        bucket.updated = 0.0
+        for _ in range(2):
+            self.assertEqual(bucket.wait_time(0.0), 0.0)
+            bucket.take()
+        self.assertAlmostEqual(bucket.wait_time(0.0), 0.5)
+        self.assertEqual(bucket.wait_time(0.5), 0.0)
+
+    def test_never_holds_more_than_capacity(self):
+        bucket = TokenBucket(rate=1, capacity=3)
+        bucket.updated = 0.0
+        self.assertTrue(bucket.is_idle(100.0))
+        self.assertEqual(bucket.tokens, 3)
+
+    def test_pause_withholds_tokens(self):
+        bucket = TokenBucket(rate=1)
+        bucket.updated = 0.0
+        bucket.pause(5, 0.0)
+        self.assertAlmostEqual(bucket.wait_time(0.0), 5.0)
+        self.assertEqual(bucket.wait_time(5.0), 0.0)
+
+
+def unlimited():
+    return SendLimiter(global_rate=1000, chat_rate=1000)
+
+
+@mock.patch("chat.telegram_outbox.start_background_sender")
+class EnqueueTelegramMessageTests(TestCase):
+    @override_settings(TELEGRAM_SEND_INLINE=False)
+    def test_only_queues_when_inline_sending_is_off(self, start_sender):
+        enqueue_telegram_message(1, "reply")
+        self.assertEqual(list(TelegramOutbox.objects.values_list("status", flat=True)), ["pending"])
+
+    @mock.patch("chat.telegram_outbox.send_telegram_message", return_value=True)
+    def test_inline_sends_straight_away(self, send, start_sender):
+        enqueue_telegram_message(2, "reply")
+        send.assert_called_once_with(2, "reply")
+        self.assertEqual(TelegramOutbox.objects.get().status, "sent")
+        start_sender.assert_not_called()
+
+    @mock.patch("chat.telegram_outbox.get_limiter", unlimited)
+    @mock.patch("chat.telegram_outbox.send_telegram_message", side_effect=TelegramClientError("bad gateway", 502))
+    def test_failed_inline_part_holds_back_the_rest(self, send, start_sender):
+        part_one = "x" * TELEGRAM_MESSAGE_LIMIT
+        rows = enqueue_telegram_message(3, part_one + "\npart two")
+
+        send.assert_called_once_with(3, part_one)
+        self.assertEqual([row.status for row in rows], ["pending", "pending"])
+        self.assertEqual(
+            list(TelegramOutbox.objects.order_by("id").values_list("attempts", flat=True)), [1, 0]
+        )
+        start_sender.assert_called_once()
+
+    @mock.patch("chat.telegram_outbox.send_telegram_message", return_value=True)
+    def test_reply_queues_behind_earlier_unsent_one(self, send, start_sender):
+        TelegramOutbox.objects.create(chat_id=4, text="earlier", next_attempt_at=timezone.now() + timedelta(minutes=1))
+        enqueue_telegram_message(4, "later")
+        send.assert_not_called()
+        start_sender.assert_called_once()
+
+
+@mock.patch("chat.telegram_outbox.get_limiter", unlimited)
+class DispatchDueTests(TestCase):
+    def setUp(self):
+        self.sender = OutboxSender(workers=1)
+        self.sender.executor = mock.Mock()
+        self.addCleanup(self.sender.shutdown)
+
+    def started(self):
+        return [call.args[1].text for call in self.sender.executor.submit.call_args_list]
+
+    def test_part_backing_off_holds_back_later_parts(self):
+        now = timezone.now()
+        first = TelegramOutbox.objects.create(
+            chat_id=5, text="part one", attempts=1, next_attempt_at=now + timedelta(seconds=30)
+        )
+        TelegramOutbox.objects.create(chat_id=5, text="part two")
+        TelegramOutbox.objects.create(chat_id=6, text="other chat")
+
+        self.assertEqual(self.sender.dispatch_due(), 1)
+        self.assertEqual(self.started(), ["other chat"])
+
+        TelegramOutbox.objects.filter(id=first.id).update(next_attempt_at=now)
+        self.assertEqual(self.sender.dispatch_due(), 1)
+        self.assertEqual(self.started(), ["other chat", "part one"])
+
+    def test_part_being_sent_holds_back_later_parts(self):
+        TelegramOutbox.objects.create(chat_id=7, text="part one", status="sending")
+        TelegramOutbox.objects.create(chat_id=7, text="part two")
+
+        self.assertEqual(self.sender.dispatch_due(), 0)
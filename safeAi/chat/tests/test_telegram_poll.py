@@ -0,0 +1,20 @@
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase
+
+from chat.telegram_service import TelegramClientError
+
+
+class TelegramPollCommandTests(SimpleTestCase):
+    @mock.patch("chat.management.commands.telegram_poll.time.sleep")
+    @mock.patch(
+        "chat.management.commands.telegram_poll.get_telegram_updates",
+        side_effect=TelegramClientError("unreachable"),
+    )
+    def test_once_fails_on_first_error(self, get_updates, sleep):
+        with self.assertRaisesMessage(CommandError, "getUpdates failed: unreachable"):
+            call_command("telegram_poll", "--once")
+
+        get_updates.assert_called_once()
+        sleep.assert_not_called()
@@ -0,0 +1,30 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from chat.models import APIUser, MessageLog
+from chat.telegram_service import format_ukweli_reply
+
+
+RESULT = {
+    "final_verdict": "FALSE",
+    "explainable_confidence_score": 0.87,
+    "top_evidence_snippet": {"verdict": "REFUTES", "evidence": "Stats say otherwise.", "source": "https://example.org"},
+}
+
+
+class UkweliVerifyViewTests(TestCase):
+    def setUp(self):
+        self.api_user = APIUser.objects.create(company_name="acme", api_key="key")
+
+    @mock.patch("chat.views.cached_verify_claim", return_value=RESULT)
+    def test_logs_formatted_reply_like_telegram(self, _verify):
+        response = self.client.post(
+            "/api/ukweli/verify/", {"api_key": "key", "claim": "claim"}, content_type="application/json"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        log = MessageLog.objects.get()
+        self.assertEqual(log.response_text, format_ukweli_reply(RESULT))
+        self.assertEqual(log.result, RESULT)
+        self.assertEqual(log.verdict, "FALSE")
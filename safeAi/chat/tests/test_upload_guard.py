@@ -0,0 +1,46 @@
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+
+UPLOAD_URL = "/chat/upload/"
+
+
+@override_settings(UPLOAD_MAX_BYTES=1000, UPLOAD_JOBS_IN_PROCESS=False)
+class UploadGuardViewTests(TestCase):
+    def upload(self, name, content, **extra):
+        upload = SimpleUploadedFile(name, content)
+        return self.client.post(UPLOAD_URL, {"file": upload, "mode": "async"}, **extra)
+
+    def assertRejected(self, response, status_code, detail):
+        self.assertEqual(response.status_code, status_code)
+        self.assertIn(detail, response.json()["detail"])
+
+    def test_content_length_over_the_limit_is_413_before_reading(self):
+        # Declared far beyond the limit plus multipart overhead; the body
+        # itself is small and never read.
+        response = self.upload("a.txt", b"hello", CONTENT_LENGTH=str(10 * 1024 * 1024))
+        self.assertRejected(response, 413, "1000 byte limit")
+
+    def test_streamed_size_over_the_limit_is_413(self):
+        # Content-Length is within the multipart leeway, so only the bytes
+        # actually received trip the limit.
+        response = self.upload("a.txt", b"x" * 5000)
+        self.assertRejected(response, 413, "1000 byte limit")
+
+    def test_magic_bytes_must_match_the_extension(self):
+        for name in ("a.pdf", "a.docx", "a.doc"):
+            with self.subTest(name=name):
+                response = self.upload(name, b"plain text pretending")
+                self.assertRejected(response, 415, "does not match")
+
+    def test_binary_content_under_another_extension_is_415(self):
+        response = self.upload("a.txt", b"MZ\x90\x00\x03\x00")
+        self.assertRejected(response, 415, "Unsupported file type")
+
+    def test_files_within_the_limits_pass(self):
+        with tempfile.TemporaryDirectory() as job_dir, override_settings(UPLOAD_JOB_DIR=job_dir):
+            for name, content in (("a.txt", b"hello"), ("a.pdf", b"%PDF-1.7 ..."), ("a.doc", b"PK\x03\x04...")):
+                with self.subTest(name=name):
+                    self.assertEqual(self.upload(name, content).status_code, 202)
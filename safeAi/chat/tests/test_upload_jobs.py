@@ -0,0 +1,31 @@
+from django.test import TestCase
+
+from chat.models import ChatUser, UploadJob
+
+
+class UploadJobEventsViewTests(TestCase):
+    def setUp(self):
+        session = self.client.session
+        session.save()
+        chat_user = ChatUser.objects.create(session_id=session.session_key)
+        self.job = UploadJob.objects.create(
+            chat_user=chat_user, file_name="a.pdf", file_path="", status="succeeded", response_text="ok"
+        )
+
+    def test_event_stream_accept_header(self):
+        response = self.client.get(
+            f"/chat/upload/jobs/{self.job.id}/events/", headers={"Accept": "text/event-stream"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        body = b"".join(response.streaming_content)
+        self.assertTrue(body.startswith(b"event: done\ndata: "))
+        self.assertIn(b'"response_text":"ok"', body)
+
+    def test_other_sessions_get_404(self):
+        self.client.cookies.clear()
+        response = self.client.get(
+            f"/chat/upload/jobs/{self.job.id}/events/", headers={"Accept": "text/event-stream"}
+        )
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,87 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from chat.models import APIUser
+from chat.verdict_cache import SpaceSaving, normalize_claim, refresh_trending
+
+
+class NormalizeClaimTests(SimpleTestCase):
+    def test_folds_case_whitespace_and_trailing_punctuation(self):
+        self.assertEqual(normalize_claim("  The  Moon\nis CHEESE?! "), "the moon is cheese")
+
+    def test_keeps_inner_punctuation(self):
+        self.assertEqual(normalize_claim("Vaccines: 100% safe."), "vaccines: 100% safe")
+
+
+class SpaceSavingTests(SimpleTestCase):
+    def test_counts_exactly_within_capacity(self):
+        summary = SpaceSaving(3)
+        for key in "aabbba":
+            summary.offer(key, key.upper())
+        self.assertEqual(summary.top(2), [("a", "A", 3, 0), ("b", "B", 3, 0)])
+
+    def test_new_item_inherits_evicted_count_as_error(self):
+        summary = SpaceSaving(2)
+        for key in "aaab":
+            summary.offer(key, key)
+        summary.offer("c", "c")
+
+        self.assertEqual(summary.top(2), [("a", "a", 3, 0), ("c", "c", 2, 1)])
+
+    def test_decay_scales_counts_and_errors(self):
+        summary = SpaceSaving(1)
+        summary.offer("a", "a")
+        summary.offer("b", "b")
+        summary.decay(0.5)
+        self.assertEqual(summary.top(1), [("b", "b", 1.0, 0.5)])
+
+    def test_evicts_least_frequent_after_increments(self):
+        # Both heap entries are stale (count 1) by the time "c" arrives.
+        summary = SpaceSaving(2)
+        for key in "abaabbb":
+            summary.offer(key, key)
+        summary.offer("c", "c")
+
+        self.assertEqual(summary.top(2), [("b", "b", 4, 0), ("c", "c", 4, 3)])
+
+    def test_evicts_least_frequent_after_decay(self):
+        summary = SpaceSaving(2)
+        for key in "aaaab":
+            summary.offer(key, key)
+        summary.decay(0.5)
+        summary.offer("c", "c")
+
+        self.assertEqual(summary.top(2), [("a", "a", 2.0, 0.0), ("c", "c", 1.5, 0.5)])
+
+
+@override_settings(UKWELI_REFRESH_TOP_K=10, UKWELI_REFRESH_MIN_COUNT=3, UKWELI_REFRESH_INTERVAL=0)
+class RefreshTrendingTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.summary = SpaceSaving(2)
+        patcher = mock.patch("chat.verdict_cache.get_tracker", return_value=self.summary)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @mock.patch("chat.verdict_cache.verify_ukweli_claim", return_value={"final_verdict": "FALSE"})
+    def test_only_claims_seen_often_enough_are_refreshed(self, verify):
+        for key in "aaabb":
+            self.summary.offer(key, f"claim {key}")
+        # "c" evicts "b" and inherits its count: 3 lookups, but only 1 certain.
+        self.summary.offer("c", "claim c")
+
+        self.assertEqual(refresh_trending(), 1)
+        verify.assert_called_once_with("claim a")
+
+
+@override_settings(INTERNAL_API_TOKEN="secret", DEBUG=False, UKWELI_REFRESH_INTERVAL=0)
+class TrendingClaimsViewTests(TestCase):
+    def test_internal_only(self):
+        APIUser.objects.create(company_name="acme", api_key="key")
+
+        self.assertEqual(self.client.get("/api/ukweli/trending/", {"api_key": "key"}).status_code, 403)
+        response = self.client.get("/api/ukweli/trending/", headers={"X-Internal-Token": "secret"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("results", response.json())
@@ -0,0 +1,45 @@
+import asyncio
+from unittest import mock
+
+from django.db import connections
+from django.test import SimpleTestCase, override_settings
+
+from safeAi import asgi, warmup
+
+
+@override_settings(WARMUP_ON_START=True)
+@mock.patch("safeAi.warmup._upstream_pools")
+class WarmUpTests(SimpleTestCase):
+    def pools(self, upstream_pools):
+        session = mock.Mock()
+        upstream_pools.return_value = [("ukweli", session, "http://ukweli.invalid")]
+        return session
+
+    def test_asgi_factory_inside_a_running_loop(self, upstream_pools):
+        session = self.pools(upstream_pools)
+        timings = []
+        real_warm_up = warmup.warm_up
+
+        async def start():
+            # uvicorn --factory calls create_app() from its event loop.
+            return asgi.create_app()
+
+        with mock.patch.object(warmup, "warm_up", lambda: timings.append(real_warm_up())):
+            self.assertIs(asyncio.run(start()), asgi.application)
+
+        # The upstream pool is warmed; the databases are left to the request threads.
+        self.assertEqual([list(timing) for timing in timings], [["ukweli"]])
+        session.head.assert_called_once()
+
+    def test_failures_never_raise(self, upstream_pools):
+        session = self.pools(upstream_pools)
+        session.head.side_effect = OSError("unreachable")
+
+        with (
+            mock.patch.object(connections["default"], "ensure_connection", side_effect=RuntimeError("boom")),
+            self.assertLogs("safeAi.warmup", "WARNING") as logs,
+        ):
+            timings = warmup.warm_up()
+
+        self.assertEqual(len(logs.records), 2)
+        self.assertEqual(set(timings), {f"db:{alias}" for alias in connections} | {"ukweli"})
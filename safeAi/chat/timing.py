@@ -0,0 +1,50 @@
+"""
+Per-request timing spans, reported in the ``Server-Timing`` response header.
+
+Code on the request path wraps interesting sections in :func:`span`. Outside a
+request (management commands, background jobs) no recorder is active and a
+span costs one context-variable lookup.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+_recorder: ContextVar = ContextVar("server_timing_recorder", default=None)
+
+
+class TimingRecorder:
+    def __init__(self):
+        self.spans = {}
+
+    def add(self, name, seconds):
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    def header_value(self):
+        return ", ".join(
+            f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.spans.items()
+        )
+
+
+def start_recording():
+    """Activate a fresh recorder for the current request; returns ``(recorder, token)``."""
+    recorder = TimingRecorder()
+    return recorder, _recorder.set(recorder)
+
+
+def stop_recording(token):
+    _recorder.reset(token)
+
+
+@contextmanager
+def span(name):
+    recorder = _recorder.get()
+    if recorder is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.add(name, time.perf_counter() - start)
@@ -1,13 +1,26 @@
 import logging
-from typing import Any, Dict
+import os
+from typing import Any, Dict, Optional, Tuple
 
 import requests
 
+from .metrics import observe_upstream
+
 
 logger = logging.getLogger(__name__)
 
-UKWELI_BASE_URL = "https://penguin27-ukweli-lens-api.hf.space"
+UKWELI_BASE_URL = os.environ.get(
+    "UKWELI_BASE_URL",
+    "https://penguin27-ukweli-lens-api.hf.space",
+)
 UKWELI_VERIFY_PATH = "/api/verify/"
+VERDICT_MAX_LENGTH = 32
+
+# Keep-alive pool shared by request threads and the trending-claim refresher,
+# so only the first call pays for DNS and the TLS handshake.
+_session = requests.Session()
+_session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=16))
+_session.mount("http://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=16))
 
 
 class UkweliClientError(Exception):
@@ -21,28 +34,44 @@ def verify_ukweli_claim(claim: str) -> Dict[str, Any]:
     url = f"{UKWELI_BASE_URL}{UKWELI_VERIFY_PATH}"
     payload = {"claim": claim}
 
-    try:
-        response = requests.post(
-            url,
-            headers={"Content-Type": "application/json"},
-            json=payload,
-            timeout=60,
-        )
-    except requests.Timeout as exc:
-        logger.warning("Ukweli API request timed out", exc_info=exc)
-        raise UkweliClientError("Ukweli API request timed out") from exc
-    except requests.RequestException as exc:
-        logger.warning("Ukweli API request failed", exc_info=exc)
-        raise UkweliClientError(f"Ukweli API request failed: {exc}") from exc
-
-    if response.status_code == 400:
-        raise UkweliClientError("Invalid request to Ukweli API (400)")
-    if response.status_code == 503:
-        raise UkweliClientError("Ukweli API is temporarily unavailable (503)")
-    if response.status_code >= 500:
-        raise UkweliClientError("Ukweli API internal error")
-
-    try:
-        return response.json()
-    except ValueError as exc:
-        raise UkweliClientError("Failed to decode Ukweli API response as JSON") from exc
+    with observe_upstream("ukweli") as call:
+        try:
+            response = _session.post(
+                url,
+                headers={"Content-Type": "application/json"},
+                json=payload,
+                timeout=60,
+            )
+        except requests.Timeout as exc:
+            logger.warning("Ukweli API request timed out", exc_info=exc)
+            raise UkweliClientError("Ukweli API request timed out") from exc
+        except requests.RequestException as exc:
+            logger.warning("Ukweli API request failed", exc_info=exc)
+            raise UkweliClientError(f"Ukweli API request failed: {exc}") from exc
+
+        call.status_code = response.status_code
+        if response.status_code == 400:
+            raise UkweliClientError("Invalid request to Ukweli API (400)")
+        if response.status_code == 503:
+            raise UkweliClientError("Ukweli API is temporarily unavailable (503)")
+        if response.status_code >= 500:
+            raise UkweliClientError("Ukweli API internal error")
+
+        try:
+            return response.json()
+        except ValueError as exc:
+            raise UkweliClientError("Failed to decode Ukweli API response as JSON") from exc
+
+
+def extract_verdict(result: Any) -> Tuple[Optional[str], Optional[float]]:
+    """Pull the final verdict and confidence score out of a Ukweli result."""
+    if not isinstance(result, dict):
+        return None, None
+
+    verdict = result.get("final_verdict")
+    if verdict is not None:
+        verdict = str(verdict)[:VERDICT_MAX_LENGTH]
+
+    score = result.get("explainable_confidence_score")
+    confidence = float(score) if isinstance(score, (int, float)) and not isinstance(score, bool) else None
+    return verdict, confidence
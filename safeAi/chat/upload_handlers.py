@@ -0,0 +1,75 @@
+"""
+Upload handler that refuses oversized or unsupported files early.
+
+Views install it in front of Django's memory/temporary-file handlers with
+:func:`guard_uploads`: the request size is checked from Content-Length before
+any of the body is read, and each file's type from its name and first bytes
+before the rest of it is received.
+"""
+
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler
+
+
+# Leeway for multipart boundaries, headers and the other form fields on top of
+# the file itself.
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+MAGIC_BYTES = {
+    ".pdf": (b"%PDF-",),
+    ".docx": (b"PK\x03\x04",),
+    # Legacy Word files are OLE2 compound documents; some are really .docx.
+    ".doc": (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", b"PK\x03\x04"),
+}
+
+
+class UploadRejected(Exception):
+    def __init__(self, detail, status_code):
+        super().__init__(detail)
+        self.status_code = status_code
+
+
+def _extension(file_name):
+    name = (file_name or "").lower()
+    dot = name.rfind(".")
+    return name[dot:] if dot != -1 else ""
+
+
+class GuardedUploadHandler(FileUploadHandler):
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        limit = settings.UPLOAD_MAX_BYTES
+        if content_length and content_length > limit + MULTIPART_OVERHEAD_BYTES:
+            raise UploadRejected(f"Upload exceeds the {limit} byte limit.", 413)
+        return None
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None, content_type_extra=None):
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        if start == 0:
+            self._check_type(raw_data)
+        self.received += len(raw_data)
+        limit = settings.UPLOAD_MAX_BYTES
+        if self.received > limit:
+            raise UploadRejected(f"Upload exceeds the {limit} byte limit.", 413)
+        return raw_data
+
+    def _check_type(self, head):
+        extension = _extension(self.file_name)
+        signatures = MAGIC_BYTES.get(extension)
+        if signatures is not None:
+            if not head.startswith(signatures):
+                raise UploadRejected(f"File content does not match its {extension} extension.", 415)
+        elif b"\x00" in head:
+            # Anything that is not PDF or Word is read as text; NUL bytes mean
+            # it is some other binary format.
+            raise UploadRejected("Unsupported file type.", 415)
+
+    def file_complete(self, file_size):
+        return None
+
+
+def guard_uploads(request):
+    """Install the guard; call before the view first touches request.data."""
+    request.upload_handlers.insert(0, GuardedUploadHandler(request))
@@ -0,0 +1,148 @@
+"""
+Background processing for document uploads submitted with ``mode=async``.
+
+The HTTP request only spools the file to disk and creates an UploadJob; the
+extraction and the Gemini call happen here, with progress written to the job
+row so clients can poll it or follow it over server-sent events.
+"""
+
+import logging
+import os
+import time
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+from .extraction import extract_pages
+from .gemini_service import GeminiClientError, generate_gemini_response
+from .models import MessageLog, UploadJob
+from .preprocessing import prepare_upload_text
+
+
+logger = logging.getLogger(__name__)
+
+# Write page progress at most this often, to keep large PDFs from turning
+# into one UPDATE per page.
+PROGRESS_INTERVAL_SECONDS = 1.0
+
+
+def create_upload_job(chat_user, message, uploaded_file):
+    job_id = uuid.uuid4()
+    directory = Path(settings.UPLOAD_JOB_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{job_id}{Path(uploaded_file.name or '').suffix.lower()}"
+    with open(path, "wb") as spooled:
+        for chunk in uploaded_file.chunks():
+            spooled.write(chunk)
+
+    return UploadJob.objects.create(
+        id=job_id,
+        chat_user=chat_user,
+        message=message,
+        file_name=uploaded_file.name or "",
+        file_path=str(path),
+    )
+
+
+def _update(job, **fields):
+    for name, value in fields.items():
+        setattr(job, name, value)
+    job.save(update_fields=[*fields, "updated_at"])
+
+
+def _fail(job, request_text, error, detail):
+    MessageLog.objects.create(
+        source="chat",
+        chat_user=job.chat_user,
+        request_text=request_text,
+        response_text=error,
+        is_error=True,
+    )
+    _update(job, status="failed", error=detail, finished_at=timezone.now())
+
+
+def _remove_spooled_file(job):
+    try:
+        os.remove(job.file_path)
+    except FileNotFoundError:
+        pass
+
+
+def run_upload_job(job_id):
+    claimed = UploadJob.objects.filter(id=job_id, status="pending").update(
+        status="extracting", updated_at=timezone.now()
+    )
+    if not claimed:
+        return
+    job = UploadJob.objects.select_related("chat_user").get(id=job_id)
+
+    last_write = [0.0]
+
+    def on_progress(done, total):
+        now = time.monotonic()
+        if now - last_write[0] >= PROGRESS_INTERVAL_SECONDS or done == total:
+            last_write[0] = now
+            _update(job, pages_done=done, pages_total=total)
+
+    try:
+        with open(job.file_path, "rb") as spooled:
+            pages = extract_pages(spooled, job.file_name, on_progress=on_progress)
+        extracted_text = prepare_upload_text(pages, job.file_name)
+    except Exception as exc:  # noqa: BLE001
+        _fail(
+            job,
+            job.message or job.file_name,
+            f"Failed to extract file text: {exc}",
+            "Failed to read uploaded file.",
+        )
+        _remove_spooled_file(job)
+        return
+
+    message = job.message
+    combined_text = (message + "\n\n" + extracted_text).strip() if message else extracted_text
+    _update(job, status="generating")
+
+    try:
+        response_text = generate_gemini_response(combined_text)
+    except GeminiClientError as exc:
+        _fail(job, combined_text, str(exc), str(exc))
+        _remove_spooled_file(job)
+        return
+
+    MessageLog.objects.create(
+        source="chat",
+        chat_user=job.chat_user,
+        request_text=combined_text,
+        response_text=response_text,
+    )
+    _update(
+        job,
+        status="succeeded",
+        response_text=response_text,
+        finished_at=timezone.now(),
+    )
+    _remove_spooled_file(job)
+
+
+def requeue_stale_upload_jobs():
+    """Retry jobs whose worker died mid-way (no progress for a while)."""
+    stale_before = timezone.now() - timedelta(minutes=settings.UPLOAD_JOB_STALE_MINUTES)
+    return UploadJob.objects.filter(
+        status__in=["extracting", "generating"], updated_at__lt=stale_before
+    ).update(status="pending", pages_done=0, updated_at=timezone.now())
+
+
+def run_pending_upload_jobs():
+    job_ids = list(
+        UploadJob.objects.filter(status="pending").order_by("created_at").values_list("id", flat=True)
+    )
+    for job_id in job_ids:
+        try:
+            run_upload_job(job_id)
+        except Exception:  # noqa: BLE001
+            logger.exception("Upload job %s crashed", job_id)
+    return len(job_ids)
+
@@ -3,24 +3,50 @@ from django.urls import path
 from .views import (
     api_generate_key_view,
     api_message_view,
+    bulk_delete_message_logs_view,
     all_data_view,
     chat_upload_view,
     chat_view,
+    db_connections_view,
     telegram_webhook_view,
+    trending_claims_view,
     delete_message_log_view,
+    export_message_logs_view,
     ukweli_verify_view,
+    usage_view,
+    verdict_stats_view,
     health_check_view,
+    metrics_view,
+    purge_job_view,
+    search_message_logs_view,
+    upload_job_events_view,
+    upload_job_view,
 )
 
 
 urlpatterns = [
     path("chat/", chat_view, name="chat"),
     path("chat/upload/", chat_upload_view, name="chat-upload"),
+    path("chat/upload/jobs/<uuid:job_id>/", upload_job_view, name="upload-job"),
+    path("chat/upload/jobs/<uuid:job_id>/events/", upload_job_events_view, name="upload-job-events"),
     path("telegram/webhook/", telegram_webhook_view, name="telegram-webhook"),
     path("api/generate-key/", api_generate_key_view, name="api-generate-key"),
     path("api/message/", api_message_view, name="api-message"),
     path("api/all-data/", all_data_view, name="api-all-data"),
     path("api/ukweli/verify/", ukweli_verify_view, name="ukweli-verify"),
+    path("api/ukweli/trending/", trending_claims_view, name="ukweli-trending"),
+    path("api/usage/", usage_view, name="api-usage"),
+    path("api/verdicts/", verdict_stats_view, name="api-verdict-stats"),
+    path("api/messages/export/", export_message_logs_view, name="export-message-logs"),
+    path("api/messages/search/", search_message_logs_view, name="search-message-logs"),
     path("api/messages/<int:message_id>/", delete_message_log_view, name="delete-message-log"),
+    path(
+        "api/messages/bulk-delete/",
+        bulk_delete_message_logs_view,
+        name="bulk-delete-message-logs",
+    ),
+    path("api/messages/bulk-delete/<int:job_id>/", purge_job_view, name="purge-job"),
     path("health/", health_check_view, name="health-check"),
+    path("metrics", metrics_view, name="metrics"),
+    path("internal/db-connections/", db_connections_view, name="internal-db-connections"),
 ]
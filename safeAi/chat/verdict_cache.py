@@ -0,0 +1,190 @@
+"""
+Cached Ukweli verification with proactive refresh of trending claims.
+
+Verdicts are cached under the normalized claim for ``UKWELI_VERDICT_TTL``
+seconds. Every lookup is also counted in a Space-Saving summary, which keeps
+approximate counts for the most frequent claims in a fixed number of
+counters. A background thread re-verifies the top claims shortly before their
+cached verdict expires, so a burst on a popular claim never waits on Ukweli.
+The same summary backs the trending-claims endpoint.
+
+The summary and refresher live in each process. With several workers, each
+tracks the claims it serves; a cache-level lock stops them refreshing the
+same claim at once.
+"""
+
+import hashlib
+import heapq
+import logging
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .metrics import UKWELI_CACHE
+from .ukweli_service import UkweliClientError, verify_ukweli_claim
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "ukweli:verdict:"
+REFRESH_LOCK_PREFIX = "ukweli:refreshing:"
+# Counts halve over this many seconds, so "trending" means recent.
+TRENDING_HALF_LIFE = 900
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_claim(claim):
+    """Case-fold, collapse whitespace and drop trailing punctuation."""
+    return _WHITESPACE_RE.sub(" ", claim).strip().rstrip(".!?").strip().casefold()
+
+
+def claim_key(normalized):
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+
+
+class SpaceSaving:
+    """Top-k frequency summary over a stream (Metwally et al., Space-Saving).
+
+    At most ``capacity`` items are counted. A new item evicts the least
+    frequent one and inherits its count, recorded as ``error``, so an item's
+    true count lies between ``count - error`` and ``count``.
+
+    The least frequent item is found with a min-heap of ``(count, key)``
+    holding one entry per counted key. Increments do not touch the heap, so
+    an entry may be below its key's count; such an entry is pushed back with
+    the current count when it reaches the top. Each increment causes at most
+    one such push, so ``offer`` costs O(log capacity) amortized.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        # key -> [count, error, item]
+        self._counters = {}
+        self._heap = []
+
+    def offer(self, key, item):
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is not None:
+                counter[0] += 1
+                return
+            if len(self._counters) < self.capacity:
+                self._counters[key] = [1, 0, item]
+                heapq.heappush(self._heap, (1, key))
+                return
+            while True:
+                floor, evicted = heapq.heappop(self._heap)
+                count = self._counters[evicted][0]
+                if count == floor:
+                    break
+                heapq.heappush(self._heap, (count, evicted))
+            del self._counters[evicted]
+            self._counters[key] = [floor + 1, floor, item]
+            heapq.heappush(self._heap, (floor + 1, key))
+
+    def top(self, n):
+        """The ``n`` most frequent items as ``(key, item, count, error)``."""
+        with self._lock:
+            ranked = sorted(self._counters.items(), key=lambda entry: entry[1][0], reverse=True)[:n]
+            return [(key, item, count, error) for key, (count, error, item) in ranked]
+
+    def decay(self, factor):
+        with self._lock:
+            for counter in self._counters.values():
+                counter[0] *= factor
+                counter[1] *= factor
+            self._heap = [(counter[0], key) for key, counter in self._counters.items()]
+            heapq.heapify(self._heap)
+
+
+_tracker = None
+_tracker_lock = threading.Lock()
+
+
+def get_tracker():
+    global _tracker
+    if _tracker is None:
+        with _tracker_lock:
+            if _tracker is None:
+                _tracker = SpaceSaving(settings.UKWELI_TRACKER_CAPACITY)
+                _start_refresher()
+    return _tracker
+
+
+def get_cached_verdict(key):
+    entry = cache.get(CACHE_PREFIX + key)
+    return entry["result"] if entry else None
+
+
+def _store(key, result):
+    ttl = settings.UKWELI_VERDICT_TTL
+    cache.set(CACHE_PREFIX + key, {"result": result, "expires_at": time.time() + ttl}, ttl)
+
+
+def cached_verify_claim(claim):
+    """:func:`verify_ukweli_claim` through the verdict cache."""
+    normalized = normalize_claim(claim)
+    key = claim_key(normalized)
+    get_tracker().offer(key, claim)
+
+    result = get_cached_verdict(key)
+    if result is not None:
+        UKWELI_CACHE.labels("hit").inc()
+        return result
+
+    UKWELI_CACHE.labels("miss").inc()
+    result = verify_ukweli_claim(claim)
+    _store(key, result)
+    return result
+
+
+def refresh_trending():
+    """Re-verify top claims whose verdict is missing or about to expire.
+
+    A claim needs at least UKWELI_REFRESH_MIN_COUNT recent lookups, counting
+    only those the summary is sure of (``count - error``); otherwise a quiet
+    process would re-verify whatever it happened to see last.
+    """
+    refreshed = 0
+    for key, claim, count, error in get_tracker().top(settings.UKWELI_REFRESH_TOP_K):
+        if count - error < settings.UKWELI_REFRESH_MIN_COUNT:
+            continue
+        entry = cache.get(CACHE_PREFIX + key)
+        if entry and entry["expires_at"] - time.time() > settings.UKWELI_REFRESH_AHEAD:
+            continue
+        if not cache.add(REFRESH_LOCK_PREFIX + key, 1, timeout=settings.UKWELI_REFRESH_AHEAD):
+            continue
+        try:
+            result = verify_ukweli_claim(claim)
+        except UkweliClientError:
+            logger.warning("Could not refresh trending claim %s", key, exc_info=True)
+            continue
+        _store(key, result)
+        UKWELI_CACHE.labels("refresh").inc()
+        refreshed += 1
+    return refreshed
+
+
+def _refresh_loop(interval):
+    decay = 0.5 ** (interval / TRENDING_HALF_LIFE)
+    while True:
+        time.sleep(interval)
+        try:
+            refresh_trending()
+        except Exception:  # noqa: BLE001
+            logger.exception("Trending claim refresh failed")
+        get_tracker().decay(decay)
+
+
+def _start_refresher():
+    interval = settings.UKWELI_REFRESH_INTERVAL
+    if interval <= 0:
+        return
+    threading.Thread(
+        target=_refresh_loop, args=(interval,), name="ukweli-refresher", daemon=True
+    ).start()
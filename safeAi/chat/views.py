@@ -1,16 +1,36 @@
-import json
-import os
+import time
 import uuid
+from functools import wraps
 
-import requests
-from django.http import JsonResponse, HttpResponse
+from django.db.models import Sum
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.views.decorators.http import require_GET
 from rest_framework import status
 from rest_framework.decorators import api_view, parser_classes
 from rest_framework.parsers import FormParser, MultiPartParser
+from safeAi.db_metrics import get_connection_stats
+from safeAi.db_router import read_from_replica, use_read_replica
 
+from .background import run_in_background
+from .conditional import conditional_get, note_changed, rollup_validators, table_validators
+from .extraction import extract_pages
 from .gemini_service import GeminiClientError, generate_gemini_response
-from .models import APIUser, ChatUser, MessageLog, TelegramUser
-from .ukweli_service import UkweliClientError, verify_ukweli_claim
+from .json_backend import dumps, json_response
+from .metrics import render_metrics
+from .models import APIUser, ChatUser, MessageLog, PurgeJob, TelegramUser, UploadJob, UsageRollup
+from .permissions import has_internal_access
+from .preprocessing import prepare_upload_text
+from .retention import run_purge_job
+from .search import InvalidCursor, search_message_logs
+from .telegram_service import format_ukweli_reply
+from .telegram_updates import handle_update
+from .timing import span
+from .ukweli_service import UkweliClientError, extract_verdict
+from .upload_handlers import UploadRejected, guard_uploads
+from .upload_jobs import create_upload_job, run_upload_job
+from .verdict_cache import cached_verify_claim, get_cached_verdict, get_tracker
 from .serializers import (
     APIKeyRequestSerializer,
     APIMessageRequestSerializer,
@@ -18,42 +38,24 @@ from .serializers import (
     ChatRequestSerializer,
     ChatUploadRequestSerializer,
     ChatUserSerializer,
+    MessageLogBulkDeleteSerializer,
+    MessageLogExportQuerySerializer,
+    MessageLogSearchQuerySerializer,
     MessageLogSerializer,
+    PurgeJobSerializer,
     UkweliVerifyRequestSerializer,
     TelegramUserSerializer,
+    TrendingClaimsQuerySerializer,
+    UploadJobSerializer,
+    UsageQuerySerializer,
 )
 
 
-def _extract_text_from_uploaded_file(uploaded_file):
-    name = (uploaded_file.name or "").lower()
-    if name.endswith(".pdf"):
-        from PyPDF2 import PdfReader
-
-        reader = PdfReader(uploaded_file)
-        parts = []
-        for page in reader.pages:
-            text = page.extract_text() or ""
-            parts.append(text)
-        return "\n".join(parts)
-    if name.endswith(".docx") or name.endswith(".doc"):
-        from docx import Document
-
-        document = Document(uploaded_file)
-        parts = [p.text for p in document.paragraphs if p.text]
-        return "\n".join(parts)
-    # Fallback: treat as text file
-    data = uploaded_file.read()
-    try:
-        return data.decode("utf-8", errors="ignore")
-    except AttributeError:
-        return str(data)
-
-
 @api_view(["POST"])
 def chat_view(request):
     serializer = ChatRequestSerializer(data=request.data)
     if not serializer.is_valid():
-        return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        return json_response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     if not request.session.session_key:
         request.session.create()
@@ -71,8 +73,9 @@ def chat_view(request):
             chat_user=chat_user,
             request_text=message,
             response_text=str(exc),
+            is_error=True,
         )
-        return JsonResponse(
+        return json_response(
             {"detail": str(exc)}, status=status.HTTP_502_BAD_GATEWAY
         )
 
@@ -83,15 +86,21 @@ def chat_view(request):
         response_text=response_text,
     )
 
-    return JsonResponse({"response": response_text})
+    return json_response({"response": response_text})
 
 
 @api_view(["POST"])
 @parser_classes([MultiPartParser, FormParser])
 def chat_upload_view(request):
-    serializer = ChatUploadRequestSerializer(data=request.data)
+    guard_uploads(request)
+    try:
+        data = request.data
+    except UploadRejected as exc:
+        return json_response({"detail": str(exc)}, status=exc.status_code)
+
+    serializer = ChatUploadRequestSerializer(data=data)
     if not serializer.is_valid():
-        return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        return json_response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     if not request.session.session_key:
         request.session.create()
@@ -102,18 +111,35 @@ def chat_upload_view(request):
     message = serializer.validated_data.get("message") or ""
     uploaded_file = request.FILES.get("file")
     if uploaded_file is None:
-        return JsonResponse({"file": ["This field is required."]}, status=status.HTTP_400_BAD_REQUEST)
+        return json_response({"file": ["This field is required."]}, status=status.HTTP_400_BAD_REQUEST)
+
+    if serializer.validated_data["mode"] == "async":
+        job = create_upload_job(chat_user, message, uploaded_file)
+        if settings.UPLOAD_JOBS_IN_PROCESS:
+            run_in_background("uploads", run_upload_job, job.id)
+        return json_response(
+            {
+                "job_id": str(job.id),
+                "status": job.status,
+                "status_url": reverse("upload-job", args=[job.id]),
+                "events_url": reverse("upload-job-events", args=[job.id]),
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
 
     try:
-        extracted_text = _extract_text_from_uploaded_file(uploaded_file)
+        with span("extract"):
+            pages = extract_pages(uploaded_file, uploaded_file.name)
+            extracted_text = prepare_upload_text(pages, uploaded_file.name)
     except Exception as exc:  # noqa: BLE001
         MessageLog.objects.create(
             source="chat",
             chat_user=chat_user,
             request_text=message or uploaded_file.name,
             response_text=f"Failed to extract file text: {exc}",
+            is_error=True,
         )
-        return JsonResponse(
+        return json_response(
             {"detail": "Failed to read uploaded file."},
             status=status.HTTP_400_BAD_REQUEST,
         )
@@ -128,8 +154,9 @@ def chat_upload_view(request):
             chat_user=chat_user,
             request_text=combined_text,
             response_text=str(exc),
+            is_error=True,
         )
-        return JsonResponse(
+        return json_response(
             {"detail": str(exc)},
             status=status.HTTP_502_BAD_GATEWAY,
         )
@@ -141,28 +168,83 @@ def chat_upload_view(request):
         response_text=response_text,
     )
 
-    return JsonResponse({"response": response_text})
+    return json_response({"response": response_text})
+
+
+# Server-sent event streams end after this long even if the job is still
+# running; EventSource clients reconnect on their own. A stream holds a sync
+# worker, so this stays well under GUNICORN_TIMEOUT (120 s by default).
+UPLOAD_EVENTS_MAX_SECONDS = 30
+UPLOAD_EVENTS_POLL_SECONDS = 0.5
+EXPORT_CHUNK_SIZE = 1000
+
+
+def _get_session_upload_job(request, job_id):
+    session_id = request.session.session_key
+    if not session_id:
+        return None
+    return UploadJob.objects.filter(id=job_id, chat_user__session_id=session_id).first()
+
+
+@api_view(["GET"])
+def upload_job_view(request, job_id):
+    job = _get_session_upload_job(request, job_id)
+    if job is None:
+        return json_response({"detail": "Upload job not found"}, status=status.HTTP_404_NOT_FOUND)
+    return json_response(UploadJobSerializer(job).data)
+
+
+def _upload_job_events(job_id):
+    deadline = time.monotonic() + UPLOAD_EVENTS_MAX_SECONDS
+    last_sent = None
+    while True:
+        job = UploadJob.objects.filter(id=job_id).first()
+        if job is None:
+            return
+        data = UploadJobSerializer(job).data
+        state = (data["status"], data["pages_done"])
+        if state != last_sent:
+            last_sent = state
+            event = "done" if job.status in UploadJob.TERMINAL_STATUSES else "progress"
+            yield b"event: " + event.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+        if job.status in UploadJob.TERMINAL_STATUSES or time.monotonic() >= deadline:
+            return
+        time.sleep(UPLOAD_EVENTS_POLL_SECONDS)
+
+
+# A plain view: DRF's content negotiation would answer 406 to the
+# ``Accept: text/event-stream`` that EventSource sends.
+@require_GET
+def upload_job_events_view(request, job_id):
+    job = _get_session_upload_job(request, job_id)
+    if job is None:
+        return json_response({"detail": "Upload job not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    response = StreamingHttpResponse(_upload_job_events(job.id), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
 
 
 @api_view(["POST"])
 def api_generate_key_view(request):
     serializer = APIKeyRequestSerializer(data=request.data)
     if not serializer.is_valid():
-        return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        return json_response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     company_name = serializer.validated_data["company_name"]
     api_key = str(uuid.uuid4())
 
     api_user = APIUser.objects.create(company_name=company_name, api_key=api_key)
 
-    return JsonResponse({"api_key": api_user.api_key})
+    return json_response({"api_key": api_user.api_key})
 
 
 @api_view(["POST"])
 def api_message_view(request):
     serializer = APIMessageRequestSerializer(data=request.data)
     if not serializer.is_valid():
-        return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        return json_response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     api_key = serializer.validated_data["api_key"]
     message = serializer.validated_data["message"]
@@ -175,8 +257,9 @@ def api_message_view(request):
             api_user=None,
             request_text=message,
             response_text="Invalid API key",
+            is_error=True,
         )
-        return JsonResponse(
+        return json_response(
             {"detail": "Invalid API key"}, status=status.HTTP_401_UNAUTHORIZED
         )
 
@@ -188,8 +271,9 @@ def api_message_view(request):
             api_user=api_user,
             request_text=message,
             response_text=str(exc),
+            is_error=True,
         )
-        return JsonResponse(
+        return json_response(
             {"detail": str(exc)}, status=status.HTTP_502_BAD_GATEWAY
         )
 
@@ -201,106 +285,164 @@ def api_message_view(request):
     )
 
     payload = {"response": response_text, "api_user_id": api_user.id}
-    return HttpResponse(
-        json.dumps(payload),
-        content_type="application/json",
-    )
+    return json_response(payload)
 
 
 @api_view(["POST"])
 def telegram_webhook_view(request):
-    data = request.data
+    # For non-text or unsupported updates (no chat id or no text),
+    # handle_update does nothing; acknowledge with 200 either way so
+    # Telegram doesn't repeatedly retry.
+    handle_update(request.data)
+    return json_response({"ok": True})
 
-    message = data.get("message") or {}
-    chat = message.get("chat") or {}
-    text = message.get("text")
-    telegram_id = chat.get("id")
-    username = chat.get("username") or chat.get("first_name")
 
-    # For non-text or unsupported updates (no chat id or no text),
-    # just acknowledge with 200 so Telegram doesn't repeatedly retry.
-    if telegram_id is None or text is None:
-        return JsonResponse({"ok": True})
+@api_view(["GET"])
+@use_read_replica
+@conditional_get(lambda: table_validators(ChatUser, TelegramUser, APIUser, MessageLog))
+def all_data_view(request):
+    with span("serialize"):
+        chat_users = ChatUserSerializer(ChatUser.objects.all(), many=True).data
+        telegram_users = TelegramUserSerializer(TelegramUser.objects.all(), many=True).data
+        api_users = APIUserSerializer(APIUser.objects.all(), many=True).data
+        message_logs = MessageLogSerializer(MessageLog.objects.all(), many=True).data
+
+        return json_response(
+            {
+                "chat_users": chat_users,
+                "telegram_users": telegram_users,
+                "api_users": api_users,
+                "message_logs": message_logs,
+            }
+        )
 
-    telegram_user, _ = TelegramUser.objects.get_or_create(
-        telegram_id=telegram_id,
-        defaults={"username": username},
-    )
 
-    if username and telegram_user.username != username:
-        telegram_user.username = username
-        telegram_user.save(update_fields=["username"])
+def _filtered_rollups(params):
+    rollups = UsageRollup.objects.filter(period=params["period"])
+    if "source" in params:
+        rollups = rollups.filter(source=params["source"])
+    if "since" in params:
+        rollups = rollups.filter(bucket_start__gte=params["since"])
+    if "until" in params:
+        rollups = rollups.filter(bucket_start__lt=params["until"])
+    return rollups
 
-    try:
-        result = verify_ukweli_claim(text)
 
-        verdict = result.get("final_verdict", "UNKNOWN")
-        score = result.get("explainable_confidence_score")
-        snippet = result.get("top_evidence_snippet") or {}
+def _report_access(view_func):
+    """Resolve the report caller before ``conditional_get`` runs.
 
-        evidence_verdict = snippet.get("verdict")
-        evidence_text = snippet.get("evidence")
-        evidence_source = snippet.get("source")
+    An ``api_key`` caller gets its own rows, an internal caller everyone's;
+    anyone else is refused before validators are computed, so a 304 or an
+    ``If-Modified-Since`` probe reveals nothing either. The API user, or None
+    for an internal caller, is left in ``request.report_api_user``.
+    """
 
-        parts = [f"Verdict: {verdict}"]
-        if isinstance(score, (int, float)):
-            parts.append(f"Confidence: {score:.2f}")
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        api_key = request.query_params.get("api_key")
+        api_user = None
+        if api_key is not None:
+            api_user = APIUser.objects.filter(api_key=api_key).first()
+            if api_user is None:
+                return json_response(
+                    {"detail": "Invalid API key"}, status=status.HTTP_401_UNAUTHORIZED
+                )
+        elif not has_internal_access(request):
+            return json_response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+        request.report_api_user = api_user
+        return view_func(request, *args, **kwargs)
 
-        if evidence_verdict or evidence_text or evidence_source:
-            parts.append("")
-            parts.append("Top evidence:")
-            if evidence_verdict:
-                parts.append(f"- Stance: {evidence_verdict}")
-            if evidence_text:
-                parts.append(f"- Evidence: {evidence_text}")
-            if evidence_source:
-                parts.append(f"- Source: {evidence_source}")
+    return wrapper
 
-        response_text = "\n".join(parts)
 
-        MessageLog.objects.create(
-            source="ukweli",
-            telegram_user=telegram_user,
-            request_text=text,
-            response_text=json.dumps(result),
-        )
-    except UkweliClientError as exc:
-        response_text = "Sorry, I had an issue verifying that claim. Please try again later."
-        MessageLog.objects.create(
-            source="ukweli",
-            telegram_user=telegram_user,
-            request_text=text,
-            response_text=str(exc),
-        )
+def _scoped_rollups(request, params):
+    rollups = _filtered_rollups(params)
+    if request.report_api_user is not None:
+        rollups = rollups.filter(api_user=request.report_api_user)
+    return rollups
+
+
+def _internal_only(view_func):
+    """403 unless ``has_internal_access``; put it above ``conditional_get``."""
 
-    bot_token = os.environ.get("TELEGRAM_BOT_TOKEN")
-    if bot_token:
-        telegram_url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-        payload = {"chat_id": telegram_id, "text": response_text}
-        try:
-            requests.post(telegram_url, json=payload, timeout=10)
-        except requests.RequestException:
-            pass
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not has_internal_access(request):
+            return json_response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+        return view_func(request, *args, **kwargs)
 
-    return JsonResponse({"ok": True})
+    return wrapper
 
 
 @api_view(["GET"])
-def all_data_view(request):
-    chat_users = ChatUserSerializer(ChatUser.objects.all(), many=True).data
-    telegram_users = TelegramUserSerializer(TelegramUser.objects.all(), many=True).data
-    api_users = APIUserSerializer(APIUser.objects.all(), many=True).data
-    message_logs = MessageLogSerializer(MessageLog.objects.all(), many=True).data
+@_report_access
+@use_read_replica
+@conditional_get(rollup_validators)
+def usage_view(request):
+    """Per-API-user request counts and error rates, served from the rollups.
+
+    With an ``api_key`` the caller gets its own usage; without one the
+    usage of every API user is returned to internal callers only.
+    """
+    serializer = UsageQuerySerializer(data=request.query_params)
+    if not serializer.is_valid():
+        return json_response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    params = serializer.validated_data
+
+    rollups = _scoped_rollups(request, params)
 
-    return JsonResponse(
+    rows = (
+        rollups.values("bucket_start", "source", "api_user_id")
+        .annotate(requests=Sum("request_count"), errors=Sum("error_count"))
+        .order_by("bucket_start", "source", "api_user_id")
+    )
+    results = [
         {
-            "chat_users": chat_users,
-            "telegram_users": telegram_users,
-            "api_users": api_users,
-            "message_logs": message_logs,
-        },
-        safe=False,
+            "bucket_start": row["bucket_start"].isoformat(),
+            "source": row["source"],
+            "api_user_id": row["api_user_id"],
+            "requests": row["requests"],
+            "errors": row["errors"],
+            "error_rate": row["errors"] / row["requests"] if row["requests"] else 0.0,
+        }
+        for row in rows
+    ]
+    return json_response({"period": params["period"], "results": results})
+
+
+@api_view(["GET"])
+@_report_access
+@use_read_replica
+@conditional_get(rollup_validators)
+def verdict_stats_view(request):
+    """Verdict distribution per period bucket, served from the rollups.
+
+    Access works as in ``usage_view``: an ``api_key`` sees its own verdicts,
+    internal callers see everyone's.
+    """
+    serializer = UsageQuerySerializer(data=request.query_params)
+    if not serializer.is_valid():
+        return json_response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    params = serializer.validated_data
+
+    rollups = _scoped_rollups(request, params)
+
+    rows = (
+        rollups
+        .exclude(verdict="")
+        .values("bucket_start", "verdict")
+        .annotate(count=Sum("request_count"))
+        .order_by("bucket_start", "verdict")
     )
+    results = [
+        {
+            "bucket_start": row["bucket_start"].isoformat(),
+            "verdict": row["verdict"],
+            "count": row["count"],
+        }
+        for row in rows
+    ]
+    return json_response({"period": params["period"], "results": results})
 
 
 def health_check_view(request):
@@ -308,7 +450,87 @@ def health_check_view(request):
 
     Accepts GET and HEAD (handled automatically by Django when GET is defined).
     """
-    return JsonResponse({"status": "ok"})
+    return json_response({"status": "ok"})
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint."""
+    if not has_internal_access(request):
+        return json_response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+    body, content_type = render_metrics()
+    return HttpResponse(body, content_type=content_type)
+
+
+def db_connections_view(request):
+    """Open, idle and in-use DB connection counts, for pool sizing."""
+    if not has_internal_access(request):
+        return json_response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+    return json_response(get_connection_stats())
+
+
+@api_view(["GET"])
+@use_read_replica
+def search_message_logs_view(request):
+    """Ranked full-text search over message requests and responses."""
+    if not has_internal_access(request):
+        return json_response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+
+    serializer = MessageLogSearchQuerySerializer(data=request.query_params)
+    if not serializer.is_valid():
+        return json_response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    params = serializer.validated_data
+
+    logs = MessageLog.objects.all()
+    if "source" in params:
+        logs = logs.filter(source=params["source"])
+    try:
+        page, next_cursor = search_message_logs(
+            params["q"], logs, cursor=params.get("cursor"), limit=params["limit"]
+        )
+    except InvalidCursor as exc:
+        return json_response({"cursor": [str(exc)]}, status=status.HTTP_400_BAD_REQUEST)
+
+    with span("serialize"):
+        results = MessageLogSerializer(page, many=True).data
+        for row, log in zip(results, page):
+            row["rank"] = log.rank
+        return json_response({"results": results, "next_cursor": next_cursor})
+
+
+def _export_message_logs(logs):
+    # Runs after the view has returned, so it opts into the replica itself.
+    with read_from_replica():
+        batch = []
+        for log in logs.order_by("id").iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            batch.append(log)
+            if len(batch) == EXPORT_CHUNK_SIZE:
+                yield b"".join(dumps(row) + b"\n" for row in MessageLogSerializer(batch, many=True).data)
+                batch = []
+        if batch:
+            yield b"".join(dumps(row) + b"\n" for row in MessageLogSerializer(batch, many=True).data)
+
+
+# A plain view: DRF's content negotiation would answer 406 to
+# ``Accept: application/x-ndjson``.
+@require_GET
+@_internal_only
+@use_read_replica
+@conditional_get(lambda: table_validators(MessageLog))
+def export_message_logs_view(request):
+    """Stream message logs as NDJSON, one log per line, oldest first."""
+    serializer = MessageLogExportQuerySerializer(data=request.GET)
+    if not serializer.is_valid():
+        return json_response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    params = serializer.validated_data
+
+    logs = MessageLog.objects.all()
+    if "source" in params:
+        logs = logs.filter(source=params["source"])
+    if "since" in params:
+        logs = logs.filter(created_at__gte=params["since"])
+    if "until" in params:
+        logs = logs.filter(created_at__lt=params["until"])
+    return StreamingHttpResponse(_export_message_logs(logs), content_type="application/x-ndjson")
 
 
 @api_view(["DELETE"])
@@ -316,17 +538,47 @@ def delete_message_log_view(request, message_id):
     try:
         log = MessageLog.objects.get(id=message_id)
     except MessageLog.DoesNotExist:
-        return JsonResponse({"detail": "MessageLog not found"}, status=status.HTTP_404_NOT_FOUND)
+        return json_response({"detail": "MessageLog not found"}, status=status.HTTP_404_NOT_FOUND)
 
     log.delete()
-    return JsonResponse({}, status=status.HTTP_204_NO_CONTENT)
+    note_changed(MessageLog)
+    return json_response({}, status=status.HTTP_204_NO_CONTENT)
+
+
+@api_view(["POST"])
+def bulk_delete_message_logs_view(request):
+    """Queue a batched background delete of every MessageLog matching the filters."""
+    if not has_internal_access(request):
+        return json_response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+
+    serializer = MessageLogBulkDeleteSerializer(data=request.data)
+    if not serializer.is_valid():
+        return json_response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    job = PurgeJob.objects.create(filters=serializer.data)
+    run_in_background("purges", run_purge_job, job.id)
+    return json_response(
+        {"job_id": job.id, "status": job.status}, status=status.HTTP_202_ACCEPTED
+    )
+
+
+@api_view(["GET"])
+def purge_job_view(request, job_id):
+    if not has_internal_access(request):
+        return json_response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+
+    try:
+        job = PurgeJob.objects.get(id=job_id)
+    except PurgeJob.DoesNotExist:
+        return json_response({"detail": "Purge job not found"}, status=status.HTTP_404_NOT_FOUND)
+    return json_response(PurgeJobSerializer(job).data)
 
 
 @api_view(["POST"])
 def ukweli_verify_view(request):
     serializer = UkweliVerifyRequestSerializer(data=request.data)
     if not serializer.is_valid():
-        return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        return json_response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     api_key = serializer.validated_data["api_key"]
     claim = serializer.validated_data["claim"]
@@ -339,28 +591,64 @@ def ukweli_verify_view(request):
             api_user=None,
             request_text=claim,
             response_text="Invalid API key",
+            is_error=True,
         )
-        return JsonResponse(
+        return json_response(
             {"detail": "Invalid API key"},
             status=status.HTTP_401_UNAUTHORIZED,
         )
 
     try:
-        result = verify_ukweli_claim(claim)
+        result = cached_verify_claim(claim)
     except UkweliClientError as exc:
         MessageLog.objects.create(
             source="ukweli",
             api_user=api_user,
             request_text=claim,
             response_text=str(exc),
+            is_error=True,
         )
-        return JsonResponse({"detail": str(exc)}, status=status.HTTP_502_BAD_GATEWAY)
+        return json_response({"detail": str(exc)}, status=status.HTTP_502_BAD_GATEWAY)
 
+    verdict, confidence = extract_verdict(result)
     MessageLog.objects.create(
         source="ukweli",
         api_user=api_user,
         request_text=claim,
-        response_text=json.dumps(result),
+        response_text=format_ukweli_reply(result),
+        result=result,
+        verdict=verdict,
+        confidence=confidence,
     )
 
-    return JsonResponse(result)
+    return json_response(result)
+
+
+@api_view(["GET"])
+def trending_claims_view(request):
+    """Most frequently verified claims lately, with their cached verdicts.
+
+    Counts are approximate and cover the claims served by this process.
+    Internal only: the claims are other users' raw text.
+    """
+    if not has_internal_access(request):
+        return json_response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+
+    serializer = TrendingClaimsQuerySerializer(data=request.query_params)
+    if not serializer.is_valid():
+        return json_response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    params = serializer.validated_data
+
+    results = []
+    for key, claim, count, error in get_tracker().top(params["limit"]):
+        verdict, confidence = extract_verdict(get_cached_verdict(key))
+        results.append(
+            {
+                "claim": claim,
+                "count": round(count, 2),
+                "min_count": round(count - error, 2),
+                "verdict": verdict,
+                "confidence": confidence,
+            }
+        )
+    return json_response({"results": results})
@@ -0,0 +1,50 @@
+"""
+gunicorn settings for safeAi; picked up automatically when gunicorn is started
+from this directory, e.g. ``gunicorn safeAi.wsgi``.
+"""
+
+import os
+import shutil
+
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "120"))
+# Load Django once in the master and fork workers from it: faster worker
+# start-up and shared memory pages. safeAi.wsgi opens no sockets while loading.
+preload_app = os.environ.get("GUNICORN_PRELOAD", "False").lower() == "true"
+
+
+def on_starting(server):
+    # Metric files left over from a previous run would be summed with new ones.
+    multiproc_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if multiproc_dir:
+        shutil.rmtree(multiproc_dir, ignore_errors=True)
+        os.makedirs(multiproc_dir, exist_ok=True)
+
+
+def pre_fork(server, worker):
+    if server.cfg.preload_app:
+        # Nothing should have connected yet, but a connection made by the
+        # master must never be shared by its children.
+        from django.db import connections
+
+        connections.close_all()
+
+
+def post_worker_init(worker):
+    # Runs in the worker after the app is loaded and before it accepts
+    # requests, so a readiness check passes only once warm-up is done.
+    from django.conf import settings
+
+    if settings.WARMUP_ON_START:
+        from safeAi.warmup import warm_up
+
+        warm_up()
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
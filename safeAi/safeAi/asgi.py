@@ -2,6 +2,10 @@
 ASGI config for safeAi project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+``create_app()`` returns it with the URLconf preloaded and, with
+WARMUP_ON_START, DB and upstream connections opened. Use it as a uvicorn
+factory (``uvicorn --factory safeAi.asgi:create_app``) so this runs in every
+worker.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
@@ -14,3 +18,14 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'safeAi.settings')
 
 application = get_asgi_application()
+
+
+def create_app():
+    from django.conf import settings
+
+    from .warmup import preload, warm_up
+
+    preload()
+    if settings.WARMUP_ON_START:
+        warm_up()
+    return application
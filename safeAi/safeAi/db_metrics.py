@@ -0,0 +1,80 @@
+"""
+Connection statistics for sizing DB pools against worker counts.
+
+Numbers come from three places, depending on what the backend offers:
+
+- ``pool``: psycopg pool counters for this worker process (``DB_POOL=true``).
+- ``server``: connections the database server sees for our
+  ``application_name``, across every worker and instance (PostgreSQL only).
+- ``process``: whether this worker thread currently holds a connection.
+"""
+
+import os
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+
+_SERVER_STATS_SQL = """
+    SELECT state, count(*)
+    FROM pg_stat_activity
+    WHERE datname = current_database() AND application_name = %s
+    GROUP BY state
+"""
+
+
+def _pool_stats(connection):
+    pool = getattr(connection, "pool", None)
+    if pool is None:
+        return None
+    stats = pool.get_stats()
+    size = stats.get("pool_size", 0)
+    available = stats.get("pool_available", 0)
+    return {
+        "open": size,
+        "idle": available,
+        "in_use": size - available,
+        "min_size": stats.get("pool_min", pool.min_size),
+        "max_size": stats.get("pool_max", pool.max_size),
+        "requests_waiting": stats.get("requests_waiting", 0),
+    }
+
+
+def _server_stats(connection):
+    if connection.vendor != "postgresql":
+        return None
+    application_name = connection.settings_dict["OPTIONS"].get(
+        "application_name", settings.DB_APPLICATION_NAME
+    )
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(_SERVER_STATS_SQL, [application_name])
+            by_state = {state or "unknown": count for state, count in cursor.fetchall()}
+    except DatabaseError as exc:
+        return {"error": str(exc)}
+
+    idle = by_state.get("idle", 0)
+    total = sum(by_state.values())
+    return {
+        "open": total,
+        "idle": idle,
+        "in_use": total - idle,
+        "by_state": by_state,
+    }
+
+
+def get_connection_stats():
+    databases = {}
+    for alias in connections:
+        connection = connections[alias]
+        settings_dict = connection.settings_dict
+        databases[alias] = {
+            "vendor": connection.vendor,
+            "conn_max_age": settings_dict.get("CONN_MAX_AGE"),
+            "conn_health_checks": settings_dict.get("CONN_HEALTH_CHECKS"),
+            "pgbouncer": bool(settings_dict.get("DISABLE_SERVER_SIDE_CURSORS")),
+            "process": {"connected": connection.connection is not None},
+            "pool": _pool_stats(connection),
+            "server": _server_stats(connection),
+        }
+    return {"pid": os.getpid(), "databases": databases}
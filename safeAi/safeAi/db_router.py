@@ -0,0 +1,126 @@
+"""
+Primary/replica database routing for safeAi.
+
+Writes always go to ``default``. Reads go to ``default`` as well unless the
+current code path has opted in with :func:`read_from_replica` (or the
+:func:`use_read_replica` view decorator) and at least one replica alias is
+configured in ``settings.DATABASE_REPLICAS``.
+
+Read-your-writes: once a request has written to the primary, the rest of that
+request and any request from the same client within
+``settings.REPLICA_PIN_SECONDS`` reads from the primary, so a client never sees
+a replica that has not caught up with its own write yet.
+"""
+
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+
+
+PRIMARY_DB_ALIAS = "default"
+REPLICA_PIN_COOKIE = "db_pin"
+
+
+class _RoutingState:
+    __slots__ = ("pinned", "wrote")
+
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.wrote = False
+
+
+_routing_state: ContextVar = ContextVar("db_routing_state", default=None)
+_replica_reads: ContextVar = ContextVar("db_replica_reads", default=False)
+
+
+def get_replica_aliases():
+    return list(getattr(settings, "DATABASE_REPLICAS", []))
+
+
+@contextmanager
+def read_from_replica():
+    """Route reads inside the block to a replica when one is available."""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def use_read_replica(view_func):
+    """View decorator for read-only views and exports."""
+
+    @wraps(view_func)
+    def wrapper(*args, **kwargs):
+        with read_from_replica():
+            return view_func(*args, **kwargs)
+
+    return wrapper
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not _replica_reads.get():
+            return PRIMARY_DB_ALIAS
+
+        state = _routing_state.get()
+        if state is not None and (state.pinned or state.wrote):
+            return PRIMARY_DB_ALIAS
+
+        replicas = get_replica_aliases()
+        if not replicas:
+            return PRIMARY_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        state = _routing_state.get()
+        if state is not None:
+            state.wrote = True
+        return PRIMARY_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY_DB_ALIAS, *get_replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return True
+
+
+class ReadYourWritesMiddleware:
+    """Pin a client to the primary for a short window after it writes."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        pinned = False
+        pinned_until = request.COOKIES.get(REPLICA_PIN_COOKIE)
+        if pinned_until:
+            try:
+                pinned = float(pinned_until) > time.time()
+            except ValueError:
+                pinned = False
+
+        state = _RoutingState(pinned=pinned)
+        token = _routing_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing_state.reset(token)
+
+        pin_seconds = getattr(settings, "REPLICA_PIN_SECONDS", 0)
+        if state.wrote and pin_seconds > 0 and get_replica_aliases():
+            response.set_cookie(
+                REPLICA_PIN_COOKIE,
+                str(time.time() + pin_seconds),
+                max_age=pin_seconds,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
@@ -0,0 +1,132 @@
+"""
+OpenAPI schema served from memory.
+
+drf-spectacular's ``SpectacularAPIView`` introspects every view and serializer
+on each request. Instead, the schema is generated once per process: read from
+``OPENAPI_SCHEMA_FILE`` (written by ``build.sh`` at deploy time) or, when that
+file is missing or DEBUG is on, generated on the first request. Each format is
+rendered once, gzipped once and given an ETag, so serving it afterwards costs
+about as much as a static file. A deploy restarts the workers, which drops the
+in-memory copy.
+
+drf-spectacular itself is only imported when a schema is generated or the
+Swagger UI is opened: ``LazyAutoSchema`` stands in for its ``AutoSchema`` as
+DRF's ``DEFAULT_SCHEMA_CLASS``, because ``@api_view`` looks the schema class
+up for every view at import time.
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.http import require_safe
+from rest_framework.schemas.inspectors import ViewInspector
+
+
+CONTENT_TYPES = {
+    "yaml": "application/vnd.oai.openapi",
+    "json": "application/vnd.oai.openapi+json",
+}
+
+_lock = threading.Lock()
+_schema = None
+_documents = {}
+_swagger_view = None
+
+
+class LazyAutoSchema(ViewInspector):
+    """Resolves to drf-spectacular's ``AutoSchema`` when a view's schema is read."""
+
+    def __get__(self, instance, owner):
+        from drf_spectacular.openapi import AutoSchema
+
+        schema = AutoSchema()
+        if instance is not None:
+            schema.view = instance
+            # Cached on the view instance; the class keeps this descriptor.
+            instance.schema = schema
+        return schema
+
+
+class SchemaDocument:
+    def __init__(self, body):
+        self.body = body
+        self.gzipped = gzip.compress(body, compresslevel=9)
+        self.etag = 'W/"{}"'.format(hashlib.sha256(body).hexdigest()[:32])
+
+
+def _load_schema():
+    path = settings.OPENAPI_SCHEMA_FILE
+    if not settings.DEBUG and path.exists():
+        return json.loads(path.read_bytes())
+
+    from drf_spectacular.settings import spectacular_settings
+
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    return generator.get_schema(request=None, public=spectacular_settings.SERVE_PUBLIC)
+
+
+def _render(schema, schema_format):
+    from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+
+    if schema_format == "json":
+        return OpenApiJsonRenderer().render(schema)
+    return OpenApiYamlRenderer().render(schema)
+
+
+def get_schema_document(schema_format):
+    global _schema
+
+    document = _documents.get(schema_format)
+    if document is None:
+        with _lock:
+            document = _documents.get(schema_format)
+            if document is None:
+                if _schema is None:
+                    _schema = _load_schema()
+                document = SchemaDocument(_render(_schema, schema_format))
+                _documents[schema_format] = document
+    return document
+
+
+def _requested_format(request):
+    requested = request.GET.get("format")
+    if requested in CONTENT_TYPES:
+        return requested
+    return "json" if "json" in request.headers.get("Accept", "") else "yaml"
+
+
+@require_safe
+def schema_view(request):
+    """OpenAPI schema; YAML by default, JSON with ``?format=json`` or a JSON Accept header."""
+    schema_format = _requested_format(request)
+    document = get_schema_document(schema_format)
+
+    if document.etag in request.headers.get("If-None-Match", ""):
+        response = HttpResponseNotModified()
+    elif "gzip" in request.headers.get("Accept-Encoding", ""):
+        response = HttpResponse(document.gzipped, content_type=CONTENT_TYPES[schema_format])
+        response["Content-Encoding"] = "gzip"
+    else:
+        response = HttpResponse(document.body, content_type=CONTENT_TYPES[schema_format])
+
+    response["ETag"] = document.etag
+    # Always revalidate: a deploy changes the schema, the ETag makes that cheap.
+    response["Cache-Control"] = "no-cache"
+    patch_vary_headers(response, ["Accept", "Accept-Encoding"])
+    return response
+
+
+def docs_view(request, *args, **kwargs):
+    """Swagger UI; drf-spectacular's views are only imported on first use."""
+    global _swagger_view
+
+    if _swagger_view is None:
+        from drf_spectacular.views import SpectacularSwaggerView
+
+        _swagger_view = SpectacularSwaggerView.as_view(url_name="api-schema")
+    return _swagger_view(request, *args, **kwargs)
@@ -173,9 +173,11 @@ Generated by 'django-admin startproject' using Django 5.1.1.
 """
 
 import os
+from importlib.util import find_spec
 from pathlib import Path
 from dotenv import load_dotenv
 import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
 
 # Base directory
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -225,12 +227,16 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "chat.middleware.MetricsMiddleware",
+    "chat.middleware.CompressionMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "safeAi.db_router.ReadYourWritesMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "chat.middleware.ProfilingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -281,6 +287,198 @@ DATABASES = {
         default=os.environ.get("DATABASE_URL")
     )
 }
+
+# Optional read replicas, e.g.
+# DATABASE_REPLICA_URLS=postgres://replica-1/db,postgres://replica-2/db
+# Only views that opt in (see safeAi/db_router.py) read from them.
+DATABASE_REPLICAS = []
+replica_urls = os.environ.get("DATABASE_REPLICA_URLS", "").split(",")
+for replica_url in (url.strip() for url in replica_urls):
+    if not replica_url:
+        continue
+    alias = f"replica_{len(DATABASE_REPLICAS)}"
+    DATABASES[alias] = dj_database_url.parse(replica_url)
+    DATABASES[alias]["TEST"] = {"MIRROR": "default"}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["safeAi.db_router.PrimaryReplicaRouter"]
+
+# Seconds a client keeps reading from the primary after it wrote something
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", "5"))
+
+# Connection management, applied to the primary and every replica.
+# - DB_CONN_MAX_AGE: seconds a worker keeps its connection open (0 closes
+#   after every request), with a health check before each reuse.
+# - DB_POOL=true: psycopg 3 connection pool (requires `psycopg[pool]`);
+#   recommended for uvicorn/ASGI deployments. Disables CONN_MAX_AGE.
+# - DB_PGBOUNCER=true: running behind pgbouncer in transaction mode; the
+#   bouncer does the pooling, so no pool and no server-side cursors here.
+DB_CONN_MAX_AGE = int(os.environ.get("DB_CONN_MAX_AGE", "60"))
+DB_POOL = os.environ.get("DB_POOL", "False").lower() == "true"
+DB_POOL_MIN_SIZE = int(os.environ.get("DB_POOL_MIN_SIZE", "2"))
+DB_POOL_MAX_SIZE = int(os.environ.get("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "10"))
+DB_PGBOUNCER = os.environ.get("DB_PGBOUNCER", "False").lower() == "true"
+DB_APPLICATION_NAME = os.environ.get("DB_APPLICATION_NAME", "safeai")
+
+for database in DATABASES.values():
+    database["CONN_MAX_AGE"] = DB_CONN_MAX_AGE
+    database["CONN_HEALTH_CHECKS"] = True
+    if database.get("ENGINE") != "django.db.backends.postgresql":
+        continue
+
+    options = database.setdefault("OPTIONS", {})
+    options.setdefault("application_name", DB_APPLICATION_NAME)
+    if DB_PGBOUNCER:
+        database["DISABLE_SERVER_SIDE_CURSORS"] = True
+    elif DB_POOL:
+        # Django only pools with psycopg 3; requirements.txt pins psycopg2.
+        if find_spec("psycopg") is None or find_spec("psycopg_pool") is None:
+            raise ImproperlyConfigured(
+                'DB_POOL=true needs psycopg 3 with its pool: pip install "psycopg[binary,pool]"'
+            )
+        database["CONN_MAX_AGE"] = 0
+        options["pool"] = {
+            "min_size": DB_POOL_MIN_SIZE,
+            "max_size": DB_POOL_MAX_SIZE,
+            "timeout": DB_POOL_TIMEOUT,
+        }
+
+# ================================
+# PROFILING
+# ================================
+# Server-Timing header with db/extract/upstream/serialize/total spans for every
+# caller; callers with INTERNAL_API_TOKEN always get it.
+SERVER_TIMING_ENABLED = os.environ.get("SERVER_TIMING_ENABLED", "False").lower() == "true"
+# Share of requests to deep-profile with cProfile (0 disables sampling).
+# Internal callers can also profile a single request with `X-Profile: 1`.
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_DIR = Path(os.environ.get("PROFILE_DIR", BASE_DIR / "profiles"))
+
+# ================================
+# STARTUP
+# ================================
+# Open DB connections and upstream keep-alive connections in each gunicorn
+# worker before it accepts requests (safeAi/warmup.py)
+WARMUP_ON_START = os.environ.get("WARMUP_ON_START", "False").lower() == "true"
+# Seconds each upstream gets during warm-up
+WARMUP_TIMEOUT = float(os.environ.get("WARMUP_TIMEOUT", "5"))
+
+# ================================
+# MESSAGE LOG RETENTION
+# ================================
+# Per-source retention in days, e.g. MESSAGE_LOG_RETENTION=chat=90,api=365
+# Sources without an entry are kept forever.
+MESSAGE_LOG_RETENTION_DAYS = {}
+for policy in os.environ.get("MESSAGE_LOG_RETENTION", "").split(","):
+    if "=" in policy:
+        policy_source, policy_days = policy.split("=", 1)
+        MESSAGE_LOG_RETENTION_DAYS[policy_source.strip()] = int(policy_days)
+
+MESSAGE_LOG_ARCHIVE_DIR = Path(
+    os.environ.get("MESSAGE_LOG_ARCHIVE_DIR", BASE_DIR / "archive")
+)
+# Rows deleted per transaction, and the pause between batches (seconds)
+MESSAGE_LOG_PURGE_BATCH_SIZE = int(os.environ.get("MESSAGE_LOG_PURGE_BATCH_SIZE", "500"))
+MESSAGE_LOG_PURGE_PAUSE = float(os.environ.get("MESSAGE_LOG_PURGE_PAUSE", "0.1"))
+# Keep expired rows until rollup_usage has counted them. Until it has run
+# once, that means retention purges nothing.
+MESSAGE_LOG_PURGE_AFTER_ROLLUP = (
+    os.environ.get("MESSAGE_LOG_PURGE_AFTER_ROLLUP", "True").lower() == "true"
+)
+
+# ================================
+# FILE UPLOADS
+# ================================
+# Uploads larger than this are spooled to FILE_UPLOAD_TEMP_DIR instead of
+# being held in memory
+FILE_UPLOAD_MAX_MEMORY_SIZE = int(os.environ.get("FILE_UPLOAD_MAX_MEMORY_SIZE", str(1024 * 1024)))
+FILE_UPLOAD_TEMP_DIR = os.environ.get("FILE_UPLOAD_TEMP_DIR") or None
+# Largest file accepted by /chat/upload/. Bigger requests are refused from
+# Content-Length before the body is read.
+UPLOAD_MAX_BYTES = int(os.environ.get("UPLOAD_MAX_BYTES", str(20 * 1024 * 1024)))
+# Strip page headers/footers, page numbers, hyphenation breaks and repeated
+# paragraphs from extracted text before it is sent to Gemini
+UPLOAD_PREPROCESS = os.environ.get("UPLOAD_PREPROCESS", "True").lower() == "true"
+
+# ================================
+# BACKGROUND UPLOAD JOBS
+# ================================
+# Where uploads answered with mode=async are spooled until the job finishes
+UPLOAD_JOB_DIR = Path(os.environ.get("UPLOAD_JOB_DIR", BASE_DIR / "upload_jobs"))
+# Run jobs in a thread of the web worker that accepted them. With false, only
+# `manage.py run_upload_jobs` processes them.
+UPLOAD_JOBS_IN_PROCESS = os.environ.get("UPLOAD_JOBS_IN_PROCESS", "True").lower() == "true"
+# A running job without progress for this long is assumed orphaned and retried
+UPLOAD_JOB_STALE_MINUTES = int(os.environ.get("UPLOAD_JOB_STALE_MINUTES", "10"))
+
+# ================================
+# TELEGRAM OUTBOX
+# ================================
+# Bot API limits: about 30 messages/second overall and 1/second per chat.
+# Enforced per process, so only one process may send.
+TELEGRAM_GLOBAL_RATE = float(os.environ.get("TELEGRAM_GLOBAL_RATE", "30"))
+TELEGRAM_CHAT_RATE = float(os.environ.get("TELEGRAM_CHAT_RATE", "1"))
+# Send replies from the process that produced them, with a sender thread for
+# throttled parts and retries. Only within the limits with one web process;
+# with more, set it to False and run a single `manage.py telegram_send`.
+TELEGRAM_SEND_INLINE = os.environ.get("TELEGRAM_SEND_INLINE", "True").lower() == "true"
+# Attempts before a message is marked failed, and the retry backoff (seconds)
+TELEGRAM_SEND_MAX_ATTEMPTS = int(os.environ.get("TELEGRAM_SEND_MAX_ATTEMPTS", "8"))
+TELEGRAM_SEND_BACKOFF_BASE = float(os.environ.get("TELEGRAM_SEND_BACKOFF_BASE", "2"))
+TELEGRAM_SEND_BACKOFF_MAX = float(os.environ.get("TELEGRAM_SEND_BACKOFF_MAX", "300"))
+# Sent and failed messages are purged by purge_message_logs after this many
+# days; 0 keeps them forever.
+TELEGRAM_OUTBOX_RETENTION_DAYS = int(os.environ.get("TELEGRAM_OUTBOX_RETENTION_DAYS", "7"))
+
+# ================================
+# CACHE
+# ================================
+# Shared cache for Ukweli verdicts; falls back to a per-process memory cache
+REDIS_URL = os.environ.get("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "OPTIONS": {"MAX_ENTRIES": 10000},
+        }
+    }
+
+# How long a Ukweli verdict is served from the cache (seconds)
+UKWELI_VERDICT_TTL = int(os.environ.get("UKWELI_VERDICT_TTL", "3600"))
+# Trending claims are re-verified this long before their verdict expires
+UKWELI_REFRESH_AHEAD = int(os.environ.get("UKWELI_REFRESH_AHEAD", "300"))
+# The background refresher checks the UKWELI_REFRESH_TOP_K most frequent claims
+# every UKWELI_REFRESH_INTERVAL seconds; set the interval to 0 to disable it
+UKWELI_REFRESH_INTERVAL = int(os.environ.get("UKWELI_REFRESH_INTERVAL", "60"))
+UKWELI_REFRESH_TOP_K = int(os.environ.get("UKWELI_REFRESH_TOP_K", "20"))
+# ... that were looked up at least this many times recently (counts decay)
+UKWELI_REFRESH_MIN_COUNT = float(os.environ.get("UKWELI_REFRESH_MIN_COUNT", "5"))
+# Distinct claims the frequency tracker keeps counters for
+UKWELI_TRACKER_CAPACITY = int(os.environ.get("UKWELI_TRACKER_CAPACITY", "1000"))
+
+# ================================
+# RESPONSE COMPRESSION
+# ================================
+# GET responses of these types are compressed with brotli (when installed) or
+# gzip. Buffered bodies smaller than COMPRESS_MIN_SIZE bytes are sent as is.
+COMPRESS_CONTENT_TYPES = ("application/json", "application/x-ndjson")
+COMPRESS_MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", "1024"))
+
+# ================================
+# INTERNAL ENDPOINTS
+# ================================
+# Token for internal/ops endpoints, sent as the X-Internal-Token header.
+# When unset, those endpoints are only open with DEBUG on (or to staff users).
+INTERNAL_API_TOKEN = os.environ.get("INTERNAL_API_TOKEN", "")
+
 # ================================
 # PASSWORD VALIDATION
 # ================================
@@ -324,7 +522,17 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # DRF + OPENAPI
 # ================================
 REST_FRAMEWORK = {
-    "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # drf-spectacular's AutoSchema, imported on first use (see safeAi/schema.py)
+    "DEFAULT_SCHEMA_CLASS": "safeAi.schema.LazyAutoSchema",
+    "DEFAULT_RENDERER_CLASSES": [
+        "chat.json_backend.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "chat.json_backend.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
 SPECTACULAR_SETTINGS = {
@@ -333,6 +541,11 @@ SPECTACULAR_SETTINGS = {
     "VERSION": "1.0.0",
 }
 
+# Pre-generated by build.sh; /api/schema/ serves it from memory (ignored in DEBUG)
+OPENAPI_SCHEMA_FILE = Path(
+    os.environ.get("OPENAPI_SCHEMA_FILE", BASE_DIR / "openapi-schema.json")
+)
+
 # ================================
 # CSRF
 # ================================
@@ -0,0 +1,84 @@
+"""
+Start-up work that would otherwise land on the first request.
+
+``preload()`` only imports: the URLconf and every view module behind it. It is
+safe to run before a fork (gunicorn ``preload_app``). ``warm_up()`` opens
+sockets: a connection to every configured database and one keep-alive
+connection per upstream pool (Gemini, Ukweli, Telegram), so the first
+request skips DNS, TCP and TLS set-up. It must run in the worker that will use
+the sockets, i.e. after the fork (see ``gunicorn.conf.py``).
+
+Under ASGI (``asgi.create_app``) it runs inside uvicorn's event loop, where
+the ORM refuses to connect. Django also serves each ASGI request from its own
+thread there, and DB connections are per thread, so only the upstream pools
+are warmed.
+"""
+
+import asyncio
+import logging
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.urls import get_resolver
+
+
+logger = logging.getLogger(__name__)
+
+
+def preload():
+    """Import the URLconf, and with it every view, serializer and service module."""
+    start = time.perf_counter()
+    get_resolver().url_patterns
+    logger.info("Preloaded URLconf in %.0f ms", (time.perf_counter() - start) * 1000)
+
+
+def _upstream_pools():
+    # Imported here: the services pull in ``requests`` and the metrics registry.
+    from chat import gemini_service, telegram_service, ukweli_service
+
+    pools = [("ukweli", ukweli_service._session, ukweli_service.UKWELI_BASE_URL)]
+    if gemini_service.GEMINI_API_KEY:
+        pools.append(("gemini", gemini_service._session, gemini_service.GEMINI_API_BASE))
+    pools.append(("telegram", telegram_service._session, telegram_service.TELEGRAM_API_BASE))
+    return pools
+
+
+def _in_event_loop():
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def warm_up():
+    """Open DB connections and upstream keep-alive connections; never raises.
+
+    Returns the milliseconds spent per target, for logging and benchmarks.
+    """
+    timings = {}
+    if _in_event_loop():
+        logger.info("Skipping database warm-up: ASGI requests connect from their own threads")
+    else:
+        for alias in connections:
+            start = time.perf_counter()
+            try:
+                connections[alias].ensure_connection()
+            except Exception:  # noqa: BLE001 - a failed warm-up must not stop the worker
+                logger.warning("Warm-up could not connect to database %s", alias, exc_info=True)
+            timings[f"db:{alias}"] = (time.perf_counter() - start) * 1000
+
+    for name, session, base_url in _upstream_pools():
+        start = time.perf_counter()
+        try:
+            # Any answer will do: the pooled connection is what we are after.
+            session.head(base_url, timeout=settings.WARMUP_TIMEOUT, allow_redirects=False)
+        except Exception:  # noqa: BLE001 - a failed warm-up must not stop the worker
+            logger.warning("Warm-up could not reach %s at %s", name, base_url, exc_info=True)
+        timings[name] = (time.perf_counter() - start) * 1000
+
+    logger.info(
+        "Warm-up done: %s", ", ".join(f"{target}={ms:.0f}ms" for target, ms in timings.items())
+    )
+    return timings
@@ -1,7 +1,9 @@
 """
 WSGI config for safeAi project.
 
-It exposes the WSGI callable as a module-level variable named ``application``.
+It exposes the WSGI callable as a module-level variable named ``application``,
+built by ``create_app()``. The factory imports the URLconf and views up front
+but opens no sockets, so it is safe under gunicorn's ``preload_app``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/wsgi/
@@ -11,6 +13,15 @@ import os
 
 from django.core.wsgi import get_wsgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'safeAi.settings')
 
-application = get_wsgi_application()
+def create_app():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'safeAi.settings')
+    app = get_wsgi_application()
+
+    from .warmup import preload
+
+    preload()
+    return app
+
+
+application = create_app()